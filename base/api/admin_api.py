@@ -1,19 +1,23 @@
 # base/api/admin_api.py
 
 import allure
-from pydantic import TypeAdapter
+from typing import Optional
 from utils.constants.routes import APIRoutes
-from utils.clients.http_client import HTTPClient
+from utils.clients.http_client import HTTPClient, AsyncHTTPClient
 from models.responses.admin_responses import (
     GetUserProfileResponse,
     BanUserResponse,
     UnbanUserResponse, GetUserProfileByEmailResponse,
 )
+from models.responses.adapters import validate_response_json
+from utils.token_cache import TokenCache
 
 
 class AdminAPI:
-    def __init__(self, client: HTTPClient):
+    def __init__(self, client: HTTPClient, token_cache: Optional[TokenCache] = None):
         self.client = client
+        # бан/разбан меняет состояние пользователя: закешированные токены для него сбрасываются
+        self.token_cache = token_cache
 
     @allure.step("AdminAPI | Get user profile by id")
     def get_user_profile_by_id(self, user_id: int, token: str) -> GetUserProfileResponse:
@@ -22,7 +26,7 @@ class AdminAPI:
             f"{APIRoutes.ADMIN}/user/{user_id}",
             token=token,
         )
-        return TypeAdapter(GetUserProfileResponse).validate_python(resp.json())
+        return validate_response_json(GetUserProfileResponse, resp.content)
 
     @allure.step("AdminAPI | Get user profile by email")
     def get_user_profile_by_email(self, email: str, token: str) -> GetUserProfileByEmailResponse:
@@ -31,7 +35,7 @@ class AdminAPI:
             f"{APIRoutes.ADMIN}/user/{email}",
             token=token,
         )
-        return TypeAdapter(GetUserProfileByEmailResponse).validate_python(resp.json())
+        return validate_response_json(GetUserProfileByEmailResponse, resp.content)
 
     @allure.step("AdminAPI | Ban user by email")
     def ban_user(self, email: str, seconds: int, token: str) -> BanUserResponse:
@@ -41,7 +45,10 @@ class AdminAPI:
             token=token,
             params={"forSeconds": seconds},
         )
-        return TypeAdapter(BanUserResponse).validate_python(resp.json())
+        response = validate_response_json(BanUserResponse, resp.content)
+        if response.status == "ok" and self.token_cache is not None:
+            self.token_cache.invalidate(email)
+        return response
 
     @allure.step("AdminAPI | Unban user by email")
     def unban_user(self, email: str, token: str) -> UnbanUserResponse:
@@ -50,4 +57,53 @@ class AdminAPI:
             f"{APIRoutes.ADMIN}/management/unban/byEmail/{email}",
             token=token,
         )
-        return TypeAdapter(UnbanUserResponse).validate_python(resp.json())
+        response = validate_response_json(UnbanUserResponse, resp.content)
+        if response.status == "ok" and self.token_cache is not None:
+            self.token_cache.invalidate(email)
+        return response
+
+
+class AsyncAdminAPI:
+    def __init__(self, client: AsyncHTTPClient, token_cache: Optional[TokenCache] = None):
+        self.client = client
+        # бан/разбан меняет состояние пользователя: закешированные токены для него сбрасываются
+        self.token_cache = token_cache
+
+    async def get_user_profile_by_id(self, user_id: int, token: str) -> GetUserProfileResponse:
+        """POST /api/v1/admin/user/{id}"""
+        resp = await self.client.post(
+            f"{APIRoutes.ADMIN}/user/{user_id}",
+            token=token,
+        )
+        return validate_response_json(GetUserProfileResponse, resp.content)
+
+    async def get_user_profile_by_email(self, email: str, token: str) -> GetUserProfileByEmailResponse:
+        """GET /api/v1/admin/user/{email}"""
+        resp = await self.client.get(
+            f"{APIRoutes.ADMIN}/user/{email}",
+            token=token,
+        )
+        return validate_response_json(GetUserProfileByEmailResponse, resp.content)
+
+    async def ban_user(self, email: str, seconds: int, token: str) -> BanUserResponse:
+        """POST /api/v1/admin/management/ban/byEmail/{email}?forSeconds=..."""
+        resp = await self.client.post(
+            f"{APIRoutes.ADMIN}/management/ban/byEmail/{email}",
+            token=token,
+            params={"forSeconds": seconds},
+        )
+        response = validate_response_json(BanUserResponse, resp.content)
+        if response.status == "ok" and self.token_cache is not None:
+            self.token_cache.invalidate(email)
+        return response
+
+    async def unban_user(self, email: str, token: str) -> UnbanUserResponse:
+        """POST /api/v1/admin/management/unban/byEmail/{email}"""
+        resp = await self.client.post(
+            f"{APIRoutes.ADMIN}/management/unban/byEmail/{email}",
+            token=token,
+        )
+        response = validate_response_json(UnbanUserResponse, resp.content)
+        if response.status == "ok" and self.token_cache is not None:
+            self.token_cache.invalidate(email)
+        return response
@@ -1,17 +1,19 @@
 # base/api/auth_api.py
 
 import allure
-from typing import Union
-from pydantic import TypeAdapter
-from utils.clients.http_client import HTTPClient
+from typing import Optional, Union
+from utils.clients.http_client import HTTPClient, AsyncHTTPClient
 from utils.constants.routes import APIRoutes
 from models.requests.auth_requests import RegisterUser, LoginUser
 from models.responses.auth_responses import RegisterResponse, LoginResponse
+from models.responses.adapters import validate_response_json
+from utils.token_cache import TokenCache
 
 
 class AuthAPI:
-    def __init__(self, http_client: HTTPClient):
+    def __init__(self, http_client: HTTPClient, token_cache: Optional[TokenCache] = None):
         self.client = http_client
+        self.token_cache = token_cache
 
     @allure.step("AuthAPI | Register user")
     def register_user(self, payload: Union[RegisterUser, dict]) -> RegisterResponse:
@@ -21,7 +23,7 @@ class AuthAPI:
 
         resp = self.client.post(f"{APIRoutes.AUTH}/register", json=payload)
         # валидация и возврат правильной модели (OK/Error)
-        return TypeAdapter(RegisterResponse).validate_python(resp.json())
+        return validate_response_json(RegisterResponse, resp.content)
 
     @allure.step("AuthAPI | Login user")
     def login_user(self, payload: Union[LoginUser, dict]) -> LoginResponse:
@@ -30,11 +32,71 @@ class AuthAPI:
             payload = payload.model_dump()
 
         resp = self.client.post(f"{APIRoutes.AUTH}/login", json=payload)
-        return TypeAdapter(LoginResponse).validate_python(resp.json())
+        return validate_response_json(LoginResponse, resp.content)
 
     @allure.step("AuthAPI | Login and get JWT token")
-    def login_and_get_token(self, payload: LoginUser) -> str | None:
+    def login_and_get_token(self, payload: LoginUser, use_cache: bool = True) -> str | None:
+        """
+        JWT пользователя или None, если логин не удался.
+        use_cache=True - сначала токен из token_cache (по email и паролю), логин только при промахе;
+        use_cache=False - всегда настоящий логин (для тестов самого логина), полученный токен всё равно кешируется
+        """
+        if use_cache and self.token_cache is not None:
+            token = self.token_cache.get(payload.email, payload.password)
+            if token is not None:
+                return token
+
         login_response = self.login_user(payload)
         if login_response.status == "ok":
-            return login_response.responseData.jwt
+            token = login_response.responseData.jwt
+            if self.token_cache is not None:
+                self.token_cache.put(payload.email, payload.password, token)
+            return token
+        return None
+
+    def invalidate_token(self, email: str) -> None:
+        """сброс закешированного токена, например после смены роли через SQL"""
+        if self.token_cache is not None:
+            self.token_cache.invalidate(email)
+
+
+class AsyncAuthAPI:
+    def __init__(self, http_client: AsyncHTTPClient, token_cache: Optional[TokenCache] = None):
+        self.client = http_client
+        self.token_cache = token_cache
+
+    async def register_user(self, payload: Union[RegisterUser, dict]) -> RegisterResponse:
+        """POST /api/v1/auth/register"""
+        if isinstance(payload, RegisterUser):
+            payload = payload.model_dump()
+
+        resp = await self.client.post(f"{APIRoutes.AUTH}/register", json=payload)
+        return validate_response_json(RegisterResponse, resp.content)
+
+    async def login_user(self, payload: Union[LoginUser, dict]) -> LoginResponse:
+        """POST /api/v1/auth/login"""
+        if isinstance(payload, LoginUser):
+            payload = payload.model_dump()
+
+        resp = await self.client.post(f"{APIRoutes.AUTH}/login", json=payload)
+        return validate_response_json(LoginResponse, resp.content)
+
+    async def login_and_get_token(self, payload: LoginUser, use_cache: bool = True) -> str | None:
+        """как AuthAPI.login_and_get_token"""
+        if use_cache and self.token_cache is not None:
+            token = self.token_cache.get(payload.email, payload.password)
+            if token is not None:
+                return token
+
+        login_response = await self.login_user(payload)
+        if login_response.status == "ok":
+            token = login_response.responseData.jwt
+            if self.token_cache is not None:
+                self.token_cache.put(payload.email, payload.password, token)
+            return token
         return None
+
+    def invalidate_token(self, email: str) -> None:
+        """сброс закешированного токена, например после смены роли через SQL"""
+        if self.token_cache is not None:
+            self.token_cache.invalidate(email)
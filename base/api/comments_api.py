@@ -2,11 +2,11 @@
 
 import allure
 from typing import Union
-from pydantic import TypeAdapter
 from utils.constants.routes import APIRoutes
-from utils.clients.http_client import HTTPClient
+from utils.clients.http_client import HTTPClient, AsyncHTTPClient
 from models.requests.comments_requests import ReplyCommentPayload
 from models.responses.comments_responses import ReplyCommentResponse
+from models.responses.adapters import validate_response_json
 
 
 class CommentsAPI:
@@ -29,4 +29,26 @@ class CommentsAPI:
             token=token,
             json=payload,
         )
-        return TypeAdapter(ReplyCommentResponse).validate_python(resp.json())
+        return validate_response_json(ReplyCommentResponse, resp.content)
+
+
+class AsyncCommentsAPI:
+    def __init__(self, client: AsyncHTTPClient):
+        self.client = client
+
+    async def reply_comment(
+            self,
+            token: str,
+            parent_comment_id: str,
+            payload: Union[ReplyCommentPayload, dict]
+    ) -> ReplyCommentResponse:
+        """POST /api/v1/comments/{parentCommentId}/reply"""
+        if isinstance(payload, ReplyCommentPayload):
+            payload = payload.model_dump()
+
+        resp = await self.client.post(
+            f"{APIRoutes.COMMENTS}/{parent_comment_id}/reply",
+            token=token,
+            json=payload,
+        )
+        return validate_response_json(ReplyCommentResponse, resp.content)
@@ -4,9 +4,8 @@ import allure
 from typing import Union
 
 import httpx
-from pydantic import TypeAdapter
 from utils.constants.routes import APIRoutes
-from utils.clients.http_client import HTTPClient
+from utils.clients.http_client import HTTPClient, AsyncHTTPClient
 from models.requests.posts_requests import PublishPostPayload, AddCommentPayload
 from models.responses.posts_responses import (
     PublishPostResponse,
@@ -15,6 +14,7 @@ from models.responses.posts_responses import (
     GetPostsResponse,
     GetPostByIdResponse,
 )
+from models.responses.adapters import validate_response_json
 
 
 class PostsAPI:
@@ -32,7 +32,7 @@ class PostsAPI:
             token=token,
             json=payload,
         )
-        return TypeAdapter(PublishPostResponse).validate_python(resp.json())
+        return validate_response_json(PublishPostResponse, resp.content)
 
     @allure.step("PostsAPI | Vote post")
     def vote_post(self, token: str, post_id: str, value: int) -> VotePostResponse:
@@ -42,7 +42,7 @@ class PostsAPI:
             token=token,
             params={"value": value},
         )
-        return TypeAdapter(VotePostResponse).validate_python(resp.json())
+        return validate_response_json(VotePostResponse, resp.content)
 
     @allure.step("PostsAPI | Add comment")
     def add_comment(self, token: str, post_id: str, payload: Union[AddCommentPayload, dict]) -> AddCommentResponse:
@@ -55,7 +55,7 @@ class PostsAPI:
             token=token,
             json=payload,
         )
-        return TypeAdapter(AddCommentResponse).validate_python(resp.json())
+        return validate_response_json(AddCommentResponse, resp.content)
 
     @allure.step("PostsAPI | Get posts")
     def get_posts(self, token: str, page: int = 0, size: int = 20, sort: str = "createdAt,asc") -> tuple[
@@ -66,7 +66,7 @@ class PostsAPI:
             params={"page": page, "size": size, "sort": sort},
             token=token,
         )
-        return TypeAdapter(GetPostsResponse).validate_python(resp_raw.json()), resp_raw
+        return validate_response_json(GetPostsResponse, resp_raw.content), resp_raw
 
     @allure.step("PostsAPI | Get post by id")
     def get_post_by_id(
@@ -83,4 +83,69 @@ class PostsAPI:
             params={"page": comments_page, "size": comments_size, "sort": comments_sort},
             token=token,
         )
-        return TypeAdapter(GetPostByIdResponse).validate_python(resp.json()), resp
+        return validate_response_json(GetPostByIdResponse, resp.content), resp
+
+
+class AsyncPostsAPI:
+    def __init__(self, client: AsyncHTTPClient):
+        self.client = client
+
+    async def publish_post(self, token: str, payload: Union[PublishPostPayload, dict]) -> PublishPostResponse:
+        """POST /api/v1/posts/publish"""
+        if isinstance(payload, PublishPostPayload):
+            payload = payload.model_dump()
+
+        resp = await self.client.post(
+            f"{APIRoutes.POSTS}/publish",
+            token=token,
+            json=payload,
+        )
+        return validate_response_json(PublishPostResponse, resp.content)
+
+    async def vote_post(self, token: str, post_id: str, value: int) -> VotePostResponse:
+        """POST /api/v1/posts/{postId}/vote"""
+        resp = await self.client.post(
+            f"{APIRoutes.POSTS}/{post_id}/vote",
+            token=token,
+            params={"value": value},
+        )
+        return validate_response_json(VotePostResponse, resp.content)
+
+    async def add_comment(self, token: str, post_id: str,
+                          payload: Union[AddCommentPayload, dict]) -> AddCommentResponse:
+        """POST /api/v1/posts/{postId}/addComment"""
+        if isinstance(payload, AddCommentPayload):
+            payload = payload.model_dump()
+
+        resp = await self.client.post(
+            f"{APIRoutes.POSTS}/{post_id}/addComment",
+            token=token,
+            json=payload,
+        )
+        return validate_response_json(AddCommentResponse, resp.content)
+
+    async def get_posts(self, token: str, page: int = 0, size: int = 20, sort: str = "createdAt,asc") -> tuple[
+        GetPostsResponse, httpx.Response]:
+        """GET /api/v1/posts"""
+        resp_raw = await self.client.get(
+            APIRoutes.POSTS,
+            params={"page": page, "size": size, "sort": sort},
+            token=token,
+        )
+        return validate_response_json(GetPostsResponse, resp_raw.content), resp_raw
+
+    async def get_post_by_id(
+            self,
+            token: str,
+            post_id: str,
+            comments_page: int = 0,
+            comments_size: int = 20,
+            comments_sort: str = "createdAt,asc",
+    ) -> tuple[GetPostByIdResponse, httpx.Response]:
+        """GET /api/v1/posts/{postId}"""
+        resp = await self.client.get(
+            f"{APIRoutes.POSTS}/{post_id}",
+            params={"page": comments_page, "size": comments_size, "sort": comments_sort},
+            token=token,
+        )
+        return validate_response_json(GetPostByIdResponse, resp.content), resp
@@ -1,10 +1,10 @@
 # base/api/profile_api.py
 
 import allure
-from pydantic import TypeAdapter
-from utils.clients.http_client import HTTPClient
+from utils.clients.http_client import HTTPClient, AsyncHTTPClient
 from utils.constants.routes import APIRoutes
 from models.responses.profile_responses import ProfileResponse
+from models.responses.adapters import validate_response_json
 
 
 class ProfileAPI:
@@ -18,4 +18,17 @@ class ProfileAPI:
             f"{APIRoutes.PROFILE}/info",
             token=token,
         )
-        return TypeAdapter(ProfileResponse).validate_python(resp.json())
+        return validate_response_json(ProfileResponse, resp.content)
+
+
+class AsyncProfileAPI:
+    def __init__(self, client: AsyncHTTPClient):
+        self.client = client
+
+    async def get_profile(self, token) -> ProfileResponse:
+        """POST /api/v1/profile/info"""
+        resp = await self.client.post(
+            f"{APIRoutes.PROFILE}/info",
+            token=token,
+        )
+        return validate_response_json(ProfileResponse, resp.content)
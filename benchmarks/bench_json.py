@@ -0,0 +1,65 @@
+# benchmarks/bench_json.py
+"""
+микробенчмарк JSON-пути ответа и вложений: прежний (resp.json() через stdlib json + validate_python,
+json.dumps(indent=2) для вложений) против текущего (validate_json по сырым байтам, utils.serializer).
+с --cassette-dir дополнительно разбираются тела всех записанных ответов (кассеты из --cassette-mode=record).
+
+запуск из корня репозитория:
+    python -m benchmarks.bench_json [--number 2000] [--cassette-dir reports/cassettes]
+"""
+
+import argparse
+import json
+import timeit
+from typing import Any, Callable, List, Optional, Tuple
+
+from benchmarks.bench_response_validation import ERROR_PAYLOAD, OK_PAYLOADS, _type_name
+from models.responses.adapters import get_adapter
+from utils import serializer
+from utils.cassette import iter_cassettes
+
+
+def _per_call_us(stmt: Callable[[], Any], number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=3)) / number * 1e6
+
+
+def run(number: int, cassette_dir: Optional[str] = None) -> List[Tuple[str, str, float, float]]:
+    rows = []
+    for response_type, payload in OK_PAYLOADS.items():
+        adapter = get_adapter(response_type)
+        for kind, data in (("ok", payload), ("error", ERROR_PAYLOAD)):
+            raw = json.dumps(data).encode()
+            before = _per_call_us(lambda: adapter.validate_python(json.loads(raw)), number)
+            after = _per_call_us(lambda: adapter.validate_json(raw), number)
+            rows.append((f"validate {_type_name(response_type)}", kind, before, after))
+
+    for response_type, payload in OK_PAYLOADS.items():
+        before = _per_call_us(lambda: json.dumps(payload, default=str, ensure_ascii=False, indent=2), number)
+        after = _per_call_us(lambda: serializer.dumps(payload, pretty=True), number)
+        rows.append((f"attach {_type_name(response_type)}", "ok", before, after))
+
+    if cassette_dir:
+        bodies = [entry.content.encode() for cassette in iter_cassettes(cassette_dir) for entry in cassette.entries
+                  if entry.content_type and "json" in entry.content_type]
+        if bodies:
+            corpus_number = max(1, number // len(bodies))
+            before = _per_call_us(lambda: [json.loads(body) for body in bodies], corpus_number) / len(bodies)
+            after = _per_call_us(lambda: [serializer.loads(body) for body in bodies], corpus_number) / len(bodies)
+            rows.append((f"loads cassettes ({len(bodies)} bodies)", "mixed", before, after))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000, help="вызовов на один замер")
+    parser.add_argument("--cassette-dir", help="каталог кассет - корпус записанных ответов")
+    args = parser.parse_args()
+
+    print(f"JSON backend: {serializer.backend_name()}")
+    print(f"{'stage':<40}{'payload':<8}{'before, us':>12}{'after, us':>12}{'speedup':>10}")
+    for name, kind, before, after in run(args.number, args.cassette_dir):
+        print(f"{name:<40}{kind:<8}{before:>12.2f}{after:>12.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# benchmarks/bench_request_overhead.py
+"""
+микробенчмарк накладных расходов HTTPClient на запрос без сети: ответ отдаёт httpx.MockTransport.
+сравнивается подготовка заголовков в прежнем виде (копия заголовков клиента, слияние, маскированная копия
+на каждый запрос) и текущая (заголовки клиента не копируются, Authorization кешируется по токену,
+маскированная копия - только при записи вложения), при немедленных и при отложенных вложениях.
+
+запуск из корня репозитория:
+    python -m benchmarks.bench_request_overhead [--number 2000]
+"""
+
+import argparse
+import timeit
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from utils.allure_helpers import (
+    attach_http_request,
+    begin_test_attachments,
+    configure_attachments,
+    end_test_attachments,
+)
+from utils.clients.http_client import HTTPClient
+
+BASE_URL = "http://nanoreddit.bench"
+TOKEN = "header." + "p" * 200 + ".signature"
+PAYLOAD = {"title": "Benchmark title", "content": "Benchmark content " * 10}
+NODEID = "benchmarks/bench_request_overhead.py::run"
+RESPONSE_BODY = b'{"status": "ok", "responseData": {"id": "3f1c1a9e-8a57-4e55-9b8f-0d7f6bb1e7a1"}}'
+
+
+class _LegacyHTTPClient(HTTPClient):
+    """подготовка запроса до кеширования заголовков"""
+
+    def _prepare_request(self, method: str, path: str, token: Optional[str],
+                         kwargs: Dict[str, Any]) -> Tuple[Dict[str, str], Callable[[], Dict[str, Any]]]:
+        base_headers = dict(self.client.headers)
+        extra_headers = dict(kwargs.pop("headers", {}) or {})
+        if token and "Authorization" not in extra_headers:
+            extra_headers["Authorization"] = f"Bearer {token}"
+        request_headers = {**base_headers, **extra_headers}
+        request_payload = kwargs.get("json")
+        if request_payload is None:
+            request_payload = kwargs.get("data")
+        request_info = {
+            "method": method.upper(),
+            "url": f"{self.client.base_url}{path}",
+            "headers": self._sanitize_headers(request_headers),
+            "params": kwargs.get("params"),
+            "body": self._trim_body(request_payload),
+        }
+        return request_headers, lambda: request_info
+
+
+def _make_client(client_class=HTTPClient) -> HTTPClient:
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, content=RESPONSE_BODY, headers={"content-type": "application/json"})
+    )
+    return client_class(base_url=BASE_URL, transport=transport)
+
+
+def _per_call_us(stmt: Callable[[], Any], number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=3)) / number * 1e6
+
+
+def _with_policy(policy: str, stmt: Callable[[], Any], number: int) -> float:
+    configure_attachments(policy)
+    begin_test_attachments(NODEID)
+    try:
+        return _per_call_us(stmt, number)
+    finally:
+        end_test_attachments()
+        configure_attachments("always")
+
+
+def run(number: int) -> List[Tuple[str, str, float, float]]:
+    legacy, client = _make_client(_LegacyHTTPClient), _make_client()
+    path = "/api/v1/posts/publish"
+
+    def prepare(http_client: HTTPClient) -> Callable[[], None]:
+        def stmt():
+            _, request_info = http_client._prepare_request("POST", path, TOKEN, {"json": PAYLOAD})
+            attach_http_request(request_info)
+        return stmt
+
+    def full_request(http_client: HTTPClient) -> Callable[[], None]:
+        def stmt():
+            begin_test_attachments(NODEID)  # отложенные вложения не копятся между вызовами
+            http_client.post(path, json=PAYLOAD, token=TOKEN)
+        return stmt
+
+    rows = []
+    try:
+        for name, stmt in (("prepare + attach request", prepare), ("full request (mock transport)", full_request)):
+            for policy in ("always", "on-failure"):
+                before = _with_policy(policy, stmt(legacy), number)
+                after = _with_policy(policy, stmt(client), number)
+                rows.append((name, policy, before, after))
+    finally:
+        legacy.close()
+        client.close()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000, help="вызовов на один замер")
+    args = parser.parse_args()
+
+    print(f"{'stage':<32}{'attachments':<13}{'before, us':>12}{'after, us':>12}{'speedup':>10}")
+    for name, policy, before, after in run(args.number):
+        print(f"{name:<32}{policy:<13}{before:>12.2f}{after:>12.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
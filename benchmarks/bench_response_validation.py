@@ -0,0 +1,122 @@
+# benchmarks/bench_response_validation.py
+"""
+микробенчмарк стоимости валидации ответов: TypeAdapter(...) на каждый вызов против закешированного адаптера.
+
+запуск из корня репозитория:
+    python -m benchmarks.bench_response_validation [--number 2000]
+"""
+
+import argparse
+import timeit
+from typing import Annotated, Any, Dict, List, Tuple, get_args, get_origin
+
+from pydantic import TypeAdapter
+
+from models.responses.adapters import RESPONSE_TYPES, get_adapter
+from models.responses.admin_responses import (
+    GetUserProfileResponse,
+    GetUserProfileByEmailResponse,
+    BanUserResponse,
+    UnbanUserResponse,
+)
+from models.responses.auth_responses import RegisterResponse, LoginResponse
+from models.responses.comments_responses import ReplyCommentResponse
+from models.responses.posts_responses import (
+    PublishPostResponse,
+    VotePostResponse,
+    AddCommentResponse,
+    GetPostsResponse,
+    GetPostByIdResponse,
+)
+from models.responses.profile_responses import ProfileResponse
+
+ERROR_PAYLOAD = {"status": "error", "error": "An error occurred"}
+
+_POST = {
+    "id": "3f1c1a9e-8a57-4e55-9b8f-0d7f6bb1e7a1",
+    "title": "Benchmark title",
+    "content": "Benchmark content " * 10,
+    "author": "bench_user",
+    "createdAt": "2025-01-01T00:00:00",
+}
+_COMMENT = {
+    "id": "5b0b7f52-1f2e-4a3e-bb3c-7c1d2b1c0f11",
+    "text": "Benchmark comment",
+    "author": "bench_user",
+    "createdAt": "2025-01-01T00:00:00",
+    "replies": [],
+}
+_ADMIN_PROFILE = {
+    "id": 1,
+    "email": "bench@example.com",
+    "username": "bench_user",
+    "bannedUntil": None,
+    "authorities": ["ROLE_USER"],
+}
+
+OK_PAYLOADS: Dict[Any, Dict[str, Any]] = {
+    RegisterResponse: {"status": "ok", "responseData": "User bench_user registered"},
+    LoginResponse: {"status": "ok", "responseData": {"jwt": "header.payload.signature"}},
+    PublishPostResponse: {"status": "ok", "responseData": _POST},
+    VotePostResponse: {"status": "ok"},
+    AddCommentResponse: {"status": "ok"},
+    GetPostsResponse: {
+        "status": "ok",
+        "responseData": {
+            "content": [_POST] * 20,
+            "pageNumber": 0,
+            "pageSize": 20,
+            "totalElements": 20,
+            "totalPages": 1,
+        },
+    },
+    GetPostByIdResponse: {
+        "status": "ok",
+        "responseData": {
+            "post": _POST,
+            "comments": [{**_COMMENT, "replies": [dict(_COMMENT)]}] * 20,
+            "voteScore": 1,
+            "hasMoreComments": False,
+        },
+    },
+    ReplyCommentResponse: {"status": "ok", "responseData": _COMMENT},
+    ProfileResponse: {"status": "ok", "responseData": _ADMIN_PROFILE},
+    GetUserProfileResponse: {"status": "ok", "responseData": _ADMIN_PROFILE},
+    GetUserProfileByEmailResponse: {"status": "ok", "responseData": _ADMIN_PROFILE},
+    BanUserResponse: {"status": "ok", "responseData": {"bannedUntil": "2025-01-02T00:00:00"}, "message": "User banned"},
+    UnbanUserResponse: {"status": "ok", "responseData": {"bannedUntil": None}, "message": "User unbanned"},
+}
+
+
+def _type_name(response_type: Any) -> str:
+    union = get_args(response_type)[0] if get_origin(response_type) is Annotated else response_type
+    return get_args(union)[0].__name__.removesuffix("OK")
+
+
+def _per_call_us(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=3)) / number * 1e6
+
+
+def run(number: int) -> List[Tuple[str, str, float, float]]:
+    rows = []
+    for response_type in RESPONSE_TYPES:
+        for kind, payload in (("ok", OK_PAYLOADS[response_type]), ("error", ERROR_PAYLOAD)):
+            before = _per_call_us(lambda: TypeAdapter(response_type).validate_python(payload), number)
+            adapter = get_adapter(response_type)
+            after = _per_call_us(lambda: adapter.validate_python(payload), number)
+            rows.append((_type_name(response_type), kind, before, after))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000, help="вызовов на один замер")
+    args = parser.parse_args()
+
+    print(f"{'response':<32}{'payload':<8}{'per-call TypeAdapter, us':>26}{'cached, us':>12}{'speedup':>10}")
+    for name, kind, before, after in run(args.number):
+        print(f"{name:<32}{kind:<8}{before:>26.2f}{after:>12.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,47 @@
 # conftest.py
 
+import json
 import os
 import shutil
 import pytest
-from dotenv import load_dotenv
-from settings import get_settings
+from settings import ENV_FILES, get_settings, load_env
+from utils.allure_helpers import (
+    ATTACHMENT_POLICIES,
+    DEFAULT_ATTACHMENT_SAMPLE_RATE,
+    DEFAULT_MAX_RESPONSE_BODY_BYTES,
+    begin_test_attachments,
+    configure_attachments,
+    end_test_attachments,
+    flush_attachments,
+)
+from utils.assertions.database_state import COUNT_MODES, enable_seq_scan_check, set_count_mode
+from utils.assertions.latency import check_latency_budget
+from utils.cassette import (
+    CASSETTE_KEY,
+    CASSETTE_MATCH_MODES,
+    CASSETTE_MODES,
+    DEFAULT_CASSETTE_DIR,
+    CassetteLibrary,
+    seed_generators,
+)
+from utils.latency import LATENCY_RECORDER_KEY, LatencyCapture, LatencyRecorder, format_latency_table
+from utils.parallel import (
+    NO_RUN_LOCK_MESSAGE,
+    create_run_lock_path,
+    get_run_lock_path,
+    has_run_lock,
+    is_controller,
+    remove_run_lock_files,
+    run_lock,
+)
+from utils.stand_in import STAND_IN_KEY, StandInServer
+from utils.user_pool import DEFAULT_USER_POOL_SIZE
 
 SECRET_PLACEHOLDER = "***"
 ALLURE_DIR = "reports/allure-results"
+LATENCY_REPORT_PATH = "reports/latency.json"
+LATENCY_BUDGET_PROPERTY = "latency_budget"
+_latency_capture_key = pytest.StashKey[LatencyCapture]()
 
 pytest_plugins = (
     "utils.fixtures.base",
@@ -22,19 +56,156 @@ pytest_plugins = (
 def pytest_addoption(parser: pytest.Parser) -> None:
     """
     --env=local|dev|stg|prod-test
+    --user-pool-size=N
+    --latency-budget-mode=off|flag|strict
+    --allure-attachments=always|on-failure|sampled
+    --allure-sample-rate=0.1
+    --allure-max-body-bytes=N
+    --db-explain-check
+    --db-count-mode=exact|watermark
+    --token-cache=PATH
+    --db-snapshot=PATH
+    --stand-in
+    --stand-in-latency-ms=N
+    --cassette-mode=off|record|replay
+    --cassette-dir=PATH
+    --cassette-match=strict|loose
     """
 
     parser.addoption(
         "--env",
         action="store",
         default="local",
-        choices=["local", "dev", "stg", "prod-test"],
+        choices=list(ENV_FILES),
         help=(
             "Target environment for tests. "
             "Controls which .env.* file will be loaded "
             "(local -> .env, dev -> .env.dev, stg -> .env.stg, prod-test -> .env.prod-test)."
         ),
     )
+    parser.addoption(
+        "--user-pool-size",
+        action="store",
+        type=int,
+        default=DEFAULT_USER_POOL_SIZE,
+        help="How many users with JWT tokens the session user pool provisions per batch.",
+    )
+    parser.addoption(
+        "--latency-budget-mode",
+        action="store",
+        default="flag",
+        choices=["off", "flag", "strict"],
+        help=(
+            "What to do when a test exceeds its latency_budget marker: "
+            "flag -> PERF-FAIL status only, strict -> fail the test, off -> do not check."
+        ),
+    )
+    parser.addoption(
+        "--allure-attachments",
+        action="store",
+        default="always",
+        choices=list(ATTACHMENT_POLICIES),
+        help=(
+            "When HTTP/SQL attachments are serialized and written: "
+            "always -> immediately, on-failure -> only for failed tests, "
+            "sampled -> for failed tests and a deterministic share of passed ones (--allure-sample-rate)."
+        ),
+    )
+    parser.addoption(
+        "--allure-sample-rate",
+        action="store",
+        type=float,
+        default=DEFAULT_ATTACHMENT_SAMPLE_RATE,
+        help="Share of tests (0..1) that keep all attachments with --allure-attachments=sampled.",
+    )
+    parser.addoption(
+        "--allure-max-body-bytes",
+        action="store",
+        type=int,
+        default=DEFAULT_MAX_RESPONSE_BODY_BYTES,
+        help="Response bodies larger than this are attached truncated, as plain text.",
+    )
+    parser.addoption(
+        "--db-explain-check",
+        action="store_true",
+        default=False,
+        help="EXPLAIN every typed DB lookup helper query and fail it if the plan falls back to a Seq Scan.",
+    )
+    parser.addoption(
+        "--db-count-mode",
+        action="store",
+        default="exact",
+        choices=list(COUNT_MODES),
+        help=(
+            "How 'no new rows' checks snapshot a table: exact -> full COUNT(*) (default), "
+            "watermark -> MAX of a monotonic column (needs an index on it; falls back to exact "
+            "when MAX(created_at) is in the future). watermark is best-effort: it misses rows from transactions "
+            "that took their created_at/id before the snapshot but committed after it."
+        ),
+    )
+    parser.addoption(
+        "--token-cache",
+        action="store",
+        default=None,
+        help=(
+            "JSON file that keeps JWT tokens between runs (refreshed near exp), e.g. "
+            ".pytest_cache/nanoreddit/tokens.json; it holds live tokens, keep it out of git. "
+            "Default: in-memory per session."
+        ),
+    )
+    parser.addoption(
+        "--db-snapshot",
+        action="store",
+        default=None,
+        help=(
+            "JSON snapshot of the seeded admin/banned users (--env=local only): restored into the DB at session start "
+            "while the seed checksum matches, otherwise re-seeded via API and captured. Holds the seed users' "
+            "passwords: keep it out of git, e.g. .pytest_cache/nanoreddit/seed_snapshot.json."
+        ),
+    )
+    parser.addoption(
+        "--stand-in",
+        action="store_true",
+        default=False,
+        help=(
+            "Serve the API from an in-process in-memory stand-in instead of BASE_URL. "
+            "Tests that check DB state are skipped."
+        ),
+    )
+    parser.addoption(
+        "--stand-in-latency-ms",
+        action="store",
+        type=float,
+        default=0.0,
+        help="Artificial latency added to every stand-in response, ms. Default: 0.",
+    )
+    parser.addoption(
+        "--cassette-mode",
+        action="store",
+        default="off",
+        choices=CASSETTE_MODES,
+        help=(
+            "record: save every HTTP request/response pair to a per-test cassette; "
+            "replay: serve responses from cassettes without network (DB state checks are skipped). Default: off."
+        ),
+    )
+    parser.addoption(
+        "--cassette-dir",
+        action="store",
+        default=DEFAULT_CASSETTE_DIR,
+        help=f"Directory with cassettes for --cassette-mode. Default: {DEFAULT_CASSETTE_DIR}.",
+    )
+    parser.addoption(
+        "--cassette-match",
+        action="store",
+        default="strict",
+        choices=CASSETTE_MATCH_MODES,
+        help=(
+            "strict: replay fails with CassetteMiss unless path, query and body match a recorded request; "
+            "loose: fall back to the next recorded response of the same endpoint and attach the mismatch. "
+            "Default: strict."
+        ),
+    )
 
 
 def _load_env_for_pytest(config: pytest.Config) -> str:
@@ -42,17 +213,7 @@ def _load_env_for_pytest(config: pytest.Config) -> str:
     выбирает .env-файл на основе опции --env и подгружает его в переменные окружения.
     """
     env_name: str = config.getoption("--env")
-    env_file_map = {
-        "local": ".env",
-        "dev": ".env.dev",
-        "stg": ".env.stg",
-        "prod-test": ".env.prod-test",
-    }
-    env_file = env_file_map.get(env_name, ".env")
-    os.environ["TEST_ENV"] = env_name
-
-    load_dotenv(dotenv_path=env_file, override=True)
-    return env_file
+    return load_env(env_name)
 
 
 def pytest_configure(config: pytest.Config):
@@ -60,15 +221,51 @@ def pytest_configure(config: pytest.Config):
     # лёгкая проверка, что настройки читаются (и чтобы быстрее поймать проблемы с env)
     _ = get_settings()
 
+    config.stash[LATENCY_RECORDER_KEY] = LatencyRecorder()
+    if config.getoption("--stand-in"):
+        if config.getoption("--db-explain-check"):
+            raise pytest.UsageError("--db-explain-check needs a live Postgres and cannot be combined with --stand-in")
+        config.stash[STAND_IN_KEY] = StandInServer(latency_ms=config.getoption("--stand-in-latency-ms"))
+    cassette_mode = config.getoption("--cassette-mode")
+    if cassette_mode != "off":
+        if cassette_mode == "replay" and config.getoption("--stand-in"):
+            raise pytest.UsageError("--cassette-mode=replay and --stand-in are mutually exclusive")
+        workerinput = getattr(config, "workerinput", None)
+        cassettes = CassetteLibrary(config.getoption("--cassette-dir"), cassette_mode,
+                                    run_id=workerinput["testrunuid"] if workerinput else None,
+                                    match=config.getoption("--cassette-match"))
+        config.stash[CASSETTE_KEY] = cassettes
+        # данные, сгенерированные при сборе тестов (параметры), совпадают в записи и воспроизведении
+        seed_generators(cassettes.seed)
+    configure_attachments(
+        config.getoption("--allure-attachments"),
+        sample_rate=config.getoption("--allure-sample-rate"),
+        max_response_body_bytes=config.getoption("--allure-max-body-bytes"),
+    )
+    enable_seq_scan_check(config.getoption("--db-explain-check"))
+    set_count_mode(config.getoption("--db-count-mode"))
+
     config.addinivalue_line("markers", "doc_issue: тест формально проходит, но есть ошибка в документации")
     config.addinivalue_line("markers", "no_validation_for_max_value: отсутствует валидация верхних значений")
     config.addinivalue_line(
         "markers",
         "password_special_symbol_issue: разные требования к паролю на этапе регистрации и логина",
     )
+    config.addinivalue_line(
+        "markers",
+        "latency_budget(p50_ms=None, p95_ms=None, p99_ms=None, max_ms=None, endpoint=None, strict=False): "
+        "бюджет латентности HTTP-запросов, выполненных в теле теста",
+    )
+    config.addinivalue_line(
+        "markers",
+        "exclusive_db: тест проверяет состояние всей таблицы, под xdist выполняется без параллельных записей",
+    )
+    if is_controller(config) and config.getoption("numprocesses", None) and not has_run_lock():
+        config.issue_config_time_warning(pytest.PytestConfigWarning(NO_RUN_LOCK_MESSAGE), stacklevel=2)
 
-    # очистка результатов Allure перед каждым прогоном
-    if os.path.exists(ALLURE_DIR):
+    # очистка результатов Allure перед каждым прогоном; под xdist её делает только контроллер,
+    # иначе воркеры удаляли бы уже записанные результаты друг друга
+    if is_controller(config) and os.path.exists(ALLURE_DIR):
         try:
             shutil.rmtree(ALLURE_DIR)
         except (PermissionError, OSError):
@@ -90,6 +287,14 @@ def pytest_configure(config: pytest.Config):
 
 
 def pytest_sessionfinish(session, exitstatus):
+    if CASSETTE_KEY in session.config.stash:
+        session.config.stash[CASSETTE_KEY].close()
+
+    if not is_controller(session.config):
+        # латентности воркера уходят контроллеру и сливаются в pytest_testnodedown
+        session.config.workeroutput["latency"] = session.config.stash[LATENCY_RECORDER_KEY].to_dict()
+        return
+
     os.makedirs(ALLURE_DIR, exist_ok=True)
 
     settings = get_settings()
@@ -108,6 +313,125 @@ def pytest_sessionfinish(session, exitstatus):
     print(f"\n[ALLURE] environment.properties generated at: {os.path.abspath(env_file)}")
 
 
+_run_lock_path_key = pytest.StashKey[str]()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    # хук pytest-xdist на контроллере: один lock-файл на прогон для всех воркеров
+    config = node.config
+    if _run_lock_path_key not in config.stash:
+        config.stash[_run_lock_path_key] = create_run_lock_path()
+    node.workerinput["run_lock_path"] = config.stash[_run_lock_path_key]
+
+
+def pytest_unconfigure(config):
+    if is_controller(config) and _run_lock_path_key in config.stash:
+        remove_run_lock_files(config.stash[_run_lock_path_key])
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    # блокировка держится весь протокол теста, включая подготовку и teardown фикстур module/session:
+    # под xdist тест с маркером exclusive_db выполняется, пока остальные воркеры не пишут в БД
+    exclusive = item.get_closest_marker("exclusive_db") is not None
+    with run_lock(get_run_lock_path(item.config), exclusive=exclusive):
+        yield
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    # хук pytest-xdist на контроллере: воркер завершился
+    latency = getattr(node, "workeroutput", {}).get("latency")
+    if latency:
+        node.config.stash[LATENCY_RECORDER_KEY].merge(LatencyRecorder.from_dict(latency))
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    # до фикстур теста: вложения, сделанные при их подготовке, тоже подчиняются политике
+    begin_test_attachments(item.nodeid)
+    cassettes = item.config.stash.get(CASSETTE_KEY, None)
+    if cassettes is not None:
+        cassettes.begin(item.nodeid)
+    # без блокировки прогона тест шёл бы параллельно с записями других воркеров и проверял бы чужие строки
+    if (item.get_closest_marker("exclusive_db") is not None and get_run_lock_path(item.config) is not None
+            and not has_run_lock()):
+        pytest.fail(NO_RUN_LOCK_MESSAGE, pytrace=False)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    cassettes = request.config.stash.get(CASSETTE_KEY, None)
+    if cassettes is None:
+        yield
+        return
+    # у каждой фикстуры свой сид: её данные не зависят от того, какие фикстуры и тесты выполнялись до неё
+    name = f"{fixturedef.argname}@{request.node.nodeid}"
+    seed_generators(cassettes.test_seed(name))
+    if fixturedef.scope == "function":
+        yield
+        return
+    # фикстура шире function пишется в свою кассету: её трафик не зависит от того, какой тест пришёл первым
+    cassettes.begin(name)
+    try:
+        yield
+    finally:
+        cassettes.end()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    cassettes = item.config.stash.get(CASSETTE_KEY, None)
+    if cassettes is not None:
+        seed_generators(cassettes.test_seed(item.nodeid))
+
+    marker = item.get_closest_marker("latency_budget")
+    if marker is None or item.config.getoption("--latency-budget-mode") == "off":
+        yield
+        return
+
+    with item.config.stash[LATENCY_RECORDER_KEY].capture() as capture:
+        yield
+    item.stash[_latency_capture_key] = capture
+
+
+def _check_latency_budget(item, report) -> None:
+    marker = item.get_closest_marker("latency_budget")
+    budgets = {k: v for k, v in marker.kwargs.items() if k != "strict"}
+    violations = check_latency_budget(item.stash[_latency_capture_key], **budgets)
+    # user_properties, а не атрибут отчёта: так результат доходит до контроллера xdist
+    report.user_properties.append((LATENCY_BUDGET_PROPERTY, "; ".join(violations)))
+
+    strict = marker.kwargs.get("strict") or item.config.getoption("--latency-budget-mode") == "strict"
+    if violations and strict and report.passed:
+        report.outcome = "failed"
+        report.longrepr = "Latency budget exceeded: " + "; ".join(violations)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if call.when == "call" and _latency_capture_key in item.stash:
+        _check_latency_budget(item, report)
+
+    # отложенные вложения пишутся только для упавшего теста
+    if report.failed:
+        flush_attachments()
+    if call.when == "teardown":
+        end_test_attachments()
+        if CASSETTE_KEY in item.config.stash:
+            item.config.stash[CASSETTE_KEY].end()
+
+
+def _latency_budget_violations(report):
+    for name, value in getattr(report, "user_properties", []):
+        if name == LATENCY_BUDGET_PROPERTY:
+            return value
+    return None
+
+
 def pytest_report_teststatus(report):
     if report.when != "call":
         return
@@ -132,6 +456,13 @@ def pytest_report_teststatus(report):
         else:
             return "password_issue", "P", "PASSISSUE"
 
+    latency_violations = _latency_budget_violations(report)
+    if latency_violations is not None:
+        if report.failed or latency_violations:
+            return "perf", "B", "PERF-FAIL"
+        else:
+            return "perf", "B", "PERF"
+
 
 def pytest_terminal_summary(terminalreporter, exitstatus):
     tr = terminalreporter
@@ -148,3 +479,36 @@ def pytest_terminal_summary(terminalreporter, exitstatus):
             for rep in reps:
                 # rep.nodeid — путь к тесту, rep.outcome — passed/failed
                 tr.write_line(f"{rep.nodeid} -> {rep.outcome.upper()}")
+
+    perf_reps = tr.stats.get("perf", [])
+    if perf_reps:
+        tr.write_sep("-", f"LATENCY BUDGET ({len(perf_reps)})")
+        for rep in perf_reps:
+            violations = _latency_budget_violations(rep)
+            status = "PERF-FAIL" if rep.failed or violations else "PERF"
+            tr.write_line(f"{rep.nodeid} -> {status}" + (f" ({violations})" if violations else ""))
+
+    _write_latency_summary(tr, tr.config)
+
+
+def _write_latency_summary(tr, config: pytest.Config) -> None:
+    recorder = config.stash.get(LATENCY_RECORDER_KEY, None)
+    if recorder is None or not recorder.endpoints:
+        return
+
+    rows = recorder.summary()
+    tr.write_sep("-", f"HTTP LATENCY ({sum(row['requests'] for row in rows)} requests)")
+    for line in format_latency_table(rows):
+        tr.write_line(line)
+    reuse = recorder.connection_reuse()
+    # без новых соединений считать нечего: так бывает, только если ответы отдаёт не сеть (--stand-in)
+    if reuse["new_connections"]:
+        tr.write_line(
+            f"connections: {reuse['new_connections']} opened, {reuse['reused']} requests reused an open connection "
+            f"({reuse['reuse_ratio']:.1%})"
+        )
+
+    os.makedirs(os.path.dirname(LATENCY_REPORT_PATH), exist_ok=True)
+    with open(LATENCY_REPORT_PATH, "w", encoding="utf-8") as f:
+        json.dump({"endpoints": rows, "connections": reuse}, f, indent=2)
+    tr.write_line(f"[LATENCY] summary written to {os.path.abspath(LATENCY_REPORT_PATH)}")
@@ -0,0 +1,73 @@
+# loadtest/__main__.py
+"""
+нагрузочный режим: переиспользует async-обёртки base/api как генератор трафика.
+
+запуск из корня репозитория:
+    python -m loadtest --env=local --users 50 --duration 60 [--ramp-up 10] [--weights vote=5,publish=1] [--json out.json]
+    python -m loadtest --stand-in [--stand-in-latency-ms 5] ...   # без сервиса: сервер в памяти процесса
+"""
+
+import argparse
+import asyncio
+import json
+
+from loadtest.scenarios import DEFAULT_WEIGHTS, run_load
+from settings import ENV_FILES, get_settings, load_env
+from utils.latency import format_latency_table
+from utils.stand_in import StandInServer
+
+
+def _parse_weights(raw: str) -> dict:
+    weights = dict(DEFAULT_WEIGHTS)
+    for item in filter(None, raw.split(",")):
+        name, _, value = item.partition("=")
+        if name not in DEFAULT_WEIGHTS:
+            raise argparse.ArgumentTypeError(f"Unknown scenario '{name}', expected one of {list(DEFAULT_WEIGHTS)}")
+        weights[name] = int(value)
+    return weights
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--env", default="local", choices=list(ENV_FILES))
+    parser.add_argument("--base-url", help="переопределяет BASE_URL из .env-файла окружения")
+    parser.add_argument("--users", type=int, default=10, help="число виртуальных пользователей")
+    parser.add_argument("--duration", type=float, default=30.0, help="длительность нагрузки, секунды")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="за сколько секунд стартуют все пользователи")
+    parser.add_argument("--think-time", type=float, default=0.0, help="пауза между действиями, секунды")
+    parser.add_argument("--weights", type=_parse_weights, default=dict(DEFAULT_WEIGHTS),
+                        help=f"веса сценариев, например vote=5,publish=1 (по умолчанию {DEFAULT_WEIGHTS})")
+    parser.add_argument("--json", dest="json_path", help="куда сохранить сводку в JSON")
+    parser.add_argument("--stand-in", action="store_true", help="отвечает сервер в памяти процесса, а не BASE_URL")
+    parser.add_argument("--stand-in-latency-ms", type=float, default=0.0, help="задержка ответа stand-in, мс")
+    args = parser.parse_args()
+
+    load_env(args.env)
+    base_url = args.base_url or get_settings().base_url
+
+    transport = StandInServer(latency_ms=args.stand_in_latency_ms).async_transport() if args.stand_in else None
+    target = "in-process stand-in" if args.stand_in else base_url
+    print(f"[load] {args.users} virtual users for {args.duration:.0f}s against {target}")
+    recorder, elapsed_s = asyncio.run(run_load(
+        base_url=base_url,
+        users=args.users,
+        duration_s=args.duration,
+        ramp_up_s=args.ramp_up,
+        think_time_s=args.think_time,
+        weights=args.weights,
+        transport=transport,
+    ))
+
+    rows = recorder.summary()
+    print("\n".join(format_latency_table(rows, elapsed_s=elapsed_s)))
+    total = sum(row["requests"] for row in rows)
+    errors = sum(row["errors"] for row in rows)
+    print(f"total: {total} requests, {errors} errors, {total / elapsed_s:.1f} rps over {elapsed_s:.1f}s")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"elapsed_s": elapsed_s, "users": args.users, "endpoints": rows}, f, indent=2)
+        print(f"[load] summary written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
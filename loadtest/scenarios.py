@@ -0,0 +1,163 @@
+# loadtest/scenarios.py
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import httpx
+
+from base.api.auth_api import AsyncAuthAPI
+from base.api.comments_api import AsyncCommentsAPI
+from base.api.posts_api import AsyncPostsAPI
+from models.requests.auth_requests import RegisterUser, LoginUser
+from models.requests.comments_requests import ReplyCommentPayload
+from models.requests.posts_requests import PublishPostPayload, AddCommentPayload
+from utils.clients.http_client import AsyncHTTPClient
+from utils.data_generators.fake_credentials import fake_password
+from utils.latency import LatencyRecorder
+
+# вес сценария ~ доля действий виртуального пользователя; первая публикация делается до основного цикла
+DEFAULT_WEIGHTS: Dict[str, int] = {
+    "get_posts": 5,
+    "get_post": 3,
+    "vote": 3,
+    "comment": 3,
+    "reply": 1,
+    "publish": 2,
+    "login": 1,
+}
+KNOWN_IDS_LIMIT = 1000
+
+
+class SharedState:
+    """id постов и комментариев, созданных всеми виртуальными пользователями (ограниченный буфер)"""
+
+    def __init__(self):
+        self.post_ids: List[str] = []
+        self.comment_ids: List[str] = []
+
+    @staticmethod
+    def remember(ids: List[str], new_id: str) -> None:
+        ids.append(new_id)
+        if len(ids) > KNOWN_IDS_LIMIT:
+            del ids[: len(ids) - KNOWN_IDS_LIMIT]
+
+
+class VirtualUser:
+    def __init__(self, client: AsyncHTTPClient, state: SharedState, weights: Dict[str, int], think_time_s: float):
+        self.auth_api = AsyncAuthAPI(client)
+        self.posts_api = AsyncPostsAPI(client)
+        self.comments_api = AsyncCommentsAPI(client)
+        self.state = state
+        self.think_time_s = think_time_s
+        self.user = RegisterUser.random(password=fake_password())
+        self.token: Optional[str] = None
+
+        actions: Dict[str, Callable[[], Awaitable[None]]] = {
+            "get_posts": self.get_posts,
+            "get_post": self.get_post,
+            "vote": self.vote,
+            "comment": self.comment,
+            "reply": self.reply,
+            "publish": self.publish,
+            "login": self.login,
+        }
+        self._actions: List[Tuple[Callable[[], Awaitable[None]], int]] = [
+            (actions[name], weight) for name, weight in weights.items() if weight > 0
+        ]
+
+    async def login(self) -> None:
+        self.token = await self.auth_api.login_and_get_token(LoginUser.from_register(self.user))
+
+    async def publish(self) -> None:
+        resp = await self.posts_api.publish_post(self.token, PublishPostPayload.random())
+        if resp.status == "ok":
+            self.state.remember(self.state.post_ids, resp.responseData.id)
+
+    async def get_posts(self) -> None:
+        await self.posts_api.get_posts(self.token, page=random.randint(0, 4), size=20, sort="createdAt,desc")
+
+    async def get_post(self) -> None:
+        if not self.state.post_ids:
+            return await self.publish()
+        resp, _ = await self.posts_api.get_post_by_id(self.token, random.choice(self.state.post_ids))
+        if resp.status == "ok":
+            for comment in resp.responseData.comments[:5]:
+                self.state.remember(self.state.comment_ids, comment.id)
+
+    async def vote(self) -> None:
+        if not self.state.post_ids:
+            return await self.publish()
+        await self.posts_api.vote_post(self.token, random.choice(self.state.post_ids), random.choice((1, -1)))
+
+    async def comment(self) -> None:
+        if not self.state.post_ids:
+            return await self.publish()
+        await self.posts_api.add_comment(self.token, random.choice(self.state.post_ids), AddCommentPayload.random())
+
+    async def reply(self) -> None:
+        if not self.state.comment_ids:
+            return await self.get_post()
+        await self.comments_api.reply_comment(self.token, random.choice(self.state.comment_ids),
+                                              ReplyCommentPayload.random())
+
+    async def run(self, deadline: float) -> None:
+        # register -> login -> publish, дальше взвешенный случайный выбор действий до дедлайна
+        await self.auth_api.register_user(self.user)
+        await self.login()
+        if self.token is None:
+            raise RuntimeError(f"Virtual user {self.user.email} failed to log in")
+        await self.publish()
+
+        actions, weights = zip(*self._actions)
+        while time.perf_counter() < deadline:
+            action = random.choices(actions, weights=weights)[0]
+            try:
+                await action()
+            except (httpx.HTTPError, ValueError):
+                # ошибка уже учтена в статистике (транспорт) или ответ не прошёл валидацию - продолжаем нагрузку
+                pass
+            if self.think_time_s:
+                await asyncio.sleep(self.think_time_s)
+
+
+async def run_load(
+        base_url: str,
+        users: int,
+        duration_s: float,
+        ramp_up_s: float = 0.0,
+        think_time_s: float = 0.0,
+        weights: Optional[Dict[str, int]] = None,
+        max_connections: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> Tuple[LatencyRecorder, float]:
+    """
+    возвращает латентности по эндпоинтам и фактическую длительность прогона в секундах.
+    transport - например, StandInServer.async_transport(): нагрузка без сервиса, меряется сам клиент
+    """
+    recorder = LatencyRecorder()
+    client = AsyncHTTPClient(
+        base_url,
+        max_connections=max_connections or users,
+        max_keepalive_connections=max_connections or users,
+        latency_recorder=recorder,
+        transport=transport,
+    )
+    state = SharedState()
+    started = time.perf_counter()
+    deadline = started + ramp_up_s + duration_s
+
+    async def _start(index: int, vu: VirtualUser) -> None:
+        if ramp_up_s:
+            await asyncio.sleep(ramp_up_s * index / users)
+        try:
+            await vu.run(deadline)
+        except (httpx.HTTPError, ValueError, RuntimeError) as e:
+            print(f"[load] virtual user #{index} stopped: {e}")
+
+    try:
+        vus = [VirtualUser(client, state, weights or DEFAULT_WEIGHTS, think_time_s) for _ in range(users)]
+        await asyncio.gather(*(_start(i, vu) for i, vu in enumerate(vus)))
+    finally:
+        await client.aclose()
+    return recorder, time.perf_counter() - started
@@ -1,5 +1,6 @@
 # models/requests/auth_requests.py
 
+import string
 from pydantic import BaseModel, EmailStr
 from utils.data_generators.fake_credentials import fake_email, fake_username, fake_password
 
@@ -24,12 +25,21 @@ class RegisterUser(BaseModel):
         )
 
     @classmethod
-    def minimal(cls) -> "RegisterUser":
-        """минимально валидный пользователь"""
+    def minimal(cls, namespace: int = 0) -> "RegisterUser":
+        """
+        минимально валидный пользователь; namespace (индекс xdist-воркера) выбирает свои односимвольные
+        части email (локальная часть и домен) и username, чтобы параллельные воркеры не конфликтовали.
+        значения не повторяются по кругу: если воркеров больше, чем односимвольных username, - ошибка
+        """
+        letters = string.ascii_lowercase
+        # воркер 0 получает прежние u и a@a.a
+        usernames = letters[letters.index("u"):] + letters[:letters.index("u")] + string.digits
+        if not 0 <= namespace < min(len(usernames), len(letters) ** 2):
+            raise ValueError(f"Minimal user namespace {namespace} is out of range 0..{len(usernames) - 1}")
         pwd = "Aa1PPPPP"
         return cls(
-            email="a@a.a",
-            username="u",
+            email=f"{letters[namespace % len(letters)]}@{letters[namespace // len(letters)]}.a",
+            username=usernames[namespace],
             password=pwd,
             passwordConfirmation=pwd,
         )
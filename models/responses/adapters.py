@@ -0,0 +1,57 @@
+# models/responses/adapters.py
+
+from typing import Any, Dict, Union
+from pydantic import TypeAdapter
+
+from models.responses.admin_responses import (
+    GetUserProfileResponse,
+    GetUserProfileByEmailResponse,
+    BanUserResponse,
+    UnbanUserResponse,
+)
+from models.responses.auth_responses import RegisterResponse, LoginResponse
+from models.responses.comments_responses import ReplyCommentResponse
+from models.responses.posts_responses import (
+    PublishPostResponse,
+    VotePostResponse,
+    AddCommentResponse,
+    GetPostsResponse,
+    GetPostByIdResponse,
+)
+from models.responses.profile_responses import ProfileResponse
+
+RESPONSE_TYPES = (
+    RegisterResponse,
+    LoginResponse,
+    PublishPostResponse,
+    VotePostResponse,
+    AddCommentResponse,
+    GetPostsResponse,
+    GetPostByIdResponse,
+    ReplyCommentResponse,
+    ProfileResponse,
+    GetUserProfileResponse,
+    GetUserProfileByEmailResponse,
+    BanUserResponse,
+    UnbanUserResponse,
+)
+
+# валидаторы pydantic-core собираются один раз при импорте, а не на каждый ответ
+RESPONSE_ADAPTERS: Dict[Any, TypeAdapter] = {response_type: TypeAdapter(response_type) for response_type in RESPONSE_TYPES}
+
+
+def get_adapter(response_type: Any) -> TypeAdapter:
+    """возвращает закешированный TypeAdapter; для типов вне RESPONSE_TYPES собирает его один раз"""
+    adapter = RESPONSE_ADAPTERS.get(response_type)
+    if adapter is None:
+        adapter = RESPONSE_ADAPTERS[response_type] = TypeAdapter(response_type)
+    return adapter
+
+
+def validate_response(response_type: Any, data: Any) -> Any:
+    return get_adapter(response_type).validate_python(data)
+
+
+def validate_response_json(response_type: Any, content: Union[bytes, str]) -> Any:
+    """разбор и валидация сырого тела ответа за один проход pydantic-core, без промежуточных dict"""
+    return get_adapter(response_type).validate_json(content)
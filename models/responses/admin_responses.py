@@ -1,8 +1,8 @@
 # models/responses/admin_responses.py
 
-from typing import Literal, Union, Optional, List
+from typing import Annotated, Literal, Union, Optional, List
 from pydantic import BaseModel
-from models.responses.base_responses import BaseResponse, ErrorResponse
+from models.responses.base_responses import BaseResponse, ErrorResponse, STATUS_DISCRIMINATOR
 
 
 # ---------- /api/v1/admin/user/{id} ----------
@@ -20,7 +20,7 @@ class GetUserProfileResponseOK(BaseResponse):
     responseData: AdminUserProfileData
 
 
-GetUserProfileResponse = Union[GetUserProfileResponseOK, ErrorResponse]
+GetUserProfileResponse = Annotated[Union[GetUserProfileResponseOK, ErrorResponse], STATUS_DISCRIMINATOR]
 
 
 # ---------- /api/v1/admin/user/{email} ----------
@@ -30,7 +30,7 @@ class GetUserProfileByEmailResponseOK(BaseResponse):
     responseData: AdminUserProfileData
 
 
-GetUserProfileByEmailResponse = Union[GetUserProfileByEmailResponseOK, ErrorResponse]
+GetUserProfileByEmailResponse = Annotated[Union[GetUserProfileByEmailResponseOK, ErrorResponse], STATUS_DISCRIMINATOR]
 
 
 # ---------- /api/v1/admin/management/ban/byEmail/{email} ----------
@@ -45,7 +45,7 @@ class BanUserResponseOK(BaseResponse):
     message: str  # "User banned"
 
 
-BanUserResponse = Union[BanUserResponseOK, ErrorResponse]
+BanUserResponse = Annotated[Union[BanUserResponseOK, ErrorResponse], STATUS_DISCRIMINATOR]
 
 
 # ---------- /api/v1/admin/management/unban/byEmail/{email} ----------
@@ -60,4 +60,4 @@ class UnbanUserResponseOK(BaseResponse):
     message: str  # "User unbanned"
 
 
-UnbanUserResponse = Union[UnbanUserResponseOK, ErrorResponse]
+UnbanUserResponse = Annotated[Union[UnbanUserResponseOK, ErrorResponse], STATUS_DISCRIMINATOR]
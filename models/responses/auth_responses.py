@@ -1,8 +1,8 @@
 # models/responses/auth_responses.py
 
 from pydantic import BaseModel
-from typing import Literal, Union
-from models.responses.base_responses import BaseResponse, ErrorResponse
+from typing import Annotated, Literal, Union
+from models.responses.base_responses import BaseResponse, ErrorResponse, STATUS_DISCRIMINATOR
 
 
 # ---------- /api/v1/auth/register ----------
@@ -12,7 +12,7 @@ class RegisterResponseOK(BaseResponse):
     responseData: str
 
 
-RegisterResponse = Union[RegisterResponseOK, ErrorResponse]
+RegisterResponse = Annotated[Union[RegisterResponseOK, ErrorResponse], STATUS_DISCRIMINATOR]
 
 
 # ---------- /api/v1/auth/login ----------
@@ -26,4 +26,4 @@ class LoginResponseOK(BaseResponse):
     responseData: LoginResponseData
 
 
-LoginResponse = Union[LoginResponseOK, ErrorResponse]
+LoginResponse = Annotated[Union[LoginResponseOK, ErrorResponse], STATUS_DISCRIMINATOR]
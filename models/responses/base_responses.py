@@ -1,5 +1,5 @@
 from typing import Literal
-from pydantic import BaseModel
+from pydantic import BaseModel, Discriminator
 
 
 class BaseResponse(BaseModel):
@@ -10,3 +10,7 @@ class ErrorResponse(BaseResponse):
     status: Literal["error"]
     error: str
 
+
+# дискриминатор для объединений вида Union[...OK, ErrorResponse]: pydantic сразу выбирает ветку по значению status,
+# вместо того чтобы сначала пытаться провалидировать ошибку как OK-модель
+STATUS_DISCRIMINATOR = Discriminator("status")
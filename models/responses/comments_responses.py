@@ -1,8 +1,8 @@
 # models/responses/comments_responses.py
 
-from typing import Literal, Union
+from typing import Annotated, Literal, Union
 from models.responses.posts_responses import CommentData
-from models.responses.base_responses import BaseResponse, ErrorResponse
+from models.responses.base_responses import BaseResponse, ErrorResponse, STATUS_DISCRIMINATOR
 
 
 # ---------- /api/v1/comments/{parentCommentId}/reply ----------
@@ -12,4 +12,4 @@ class ReplyCommentResponseOK(BaseResponse):
     responseData: CommentData
 
 
-ReplyCommentResponse = Union[ReplyCommentResponseOK, ErrorResponse]
+ReplyCommentResponse = Annotated[Union[ReplyCommentResponseOK, ErrorResponse], STATUS_DISCRIMINATOR]
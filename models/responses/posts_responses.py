@@ -1,8 +1,8 @@
 # models/responses/posts_responses.py
 
-from typing import Literal, Union, List
+from typing import Annotated, Literal, Union, List
 from pydantic import BaseModel, Field
-from models.responses.base_responses import BaseResponse, ErrorResponse
+from models.responses.base_responses import BaseResponse, ErrorResponse, STATUS_DISCRIMINATOR
 
 
 class PostData(BaseModel):
@@ -36,7 +36,7 @@ class PublishPostResponseOK(BaseResponse):
     responseData: PostData
 
 
-PublishPostResponse = Union[PublishPostResponseOK, ErrorResponse]
+PublishPostResponse = Annotated[Union[PublishPostResponseOK, ErrorResponse], STATUS_DISCRIMINATOR]
 
 
 # ---------- /api/v1/posts/{postId}/vote ----------
@@ -45,7 +45,7 @@ class VotePostResponseOK(BaseResponse):
     status: Literal["ok"]
 
 
-VotePostResponse = Union[VotePostResponseOK, ErrorResponse]
+VotePostResponse = Annotated[Union[VotePostResponseOK, ErrorResponse], STATUS_DISCRIMINATOR]
 
 
 # ---------- /api/v1/posts/{postId}/addComment ----------
@@ -54,7 +54,7 @@ class AddCommentResponseOK(BaseResponse):
     status: Literal["ok"]
 
 
-AddCommentResponse = Union[AddCommentResponseOK, ErrorResponse]
+AddCommentResponse = Annotated[Union[AddCommentResponseOK, ErrorResponse], STATUS_DISCRIMINATOR]
 
 
 # ---------- /api/v1/posts ----------
@@ -72,7 +72,7 @@ class GetPostsResponseOK(BaseResponse):
     responseData: PostsListData
 
 
-GetPostsResponse = Union[GetPostsResponseOK, ErrorResponse]
+GetPostsResponse = Annotated[Union[GetPostsResponseOK, ErrorResponse], STATUS_DISCRIMINATOR]
 
 
 # ---------- /api/v1/posts/{postId} ----------
@@ -88,4 +88,4 @@ class GetPostByIdResponseOK(BaseResponse):
     responseData: GetPostByIdData
 
 
-GetPostByIdResponse = Union[GetPostByIdResponseOK, ErrorResponse]
+GetPostByIdResponse = Annotated[Union[GetPostByIdResponseOK, ErrorResponse], STATUS_DISCRIMINATOR]
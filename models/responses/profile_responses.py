@@ -1,8 +1,8 @@
 # models/responses/profile_responses.py
 
-from typing import Literal, Union, List, Optional
+from typing import Annotated, Literal, Union, List, Optional
 from pydantic import BaseModel, EmailStr
-from models.responses.base_responses import BaseResponse, ErrorResponse
+from models.responses.base_responses import BaseResponse, ErrorResponse, STATUS_DISCRIMINATOR
 
 
 # ---------- /api/v1/profile/info ----------
@@ -20,4 +20,4 @@ class ProfileResponseOK(BaseResponse):
     responseData: ProfileData
 
 
-ProfileResponse = Union[ProfileResponseOK, ErrorResponse]
+ProfileResponse = Annotated[Union[ProfileResponseOK, ErrorResponse], STATUS_DISCRIMINATOR]
@@ -1,7 +1,24 @@
+import os
 from functools import lru_cache
+from dotenv import load_dotenv
 from pydantic import ConfigDict, Field, SecretStr
 from pydantic_settings import BaseSettings
 
+from utils.clients.http_client import (
+    DEFAULT_CONNECT_RETRIES,
+    DEFAULT_KEEPALIVE_EXPIRY,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    DEFAULT_TIMEOUT,
+)
+
+ENV_FILES = {
+    "local": ".env",
+    "dev": ".env.dev",
+    "stg": ".env.stg",
+    "prod-test": ".env.prod-test",
+}
+
 
 class Settings(BaseSettings):
 
@@ -11,6 +28,23 @@ class Settings(BaseSettings):
     db_name: str
     db_user: str
     db_password: SecretStr
+    # db_pool_max=0 - одно соединение (по умолчанию); >0 - пул с проверкой соединения при выдаче
+    db_pool_min: int = Field(default=1)
+    db_pool_max: int = Field(default=0)
+    db_statement_timeout_ms: int = Field(default=30_000)
+    # 0 - без PREPARE/EXECUTE; >0 включает кеш подготовленных операторов (на соединение)
+    db_prepared_cache_size: int = Field(default=0)
+    # HTTP-транспорт: http2 требует пакет h2 (pip install "httpx[http2]");
+    # значения по умолчанию - те же, что у HTTPClient (utils/clients/http_client.py)
+    http2: bool = Field(default=False)
+    http_max_connections: int = Field(default=DEFAULT_MAX_CONNECTIONS)
+    http_max_keepalive_connections: int = Field(default=DEFAULT_MAX_KEEPALIVE_CONNECTIONS)
+    http_keepalive_expiry_s: float = Field(default=DEFAULT_KEEPALIVE_EXPIRY)
+    http_connect_timeout_s: float = Field(default=DEFAULT_TIMEOUT)
+    http_read_timeout_s: float = Field(default=DEFAULT_TIMEOUT)
+    http_pool_timeout_s: float = Field(default=DEFAULT_TIMEOUT)
+    # повторы только при ошибке установки соединения
+    http_connect_retries: int = Field(default=DEFAULT_CONNECT_RETRIES)
 
 
     model_config = ConfigDict(
@@ -23,3 +57,12 @@ class Settings(BaseSettings):
 @lru_cache
 def get_settings() -> Settings:
     return Settings()
+
+
+def load_env(env_name: str) -> str:
+    """подгружает .env-файл окружения в переменные окружения и возвращает его имя"""
+    env_file = ENV_FILES.get(env_name, ".env")
+    os.environ["TEST_ENV"] = env_name
+    load_dotenv(dotenv_path=env_file, override=True)
+    get_settings.cache_clear()
+    return env_file
@@ -10,7 +10,7 @@ from utils.assertions.database_state import (
     fetch_single_user,
 )
 from utils.data_generators.fake_credentials import fake_email, fake_username, fake_password
-from utils.fixtures.auth import create_invalid_email_list
+from utils.fixtures.auth import INVALID_EMAIL_IDS, create_invalid_email_list
 from models.requests.auth_requests import RegisterUser, LoginUser
 from utils.allure_helpers import (
     prepare_step,
@@ -79,7 +79,7 @@ def test_register_and_login(session_auth_api, create_user, session_sql_client):
 
     with execute_step():
         login_user = LoginUser.from_register(user)
-        token = session_auth_api.login_and_get_token(login_user)
+        token = session_auth_api.login_and_get_token(login_user, use_cache=False)
 
     with validate_api_step():
         assert token, f"No token received for user {login_user.email}"
@@ -293,7 +293,8 @@ def test_register_with_existing_email_or_username(session_auth_api, create_user,
 @allure.severity(allure.severity_level.NORMAL)
 @pytest.mark.parametrize(
     "invalid_email",
-    create_invalid_email_list()
+    create_invalid_email_list(),
+    ids=INVALID_EMAIL_IDS,
 )
 def test_register_with_invalid_email(session_auth_api, invalid_email, session_valid_password, session_sql_client):
     with prepare_step():
@@ -1,11 +1,19 @@
-import uuid
 import allure
 import pytest
 
 from models.requests.comments_requests import ReplyCommentPayload
 from utils.assertions.api_responses import assert_api_error, assert_api_success
-from utils.assertions.database_state import get_table_count, assert_count_unchanged
+from utils.assertions.database_state import (
+    get_table_count,
+    assert_count_unchanged,
+    assert_no_new_rows,
+    snapshot_table,
+    as_uuid,
+    fetch_comment,
+    fetch_replies,
+)
 from utils.constants.routes import APIRoutes
+from utils.data_generators.fake_credentials import MISSING_UUID
 from utils.allure_helpers import (
     prepare_step,
     execute_step,
@@ -48,16 +56,8 @@ def test_reply_comment(session_comments_api, session_posts_api, create_comment_w
             "Reply is not attached to parent comment in API response"
 
     with validate_db_step():
-        db_reply = session_sql_client.query(
-            """
-            SELECT id::text, text, parent_id::text, post_id::text
-            FROM comments
-            WHERE id::text = %s
-            """,
-            (reply_data.id,)
-        )
-        assert len(db_reply) == 1, f"Expected exactly 1 reply with id {reply_data.id}, found {len(db_reply)}"
-        db_reply = db_reply[0]
+        db_reply = fetch_comment(session_sql_client, reply_data.id)
+        assert db_reply is not None, f"Expected reply with id {reply_data.id} in database"
         assert db_reply["text"] == reply_payload.text
         assert db_reply["parent_id"] == parent_comment_id
         assert db_reply["post_id"] == post_id
@@ -103,13 +103,10 @@ def test_reply_to_reply_nested(session_comments_api, session_posts_api, create_c
                 (reply_lvl2_id, reply_lvl1_id),
                 (reply_lvl3_id, reply_lvl2_id),
         ):
-            db_comment = session_sql_client.query(
-                "SELECT parent_id::text FROM comments WHERE id::text = %s",
-                (child_id,)
-            )
-            assert len(db_comment) == 1, f"Expected exactly 1 DB row for reply {child_id}, found {len(db_comment)}"
-            assert db_comment[0]["parent_id"] == expected_parent, (
-                f"Expected parent_id {expected_parent} for reply {child_id}, got {db_comment[0]['parent_id']}"
+            db_comment = fetch_comment(session_sql_client, child_id)
+            assert db_comment is not None, f"Expected DB row for reply {child_id}"
+            assert db_comment["parent_id"] == expected_parent, (
+                f"Expected parent_id {expected_parent} for reply {child_id}, got {db_comment['parent_id']}"
             )
 
 
@@ -129,16 +126,8 @@ def test_reply_comment_special_symbols(session_comments_api, create_comment_with
         assert_api_success(resp)
 
     with validate_db_step():
-        db_comment = session_sql_client.query(
-            """
-            SELECT id::text, text
-            FROM comments
-            WHERE id::text = %s
-            """,
-            (reply_data.id,)
-        )
-        assert len(db_comment) == 1, f"Expected reply {reply_data.id} to be persisted in DB, found {len(db_comment)}"
-        db_comment = db_comment[0]
+        db_comment = fetch_comment(session_sql_client, reply_data.id)
+        assert db_comment is not None, f"Expected reply {reply_data.id} to be persisted in DB"
         assert db_comment["text"] == text
         assert reply_data.id == db_comment["id"]
         assert reply_data.text == db_comment["text"]
@@ -170,14 +159,7 @@ def test_reply_comment_multiple_replies(session_comments_api, session_posts_api,
             assert rid in reply_ids_in_verification_response, f"Reply ID {rid} not found in parent comment replies"
 
     with validate_db_step():
-        db_replies = session_sql_client.query(
-            """
-            SELECT id::text, text
-            FROM comments
-            WHERE parent_id::text = %s
-            """,
-            (parent_comment_id,)
-        )
+        db_replies = fetch_replies(session_sql_client, parent_comment_id)
         db_ids = [row["id"] for row in db_replies]
         for rid in reply_ids:
             assert rid in db_ids, f"Reply {rid} not found in DB under parent {parent_comment_id}"
@@ -211,11 +193,9 @@ def test_reply_comment_text_boundary_valid(session_comments_api, create_comment_
         assert_api_success(resp)
 
     with validate_db_step():
-        db_comment = session_sql_client.query("SELECT text FROM comments WHERE id::text = %s", (resp.responseData.id,))
-        assert len(db_comment) == 1, (
-            f"Expected exactly 1 reply with id {resp.responseData.id}, found {len(db_comment)}"
-        )
-        db_text = db_comment[0]["text"]
+        db_comment = fetch_comment(session_sql_client, resp.responseData.id)
+        assert db_comment is not None, f"Expected reply with id {resp.responseData.id} in database"
+        db_text = db_comment["text"]
         assert db_text == text
         assert resp.responseData.text == db_text
 
@@ -236,8 +216,8 @@ def test_reply_comment_text_boundary_valid(session_comments_api, create_comment_
 def test_reply_comment_boundary_invalid(session_comments_api, create_comment_with_comment_id, session_sql_client, text):
     with prepare_step():
         _, token, parent_comment_id = create_comment_with_comment_id
-        count_before = get_table_count(session_sql_client, "comments", "WHERE parent_id::text = %s",
-                                       (parent_comment_id,))
+        count_before = get_table_count(session_sql_client, "comments", "WHERE parent_id = %s",
+                                       (as_uuid(parent_comment_id),))
 
     with execute_step():
         resp = session_comments_api.reply_comment(token, parent_comment_id, ReplyCommentPayload(text=text))
@@ -250,8 +230,8 @@ def test_reply_comment_boundary_invalid(session_comments_api, create_comment_wit
             session_sql_client,
             "comments",
             count_before,
-            "WHERE parent_id::text = %s",
-            (parent_comment_id,),
+            "WHERE parent_id = %s",
+            (as_uuid(parent_comment_id),),
             "Expected no reply to be created with invalid text length"
         )
 
@@ -262,8 +242,8 @@ def test_reply_comment_boundary_invalid(session_comments_api, create_comment_wit
 def test_reply_comment_invalid_token(session_comments_api, create_comment_with_comment_id, session_sql_client):
     with prepare_step():
         _, token, parent_comment_id = create_comment_with_comment_id
-        count_before = get_table_count(session_sql_client, "comments", "WHERE parent_id::text = %s",
-                                       (parent_comment_id,))
+        count_before = get_table_count(session_sql_client, "comments", "WHERE parent_id = %s",
+                                       (as_uuid(parent_comment_id),))
 
     with execute_step():
         resp_invalid_token = session_comments_api.reply_comment(
@@ -291,8 +271,8 @@ def test_reply_comment_invalid_token(session_comments_api, create_comment_with_c
             session_sql_client,
             "comments",
             count_before,
-            "WHERE parent_id::text = %s",
-            (parent_comment_id,),
+            "WHERE parent_id = %s",
+            (as_uuid(parent_comment_id),),
             "Expected no reply to be created with invalid token"
         )
 
@@ -304,7 +284,7 @@ def test_reply_comment_invalid_token(session_comments_api, create_comment_with_c
     "parent_comment_id",
     [
         # 1. валидный UUID, но его нет в БД
-        str(uuid.uuid4()),
+        MISSING_UUID,
         # 2. некорректный формат UUID
         "123",
         "abc",
@@ -312,10 +292,11 @@ def test_reply_comment_invalid_token(session_comments_api, create_comment_with_c
         "!@#"
     ]
 )
+@pytest.mark.exclusive_db
 def test_reply_comment_invalid_or_nonexistent_parent_id(session_comments_api, module_create_user_get_token,
                                                         session_sql_client, parent_comment_id):
     with prepare_step():
-        count_before = get_table_count(session_sql_client, "comments")
+        snapshot = snapshot_table(session_sql_client, "comments")
 
     with execute_step():
         resp = session_comments_api.reply_comment(
@@ -328,9 +309,9 @@ def test_reply_comment_invalid_or_nonexistent_parent_id(session_comments_api, mo
         assert_api_error(resp, expected_message=["parent comment not found", "an error occurred"])
 
     with validate_db_step():
-        assert_count_unchanged(
+        assert_no_new_rows(
             session_sql_client,
-            table_name="comments", count_before=count_before,
+            snapshot,
             error_message="Expected no reply to be created for invalid parentCommentId"
         )
 
@@ -356,8 +337,8 @@ def test_reply_comment_invalid_or_nonexistent_parent_id(session_comments_api, mo
 def test_reply_comment_invalid_body(session_comments_api, create_comment_with_comment_id, session_sql_client, payload):
     with prepare_step():
         _, token, parent_comment_id = create_comment_with_comment_id
-        count_before = get_table_count(session_sql_client, "comments", "WHERE parent_id::text = %s",
-                                       (parent_comment_id,))
+        count_before = get_table_count(session_sql_client, "comments", "WHERE parent_id = %s",
+                                       (as_uuid(parent_comment_id),))
 
     with execute_step():
         resp = session_comments_api.client.post(
@@ -376,8 +357,8 @@ def test_reply_comment_invalid_body(session_comments_api, create_comment_with_co
             session_sql_client,
             "comments",
             count_before,
-            "WHERE parent_id::text = %s",
-            (parent_comment_id,),
+            "WHERE parent_id = %s",
+            (as_uuid(parent_comment_id),),
             "Expected no reply to be created with invalid body"
         )
 
@@ -404,16 +385,8 @@ def test_reply_comment_with_unexpected_fields(session_comments_api, create_comme
         assert_api_success(resp)
 
     with validate_db_step():
-        db_reply = session_sql_client.query(
-            """
-            SELECT id::text, text
-            FROM comments
-            WHERE id::text = %s
-            """,
-            (reply_data.id,)
-        )
-        assert len(db_reply) == 1, f"Expected exactly 1 reply with id {reply_data.id}, found {len(db_reply)}"
-        db_reply = db_reply[0]
+        db_reply = fetch_comment(session_sql_client, reply_data.id)
+        assert db_reply is not None, f"Expected reply with id {reply_data.id} in database"
         assert db_reply["text"] == payload["text"]
         assert reply_data.text == db_reply["text"]
 
@@ -427,8 +400,8 @@ def test_reply_comment_banned_user(session_comments_api, create_comment_with_com
     with prepare_step():
         _, _, parent_comment_id = create_comment_with_comment_id
         token = request.getfixturevalue(banned_token)
-        count_before = get_table_count(session_sql_client, "comments", "WHERE parent_id::text = %s",
-                                       (parent_comment_id,))
+        count_before = get_table_count(session_sql_client, "comments", "WHERE parent_id = %s",
+                                       (as_uuid(parent_comment_id),))
 
     with execute_step():
         resp = session_comments_api.reply_comment(
@@ -445,7 +418,7 @@ def test_reply_comment_banned_user(session_comments_api, create_comment_with_com
             session_sql_client,
             "comments",
             count_before,
-            "WHERE parent_id::text = %s",
-            (parent_comment_id,),
+            "WHERE parent_id = %s",
+            (as_uuid(parent_comment_id),),
             "Expected no reply to be created for banned user/admin"
         )
@@ -1,12 +1,21 @@
 # tests/test_posts.py
-import uuid
 import allure
 import pytest
 
 from models.requests.posts_requests import PublishPostPayload, AddCommentPayload
 from utils.assertions.api_responses import assert_api_error, assert_api_success
-from utils.assertions.database_state import get_table_count, assert_count_unchanged
+from utils.assertions.database_state import (
+    get_table_count,
+    assert_count_unchanged,
+    assert_no_new_rows,
+    snapshot_table,
+    as_uuid,
+    fetch_post,
+    fetch_votes,
+    get_vote_score,
+)
 from utils.constants.routes import APIRoutes
+from utils.data_generators.fake_credentials import MISSING_UUID, fake_uuid
 from utils.allure_helpers import (
     prepare_step,
     execute_step,
@@ -22,6 +31,7 @@ from utils.allure_helpers import (
 @allure.feature("Posts")
 @allure.story("Publish post")
 @allure.severity(allure.severity_level.CRITICAL)
+@pytest.mark.latency_budget(p95_ms=500)
 def test_publish_post(module_create_user_get_token, session_posts_api, session_sql_client):
     with prepare_step():
         token = module_create_user_get_token
@@ -36,12 +46,8 @@ def test_publish_post(module_create_user_get_token, session_posts_api, session_s
         assert rd.id and rd.title and rd.content
 
     with validate_db_step():
-        db_post = session_sql_client.query(
-            "SELECT id::text, title, content, author_id, created_at FROM posts WHERE id::text = %s",
-            (rd.id,)
-        )
-        assert len(db_post) == 1, f"Expected exactly 1 post with id {rd.id}, found {len(db_post)}"
-        db_post = db_post[0]
+        db_post = fetch_post(session_sql_client, rd.id)
+        assert db_post is not None, f"Expected post with id {rd.id} in database"
         assert db_post["title"] == payload.title
         assert db_post["content"] == payload.content
         assert db_post["author_id"] is not None, "Expected user_id to be set in database"
@@ -88,12 +94,8 @@ def test_publish_post_boundary_valid(module_create_user_get_token, session_posts
         assert rd.content == content
 
     with validate_db_step():
-        db_post = session_sql_client.query(
-            "SELECT id::text, title, content FROM posts WHERE id::text = %s",
-            (rd.id,)
-        )
-        assert len(db_post) == 1, f"Expected exactly 1 post with id {rd.id}, found {len(db_post)}"
-        db_post = db_post[0]
+        db_post = fetch_post(session_sql_client, rd.id)
+        assert db_post is not None, f"Expected post with id {rd.id} in database"
         assert db_post["title"] == title
         assert db_post["content"] == content
         assert rd.id == db_post["id"]
@@ -115,10 +117,11 @@ def test_publish_post_boundary_valid(module_create_user_get_token, session_posts
     ],
     ids=["no_title", "no_content", "no_title_and_content"]
 )
+@pytest.mark.exclusive_db
 def test_publish_post_missing_fields(module_create_user_get_token, session_posts_api, session_sql_client, payload):
     with prepare_step():
         token = module_create_user_get_token
-        count_before = get_table_count(session_sql_client, "posts")
+        snapshot = snapshot_table(session_sql_client, "posts")
 
     with execute_step():
         resp = session_posts_api.publish_post(token=token, payload=payload)
@@ -127,8 +130,8 @@ def test_publish_post_missing_fields(module_create_user_get_token, session_posts
         assert_api_error(resp, expected_message="an error occurred")
 
     with validate_db_step():
-        assert_count_unchanged(session_sql_client, "posts", count_before,
-                               error_message="Expected no post to be created with missing fields")
+        assert_no_new_rows(session_sql_client, snapshot,
+                           error_message="Expected no post to be created with missing fields")
 
 
 @allure.feature("Posts")
@@ -142,10 +145,11 @@ def test_publish_post_missing_fields(module_create_user_get_token, session_posts
     ],
     ids=["empty title", "empty content"]
 )
+@pytest.mark.exclusive_db
 def test_publish_post_empty_title_content(module_create_user_get_token, session_posts_api, session_sql_client, title,
                                           content):
     with prepare_step():
-        count_before = get_table_count(session_sql_client, "posts")
+        snapshot = snapshot_table(session_sql_client, "posts")
         payload = PublishPostPayload(title=title, content=content)
 
     with execute_step():
@@ -155,18 +159,19 @@ def test_publish_post_empty_title_content(module_create_user_get_token, session_
         assert_api_error(resp, expected_message="validation error")
 
     with validate_db_step():
-        assert_count_unchanged(session_sql_client, "posts", count_before,
-                               error_message="Expected no post to be created with empty fields")
+        assert_no_new_rows(session_sql_client, snapshot,
+                           error_message="Expected no post to be created with empty fields")
 
 
 @allure.feature("Posts")
 @allure.story("Publish post | validation errors")
 @allure.severity(allure.severity_level.NORMAL)
+@pytest.mark.exclusive_db
 def test_publish_post_boundary_invalid(module_create_user_get_token, session_posts_api, session_sql_client):
     with prepare_step():
         title = "A" * 256
         content = "C"
-        count_before = get_table_count(session_sql_client, "posts")
+        snapshot = snapshot_table(session_sql_client, "posts")
 
     with execute_step():
         resp = session_posts_api.publish_post(
@@ -178,8 +183,8 @@ def test_publish_post_boundary_invalid(module_create_user_get_token, session_pos
         assert_api_error(resp, expected_message="title must be less than 255 character")
 
     with validate_db_step():
-        assert_count_unchanged(session_sql_client, "posts", count_before,
-                               error_message="Expected no post to be created with invalid title length")
+        assert_no_new_rows(session_sql_client, snapshot,
+                           error_message="Expected no post to be created with invalid title length")
 
 
 @allure.feature("Posts")
@@ -200,9 +205,10 @@ def test_publish_post_boundary_invalid(module_create_user_get_token, session_pos
         "content_none"
     ]
 )
+@pytest.mark.exclusive_db
 def test_publish_post_invalid_types(module_create_user_get_token, session_posts_api, session_sql_client, payload):
     with prepare_step():
-        count_before = get_table_count(session_sql_client, "posts")
+        snapshot = snapshot_table(session_sql_client, "posts")
 
     with execute_step():
         resp = session_posts_api.publish_post(token=module_create_user_get_token, payload=payload)
@@ -211,16 +217,17 @@ def test_publish_post_invalid_types(module_create_user_get_token, session_posts_
         assert_api_error(resp, expected_message="an error occurred")
 
     with validate_db_step():
-        assert_count_unchanged(session_sql_client, "posts", count_before,
-                               error_message="Expected no post to be created with invalid types")
+        assert_no_new_rows(session_sql_client, snapshot,
+                           error_message="Expected no post to be created with invalid types")
 
 
 @allure.feature("Posts")
 @allure.story("Publish post | authorization")
 @allure.severity(allure.severity_level.NORMAL)
+@pytest.mark.exclusive_db
 def test_publish_post_invalid_token(session_posts_api, session_sql_client):
     with prepare_step():
-        count_before = get_table_count(session_sql_client, "posts")
+        snapshot = snapshot_table(session_sql_client, "posts")
 
     with execute_step():
         resp_invalid_token = session_posts_api.publish_post("invalid.token.value", PublishPostPayload.random())
@@ -240,19 +247,20 @@ def test_publish_post_invalid_token(session_posts_api, session_sql_client):
         assert data.get("error") == "Access denied"
 
     with validate_db_step():
-        assert_count_unchanged(session_sql_client, "posts", count_before,
-                               error_message="Expected no post to be created with invalid token")
+        assert_no_new_rows(session_sql_client, snapshot,
+                           error_message="Expected no post to be created with invalid token")
 
 
 @allure.feature("Posts")
 @allure.story("Publish post | authorization")
 @allure.severity(allure.severity_level.CRITICAL)
 @pytest.mark.parametrize("banned_token", ["session_banned_user_token", "session_banned_admin_token"])
+@pytest.mark.exclusive_db
 def test_publish_post_banned_user(session_posts_api, request, banned_token, session_sql_client):
     with prepare_step():
         payload = PublishPostPayload.random()
         token = request.getfixturevalue(banned_token)
-        count_before = get_table_count(session_sql_client, "posts")
+        snapshot = snapshot_table(session_sql_client, "posts")
 
     with execute_step():
         resp = session_posts_api.publish_post(token, payload)
@@ -261,10 +269,9 @@ def test_publish_post_banned_user(session_posts_api, request, banned_token, sess
         assert_api_error(resp, expected_message="user is banned")
 
     with validate_db_step():
-        assert_count_unchanged(
+        assert_no_new_rows(
             session_sql_client,
-            table_name="posts",
-            count_before=count_before,
+            snapshot,
             error_message="Expected no new post to be created for banned user/admin"
         )
 
@@ -288,7 +295,7 @@ def test_vote_post(session_posts_api, create_post_get_post_id_and_token, session
         assert_api_success(resp)
 
     with validate_db_step():
-        db_vote = session_sql_client.query("SELECT value FROM votes WHERE post_id::text = %s", (post_id,))
+        db_vote = fetch_votes(session_sql_client, post_id)
         assert len(db_vote) == 1, f"Expected exactly 1 vote for post {post_id}, found {len(db_vote)}"
         assert db_vote[0]["value"] == vote_value
 
@@ -307,7 +314,7 @@ def test_vote_post_update_value(session_posts_api, create_post_get_post_id_and_t
         assert_api_success(first_vote)
 
     with validate_db_step():
-        db_vote_after_first = session_sql_client.query("SELECT value FROM votes WHERE post_id::text = %s", (post_id,))
+        db_vote_after_first = fetch_votes(session_sql_client, post_id)
         assert len(
             db_vote_after_first) == 1, f"Expected exactly 1 vote for post {post_id}, found {len(db_vote_after_first)}"
         assert db_vote_after_first[0]["value"] == 1
@@ -319,7 +326,7 @@ def test_vote_post_update_value(session_posts_api, create_post_get_post_id_and_t
         assert_api_success(second_vote)
 
     with validate_db_step():
-        db_vote_after_second = session_sql_client.query("SELECT value FROM votes WHERE post_id::text = %s", (post_id,))
+        db_vote_after_second = fetch_votes(session_sql_client, post_id)
         assert len(db_vote_after_second) == 1, (
             f"Expected exactly 1 vote for post {post_id}, found {len(db_vote_after_second)}"
         )
@@ -335,7 +342,7 @@ def test_vote_post_invalid_token(session_posts_api, create_post_get_post_id_and_
     with prepare_step():
         post_id, _ = create_post_get_post_id_and_token
         # проверяем количество голосов до попытки
-        count_before = get_table_count(session_sql_client, "votes", "WHERE post_id::text = %s", (post_id,))
+        count_before = get_table_count(session_sql_client, "votes", "WHERE post_id = %s", (as_uuid(post_id),))
 
     with execute_step():
         resp_invalid_token = session_posts_api.vote_post("invalid.token.value", post_id, 1)
@@ -354,7 +361,7 @@ def test_vote_post_invalid_token(session_posts_api, create_post_get_post_id_and_
     with validate_db_step():
         # проверяем, что голос не был создан
         assert_count_unchanged(session_sql_client, "votes", count_before,
-                               "WHERE post_id::text = %s", (post_id,),
+                               "WHERE post_id = %s", (as_uuid(post_id),),
                                "Expected no vote to be created with invalid token")
 
 
@@ -363,9 +370,9 @@ def test_vote_post_invalid_token(session_posts_api, create_post_get_post_id_and_
 @allure.severity(allure.severity_level.NORMAL)
 def test_vote_nonexistent_post(session_posts_api, module_create_user_get_token, session_sql_client):
     with prepare_step():
-        fake_post_id = str(uuid.uuid4())
-        count_before = get_table_count(session_sql_client, "votes", "WHERE post_id::text = %s",
-                                       (fake_post_id,))
+        fake_post_id = fake_uuid()
+        count_before = get_table_count(session_sql_client, "votes", "WHERE post_id = %s",
+                                       (as_uuid(fake_post_id),))
 
     with execute_step():
         resp = session_posts_api.vote_post(module_create_user_get_token, fake_post_id, 1)
@@ -375,7 +382,7 @@ def test_vote_nonexistent_post(session_posts_api, module_create_user_get_token,
 
     with validate_db_step():
         assert_count_unchanged(session_sql_client, "votes", count_before,
-                               "WHERE post_id::text = %s", (fake_post_id,),
+                               "WHERE post_id = %s", (as_uuid(fake_post_id),),
                                "Expected no vote to be created for nonexistent post")
 
 
@@ -388,7 +395,7 @@ def test_vote_post_invalid_value(session_posts_api, create_post_get_post_id_and_
     with prepare_step():
         post_id, token = create_post_get_post_id_and_token
         count_before = get_table_count(session_sql_client, "votes",
-                                       "WHERE post_id::text = %s", (post_id,))
+                                       "WHERE post_id = %s", (as_uuid(post_id),))
 
     with execute_step():
         resp = session_posts_api.vote_post(token, post_id, invalid_value)
@@ -398,7 +405,7 @@ def test_vote_post_invalid_value(session_posts_api, create_post_get_post_id_and_
 
     with validate_db_step():
         assert_count_unchanged(session_sql_client, "votes", count_before,
-                               "WHERE post_id::text = %s", (post_id,),
+                               "WHERE post_id = %s", (as_uuid(post_id),),
                                "Expected no vote to be created with invalid value")
 
 
@@ -414,8 +421,8 @@ def test_vote_post_banned_user(session_posts_api, create_post_get_post_id_and_to
         count_before = get_table_count(
             session_sql_client,
             table_name="votes",
-            where_clause="WHERE post_id::text = %s",
-            params=(post_id,)
+            where_clause="WHERE post_id = %s",
+            params=(as_uuid(post_id),)
         )
 
     with execute_step():
@@ -429,8 +436,8 @@ def test_vote_post_banned_user(session_posts_api, create_post_get_post_id_and_to
             session_sql_client,
             table_name="votes",
             count_before=count_before,
-            where_clause="WHERE post_id::text = %s",
-            params=(post_id,),
+            where_clause="WHERE post_id = %s",
+            params=(as_uuid(post_id),),
             error_message="Expected no vote to be created for banned user/admin"
         )
 
@@ -458,11 +465,11 @@ def test_add_comment(session_posts_api, create_post_get_post_id_and_token, sessi
             """
             SELECT id::text, text, author_id, post_id::text, parent_id
             FROM comments
-            WHERE post_id::text = %s AND text = %s
+            WHERE post_id = %s AND text = %s
             ORDER BY created_at DESC
             LIMIT 1
             """,
-            (post_id, payload.text)
+            (as_uuid(post_id), payload.text)
         )
         assert len(db_comment) == 1, f"Expected exactly 1 comment for post {post_id}, found {len(db_comment)}"
         db_comment = db_comment[0]
@@ -505,11 +512,11 @@ def test_add_comment_boundary_valid(create_post_get_post_id_and_token, session_p
             """
             SELECT id::text, text
             FROM comments
-            WHERE post_id::text = %s AND text = %s
+            WHERE post_id = %s AND text = %s
             ORDER BY created_at DESC
             LIMIT 1
             """,
-            (post_id, payload.text)
+            (as_uuid(post_id), payload.text)
         )
         assert len(db_comment) == 1, f"Expected exactly 1 comment for post {post_id}, found {len(db_comment)}"
         assert db_comment[0]["text"] == text
@@ -531,7 +538,7 @@ def test_add_comment_boundary_valid(create_post_get_post_id_and_token, session_p
 def test_add_comment_boundary_invalid(create_post_get_post_id_and_token, session_posts_api, session_sql_client, text):
     with prepare_step():
         post_id, token = create_post_get_post_id_and_token
-        count_before = get_table_count(session_sql_client, "comments", "WHERE post_id::text = %s", (post_id,))
+        count_before = get_table_count(session_sql_client, "comments", "WHERE post_id = %s", (as_uuid(post_id),))
 
     with execute_step():
         resp = session_posts_api.add_comment(token, post_id, AddCommentPayload(text=text))
@@ -541,7 +548,7 @@ def test_add_comment_boundary_invalid(create_post_get_post_id_and_token, session
 
     with validate_db_step():
         assert_count_unchanged(session_sql_client, "comments", count_before,
-                               "WHERE post_id::text = %s", (post_id,),
+                               "WHERE post_id = %s", (as_uuid(post_id),),
                                "Expected no comment to be created with invalid text length")
 
 
@@ -551,7 +558,7 @@ def test_add_comment_boundary_invalid(create_post_get_post_id_and_token, session
 def test_add_comment_invalid_token(session_posts_api, create_post_get_post_id_and_token, session_sql_client):
     with prepare_step():
         post_id, _ = create_post_get_post_id_and_token
-        count_before = get_table_count(session_sql_client, "comments", "WHERE post_id::text = %s", (post_id,))
+        count_before = get_table_count(session_sql_client, "comments", "WHERE post_id = %s", (as_uuid(post_id),))
 
     with execute_step():
         resp_invalid_token = session_posts_api.add_comment(
@@ -575,7 +582,7 @@ def test_add_comment_invalid_token(session_posts_api, create_post_get_post_id_an
 
     with validate_db_step():
         assert_count_unchanged(session_sql_client, "comments", count_before,
-                               "WHERE post_id::text = %s", (post_id,),
+                               "WHERE post_id = %s", (as_uuid(post_id),),
                                "Expected no comment to be created with invalid token")
 
 
@@ -585,16 +592,16 @@ def test_add_comment_invalid_token(session_posts_api, create_post_get_post_id_an
 @pytest.mark.parametrize(
     "invalid_post_id",
     [
-        str(uuid.uuid4()),  # несуществующий UUID
+        MISSING_UUID,  # несуществующий UUID
         "12345",  # невалидный UUID
         "",  # пустая строка
     ],
-    ids=["random_uuid", "invalid_format", "empty"]
+    ids=["missing_uuid", "invalid_format", "empty"]
 )
 def test_add_comment_invalid_post_id(module_create_user_get_token, session_posts_api, session_sql_client,
                                      invalid_post_id):
     with prepare_step():
-        count_before = get_table_count(session_sql_client, "comments", "WHERE post_id::text = %s", (invalid_post_id,))
+        count_before = get_table_count(session_sql_client, "comments", "WHERE post_id = %s", (as_uuid(invalid_post_id),))
 
     with execute_step():
         resp = session_posts_api.add_comment(
@@ -606,7 +613,7 @@ def test_add_comment_invalid_post_id(module_create_user_get_token, session_posts
 
     with validate_db_step():
         assert_count_unchanged(session_sql_client, "comments", count_before,
-                               "WHERE post_id::text = %s", (invalid_post_id,),
+                               "WHERE post_id = %s", (as_uuid(invalid_post_id),),
                                "Expected no comment to be created for invalid post_id")
 
 
@@ -620,7 +627,7 @@ def test_add_comment_banned_user(session_posts_api, create_post_get_post_id_and_
         post_id, _ = create_post_get_post_id_and_token
         token = request.getfixturevalue(banned_token)
         payload = AddCommentPayload.random()
-        count_before = get_table_count(session_sql_client, "comments", "WHERE post_id::text = %s", (post_id,))
+        count_before = get_table_count(session_sql_client, "comments", "WHERE post_id = %s", (as_uuid(post_id),))
 
     with execute_step():
         resp = session_posts_api.add_comment(token=token, post_id=post_id, payload=payload)
@@ -633,8 +640,8 @@ def test_add_comment_banned_user(session_posts_api, create_post_get_post_id_and_
             session_sql_client,
             "comments",
             count_before,
-            "WHERE post_id::text = %s",
-            (post_id,),
+            "WHERE post_id = %s",
+            (as_uuid(post_id),),
             "Expected no comment to be created for banned user/admin"
         )
 
@@ -646,6 +653,7 @@ def test_add_comment_banned_user(session_posts_api, create_post_get_post_id_and_
 @allure.feature("Posts")
 @allure.story("Get posts")
 @allure.severity(allure.severity_level.CRITICAL)
+@pytest.mark.latency_budget(p95_ms=500)
 def test_get_posts(session_posts_api, module_create_user_get_token, session_sql_client):
     with prepare_step():
         token = module_create_user_get_token
@@ -721,7 +729,7 @@ def test_get_posts_sorting(module_create_user_get_token, session_posts_api, sess
         created_ids = []
         for i in range(posts_to_create):
             title = f"Title for post #{i}"
-            content = f"Content for post #{i} - {uuid.uuid4().hex}"
+            content = f"Content for post #{i} - {fake_uuid()}"
             resp = session_posts_api.publish_post(module_create_user_get_token,
                                                   PublishPostPayload(title=title, content=content))
             assert_api_success(resp)
@@ -927,6 +935,7 @@ def test_get_posts_unknown_params(session_posts_api, module_create_user_get_toke
 @allure.feature("Posts")
 @allure.story("Get post by ID")
 @allure.severity(allure.severity_level.CRITICAL)
+@pytest.mark.latency_budget(p95_ms=500)
 def test_get_post_without_comments(session_posts_api, create_post_get_post_id_and_token, session_sql_client):
     with prepare_step():
         post_id, token = create_post_get_post_id_and_token
@@ -944,15 +953,14 @@ def test_get_post_without_comments(session_posts_api, create_post_get_post_id_an
         assert rd.comments == [], f"Expected no comments, got: {rd.comments}"
         assert rd.hasMoreComments is False
 
-    with validate_db_step():
-        db_post = session_sql_client.query("SELECT id::text, title, content FROM posts WHERE id::text = %s", (post_id,))
-        assert len(db_post) == 1, f"Expected exactly 1 post with id {post_id}, found {len(db_post)}"
-        db_post = db_post[0]
-        assert db_post["id"] == post.id
-        assert db_post["title"] == post.title
-        assert db_post["content"] == post.content
-        comments_count = get_table_count(session_sql_client, "comments", "WHERE post_id::text = %s", (post_id,))
-        assert comments_count == 0, f"Expected no comments in DB for post {post_id}, found {comments_count}"
+    with validate_db_step(), session_sql_client.expect() as db:
+        db.row(
+            "post",
+            "SELECT id::text AS id, title, content FROM posts WHERE id = %s",
+            (as_uuid(post_id),),
+            {"id": post.id, "title": post.title, "content": post.content},
+        )
+        db.count("comments", "comments", "WHERE post_id = %s", (as_uuid(post_id),), expected=0)
 
 
 @allure.feature("Posts")
@@ -991,19 +999,56 @@ def test_get_post_with_comments_pagination(session_posts_api, create_post_with_c
 
     with validate_db_step():
         db_rows = session_sql_client.query(
-            """SELECT id::text FROM comments WHERE post_id::text = %s ORDER BY created_at DESC LIMIT %s OFFSET %s""",
-            (post_id, size, page * size)
+            """SELECT id::text FROM comments WHERE post_id = %s ORDER BY created_at DESC LIMIT %s OFFSET %s""",
+            (as_uuid(post_id), size, page * size)
         )
         db_ids = [row["id"] for row in db_rows]
         api_ids = [c.id for c in comments]
         assert api_ids == db_ids, f"Comments pagination mismatch.\nAPI IDs: {api_ids}\nDB IDs: {db_ids}"
-        total_comments = get_table_count(session_sql_client, "comments", "WHERE post_id::text = %s", (post_id,))
+        total_comments = get_table_count(session_sql_client, "comments", "WHERE post_id = %s", (as_uuid(post_id),))
         expected_has_more = (page + 1) * size < total_comments
         assert expected_has_more == resp.responseData.hasMoreComments, (
             f"hasMoreComments mismatch. DB expects {expected_has_more}, API returned {resp.responseData.hasMoreComments}"
         )
 
 
+@allure.feature("Posts")
+@allure.story("Get post by ID | pagination")
+@allure.severity(allure.severity_level.NORMAL)
+@pytest.mark.parametrize("size", [7, 25])
+def test_get_post_comments_pagination_bulk(session_posts_api, module_create_user_get_token, bulk_seed, size):
+    """
+    пост с 50 комментариями, засеянными через SQL: страницы comments по createdAt DESC вместе дают
+    все комментарии от новых к старым без повторов и пропусков
+    """
+    with prepare_step():
+        comments_total = 50
+        seeded = bulk_seed(users=3, posts=1, comments_per_post=comments_total)
+        post_id = seeded.post_ids[0]
+        # comment_ids засеяны в порядке возрастания created_at
+        expected_ids = list(reversed(seeded.comment_ids))
+
+    with execute_step():
+        pages = []
+        for page in range((comments_total + size - 1) // size):
+            resp, _ = session_posts_api.get_post_by_id(
+                token=module_create_user_get_token,
+                post_id=post_id,
+                comments_page=page,
+                comments_size=size,
+                comments_sort="createdAt,desc",
+            )
+            assert_api_success(resp)
+            pages.append(resp.responseData)
+
+    with validate_api_step():
+        api_ids = [comment.id for data in pages for comment in data.comments]
+        assert api_ids == expected_ids, (
+            f"Paged comments do not match seeded order (size={size}).\nAPI IDs: {api_ids}\nSeeded IDs: {expected_ids}"
+        )
+        assert [data.hasMoreComments for data in pages] == [True] * (len(pages) - 1) + [False]
+
+
 @allure.feature("Posts")
 @allure.story("Get post by ID")
 @allure.severity(allure.severity_level.NORMAL)
@@ -1022,10 +1067,7 @@ def test_get_post_vote_score_present_with_updated_vote(session_posts_api, create
         assert vote_score != 0, f"Expected score > 0 after vote, got: {vote_score}"
 
     with validate_db_step():
-        db_vote_score = session_sql_client.query(
-            "SELECT COALESCE(SUM(value), 0) AS score FROM votes WHERE post_id::text = %s",
-            (post_id,)
-        )[0]["score"]
+        db_vote_score = get_vote_score(session_sql_client, post_id)
         assert vote_score == db_vote_score
 
 
@@ -1129,7 +1171,7 @@ def test_get_post_comments_sorting(create_post_with_comments_ids, session_posts_
     "post_id",
     [
         # 1. валидный UUID, но его нет в БД
-        str(uuid.uuid4()),
+        MISSING_UUID,
         # 2. некорректный формат UUID
         "123",
         "abc",
@@ -0,0 +1,32 @@
+# tests/test_sql_client.py
+import allure
+
+from utils.assertions.database_state import as_uuid
+from utils.allure_helpers import prepare_step, execute_step, validate_db_step
+
+
+# ---------------------- SQLClient ----------------------
+
+@allure.feature("DB client")
+@allure.story("Query | row modes")
+@allure.severity(allure.severity_level.MINOR)
+def test_query_row_modes(session_sql_client):
+    with prepare_step():
+        # лента не бывает пустой: берём id последних постов
+        post_ids = [as_uuid(row["id"]) for row in
+                    session_sql_client.query("SELECT id FROM posts ORDER BY created_at DESC LIMIT 5")]
+        assert post_ids, "Expected at least one post in DB"
+        sql = """SELECT id::text, title FROM posts WHERE id = ANY(%s) ORDER BY 1"""
+
+    with execute_step():
+        # список uuid.UUID уходит как uuid[], без приведения колонки к тексту
+        dict_rows = session_sql_client.query(sql, (post_ids,))
+        tuple_rows = session_sql_client.query(sql, (post_ids,), row_mode="tuple")
+        namedtuple_rows = session_sql_client.query(sql, (post_ids,), row_mode="namedtuple")
+
+    with validate_db_step():
+        assert {str(post_id) for post_id in post_ids} == {row["id"] for row in dict_rows}
+        assert all(type(row) is tuple for row in tuple_rows)
+        assert [tuple(row.values()) for row in dict_rows] == list(tuple_rows)
+        assert [row._asdict() for row in namedtuple_rows] == dict_rows
+        assert [row.id for row in namedtuple_rows] == [row[0] for row in tuple_rows]
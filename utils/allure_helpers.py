@@ -1,13 +1,130 @@
-import json
+import threading
+import zlib
 import allure
+import allure_commons
 from contextlib import contextmanager
 from contextvars import ContextVar
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from utils import serializer
 
 
 _attachment_stage: ContextVar[Optional[str]] = ContextVar("attachment_stage", default=None)
 DEFAULT_STAGE_NAME = "Context"
 
+# always - вложения пишутся сразу; on-failure - копятся в памяти и пишутся, только если тест упал;
+# sampled - как on-failure, но у доли тестов (детерминированно по nodeid) пишутся всегда
+ATTACHMENT_POLICIES = ("always", "on-failure", "sampled")
+DEFAULT_ATTACHMENT_SAMPLE_RATE = 0.1
+# тело ответа прикладывается как есть (без повторного разбора JSON), но не больше этого числа байт
+DEFAULT_MAX_RESPONSE_BODY_BYTES = 64 * 1024
+
+
+class _AttachmentBuffer:
+    def __init__(self):
+        self.policy = "always"
+        self.sample_rate = DEFAULT_ATTACHMENT_SAMPLE_RATE
+        self.max_response_body_bytes = DEFAULT_MAX_RESPONSE_BODY_BYTES
+        self.deferred = False
+        # (имя, тип, функция сериализации, снимок данных, путь шагов allure): JSON сериализуется только при сбросе
+        self.pending: List[Tuple[str, Any, Callable[[Any], Union[str, bytes]], Any, Tuple[str, ...]]] = []
+
+
+_buffer = _AttachmentBuffer()
+
+
+class _StepPath:
+    """плагин allure_commons: заголовки открытых allure.step, чтобы отложенное вложение легло в тот же шаг"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def current(self) -> Tuple[str, ...]:
+        return tuple(title for _, title in getattr(self._local, "steps", ()))
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        if not hasattr(self._local, "steps"):
+            self._local.steps = []
+        self._local.steps.append((uuid, title))
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        steps = getattr(self._local, "steps", [])
+        if steps and steps[-1][0] == uuid:
+            steps.pop()
+
+
+_step_path = _StepPath()
+
+
+def configure_attachments(
+    policy: str,
+    sample_rate: float = DEFAULT_ATTACHMENT_SAMPLE_RATE,
+    max_response_body_bytes: int = DEFAULT_MAX_RESPONSE_BODY_BYTES,
+) -> None:
+    if policy not in ATTACHMENT_POLICIES:
+        raise ValueError(f"Unknown attachment policy: {policy}")
+    _buffer.policy = policy
+    _buffer.sample_rate = sample_rate
+    _buffer.max_response_body_bytes = max_response_body_bytes
+    if policy != "always" and not allure_commons.plugin_manager.is_registered(_step_path):
+        allure_commons.plugin_manager.register(_step_path)
+
+
+def _sampled(nodeid: str) -> bool:
+    return zlib.crc32(nodeid.encode()) % 10_000 < _buffer.sample_rate * 10_000
+
+
+def begin_test_attachments(nodeid: str) -> None:
+    """начало теста: решает, откладывать ли его вложения"""
+    _buffer.pending.clear()
+    _buffer.deferred = _buffer.policy == "on-failure" or (_buffer.policy == "sampled" and not _sampled(nodeid))
+
+
+def flush_attachments() -> None:
+    """сериализует и пишет отложенные вложения (тест упал) в шаги с теми же заголовками, что и при вложении"""
+    pending, _buffer.pending = _buffer.pending, []
+    opened: List[Tuple[str, Any]] = []
+    try:
+        for name, attachment_type, render, data, path in pending:
+            common = 0
+            while common < min(len(opened), len(path)) and opened[common][0] == path[common]:
+                common += 1
+            while len(opened) > common:
+                opened.pop()[1].__exit__(None, None, None)
+            for title in path[common:]:
+                step = allure.step(title)
+                step.__enter__()
+                opened.append((title, step))
+            allure.attach(render(data), name=name, attachment_type=attachment_type)
+    finally:
+        while opened:
+            opened.pop()[1].__exit__(None, None, None)
+
+
+def end_test_attachments() -> None:
+    _buffer.pending.clear()
+    _buffer.deferred = False
+
+
+def _snapshot(data: Any) -> Any:
+    """копия вложенных dict/list/tuple без копирования значений: дешевле сериализации, а изменения исходных
+    структур после вложения (params, тело запроса, строки результата) в отложенное вложение не попадают"""
+    if isinstance(data, dict):
+        return {key: _snapshot(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_snapshot(value) for value in data]
+    return data
+
+
+def _attach(render: Callable[[Any], Union[str, bytes]], data: Any, name: str, attachment_type: Any) -> None:
+    name = format_attachment_name(name)
+    if _buffer.deferred:
+        _buffer.pending.append((name, attachment_type, render, _snapshot(data), _step_path.current()))
+    else:
+        allure.attach(render(data), name=name, attachment_type=attachment_type)
+
 
 def format_attachment_name(label: str, stage_override: Optional[str] = None) -> str:
     stage = stage_override or _attachment_stage.get() or DEFAULT_STAGE_NAME
@@ -38,46 +155,46 @@ def cleanup_step():
     return allure_stage("Cleanup")
 
 
-def attach_http_request(
-    method: str,
-    url: str,
-    headers: Dict[str, Any],
-    params: Optional[Dict[str, Any]],
-    body: Any,
-    name: str = "HTTP request",
-) -> None:
-    data = {
-        "method": method.upper(),
-        "url": url,
-        "headers": headers,
-        "params": params,
-        "body": body,
-    }
-    allure.attach(
-        json.dumps(data, ensure_ascii=False, indent=2),
-        name=format_attachment_name(name),
-        attachment_type=allure.attachment_type.JSON,
-    )
+def _dump_json(data: Any) -> bytes:
+    return serializer.dumps(data, pretty=True)
+
 
+def attach_json(data: Any, name: str) -> None:
+    _attach(_dump_json, data, name=name, attachment_type=allure.attachment_type.JSON)
 
-def attach_http_response(resp: Any, name: str = "HTTP response") -> None:
+
+def attach_text(text: str, name: str) -> None:
+    _attach(str, text, name=name, attachment_type=allure.attachment_type.TEXT)
+
+
+def attach_http_request(build_info: Callable[[], Dict[str, Any]], name: str = "HTTP request") -> None:
+    """
+    build_info() -> {method, url, headers, params, body}; собирается в момент запроса, сериализуется
+    только при записи вложения
+    """
+    _attach(_dump_json, build_info(), name=name, attachment_type=allure.attachment_type.JSON)
+
+
+def attach_http_response(resp: Any, name: str = "HTTP response", max_bytes: Optional[int] = None) -> None:
+    """
+    прикладывает сырые байты тела: JSON не разбирается и не переформатируется,
+    разбор остаётся единственным - при валидации ответа в base/api
+    """
     content_type = (resp.headers.get("content-type", "") or "").lower()
+    body: bytes = resp.content
+    max_bytes = _buffer.max_response_body_bytes if max_bytes is None else max_bytes
 
-    if "application/json" in content_type:
-        attachment_type = allure.attachment_type.JSON
-        try:
-            body = json.dumps(resp.json(), ensure_ascii=False, indent=2)
-        except Exception:
-            body = resp.text
-    else:
+    if len(body) > max_bytes:
+        # обрезанный JSON уже невалиден, поэтому прикладывается как текст
         attachment_type = allure.attachment_type.TEXT
-        body = resp.text
+        render = lambda data: data[:max_bytes] + f"...[truncated {len(data) - max_bytes} bytes]".encode()
+    else:
+        is_json = "application/json" in content_type
+        attachment_type = allure.attachment_type.JSON if is_json else allure.attachment_type.TEXT
+        render = lambda data: data
 
-    allure.attach(
-        body,
-        name=format_attachment_name(f"{name} {resp.status_code}"),
-        attachment_type=attachment_type,
-    )
+    # bytes неизменяемы: снимок - само тело
+    _attach(render, body, name=f"{name} {resp.status_code}", attachment_type=attachment_type)
 
 
 def attach_db_query(
@@ -86,23 +203,22 @@ def attach_db_query(
     rows: List[Dict[str, Any]],
     name: str = "SQL query",
     limit: int = 5,
+    row_count: Optional[int] = None,
 ) -> None:
+    """row_count - полное число строк, если в rows передано только начало результата"""
+    row_count = len(rows) if row_count is None else row_count
     info: Dict[str, Any] = {
         "sql": sql,
         "params": params,
-        "row_count": len(rows),
+        "row_count": row_count,
     }
 
     if rows:
         subset = rows[:limit]
-        if len(rows) > limit:
-            info["note"] = f"Showing first {limit} of {len(rows)} rows"
+        if row_count > len(subset):
+            info["note"] = f"Showing first {len(subset)} of {row_count} rows"
         info["results"] = subset
 
-    allure.attach(
-        json.dumps(info, default=str, ensure_ascii=False, indent=2),
-        name=format_attachment_name(name),
-        attachment_type=allure.attachment_type.JSON,
-    )
+    attach_json(info, name=name)
 
 
@@ -1,9 +1,123 @@
 # utils/assertions/database_state.py
 
-from typing import Optional, Dict, Any
-import allure
+import uuid
+from typing import Optional, Dict, Any, List, Union
+from pydantic import BaseModel
+
+from utils.allure_helpers import attach_text
+
+POST_COLUMNS = "id::text AS id, title, content, author_id, created_at"
+COMMENT_COLUMNS = "id::text AS id, text, author_id, post_id::text AS post_id, parent_id::text AS parent_id, created_at"
+
+COUNT_MODES = ("watermark", "exact")
+# монотонно растущая колонка таблицы для режима watermark; таблицы без неё всегда считаются точно.
+# created_at монотонна, только пока в таблице нет строк из будущего: такой снимок делается точным подсчётом.
+# без индекса по колонке MAX и поиск новых строк - тоже чтение всей таблицы
+WATERMARK_COLUMNS = {
+    "users": "id",
+    "posts": "created_at",
+    "comments": "created_at",
+}
+
+# seq_scan_check - опция --db-explain-check: каждый запрос типизированных хелперов ниже проверяется через EXPLAIN;
+# count_mode - опция --db-count-mode для snapshot_table
+_options: Dict[str, Any] = {"seq_scan_check": False, "count_mode": "exact"}
+
+
+def enable_seq_scan_check(enabled: bool = True) -> None:
+    _options["seq_scan_check"] = enabled
+
+
+def set_count_mode(mode: str) -> None:
+    if mode not in COUNT_MODES:
+        raise ValueError(f"Unknown count mode: {mode}")
+    _options["count_mode"] = mode
+
+
+def as_uuid(value: Union[str, uuid.UUID, None]) -> Optional[uuid.UUID]:
+    """
+    значение для uuid-параметра запроса: колонка сравнивается с параметром без ::text и индекс используется.
+    невалидная строка -> None (= NULL): ни одна строка не совпадёт, запрос при этом не падает
+    """
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(value)
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+
+def find_seq_scans(plan: Dict[str, Any]) -> List[str]:
+    """таблицы, которые план читает последовательным сканированием"""
+    relations = []
+    if plan.get("Node Type") == "Seq Scan":
+        relations.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        relations.extend(find_seq_scans(child))
+    return relations
+
+
+def assert_no_seq_scan(sql_client, sql: str, params: Optional[tuple] = None) -> None:
+    seq_scans = find_seq_scans(sql_client.explain(sql, params))
+    assert not seq_scans, f"Query falls back to Seq Scan on {', '.join(seq_scans)}: {' '.join(sql.split())}"
+
+
+def _typed_query(sql_client, sql: str, params: tuple) -> List[Dict[str, Any]]:
+    if _options["seq_scan_check"]:
+        assert_no_seq_scan(sql_client, sql, params)
+    return sql_client.query(sql, params)
+
+
+def fetch_post(sql_client, post_id: Union[str, uuid.UUID], columns: str = POST_COLUMNS) -> Optional[Dict[str, Any]]:
+    rows = _typed_query(sql_client, f"SELECT {columns} FROM posts WHERE id = %s", (as_uuid(post_id),))
+    return rows[0] if rows else None
+
+
+def fetch_comment(sql_client, comment_id: Union[str, uuid.UUID],
+                  columns: str = COMMENT_COLUMNS) -> Optional[Dict[str, Any]]:
+    rows = _typed_query(sql_client, f"SELECT {columns} FROM comments WHERE id = %s", (as_uuid(comment_id),))
+    return rows[0] if rows else None
+
+
+def fetch_replies(sql_client, parent_id: Union[str, uuid.UUID],
+                  columns: str = COMMENT_COLUMNS) -> List[Dict[str, Any]]:
+    """прямые ответы на комментарий, по created_at"""
+    return _typed_query(
+        sql_client,
+        f"SELECT {columns} FROM comments WHERE parent_id = %s ORDER BY created_at",
+        (as_uuid(parent_id),),
+    )
+
+
+def fetch_comment_tree(sql_client, post_id: Union[str, uuid.UUID]) -> List[Dict[str, Any]]:
+    """все комментарии поста с глубиной вложенности (depth=0 - корневые), родитель идёт раньше ответов"""
+    sql = f"""
+        WITH RECURSIVE tree AS (
+            SELECT c.*, 0 AS depth, ARRAY[c.created_at] AS path
+            FROM comments c
+            WHERE c.post_id = %s AND c.parent_id IS NULL
+            UNION ALL
+            SELECT c.*, t.depth + 1, t.path || c.created_at
+            FROM comments c
+            JOIN tree t ON c.parent_id = t.id
+        )
+        SELECT {COMMENT_COLUMNS}, depth FROM tree ORDER BY path
+    """
+    return _typed_query(sql_client, sql, (as_uuid(post_id),))
+
+
+def fetch_votes(sql_client, post_id: Union[str, uuid.UUID]) -> List[Dict[str, Any]]:
+    return _typed_query(sql_client, "SELECT user_id, value FROM votes WHERE post_id = %s", (as_uuid(post_id),))
+
+
+def get_vote_score(sql_client, post_id: Union[str, uuid.UUID]) -> int:
+    rows = _typed_query(
+        sql_client,
+        "SELECT COALESCE(SUM(value), 0) AS score FROM votes WHERE post_id = %s",
+        (as_uuid(post_id),),
+    )
+    return int(rows[0]["score"])
 
-from utils.allure_helpers import format_attachment_name
 
 def fetch_single_user(
     sql_client,
@@ -36,15 +150,88 @@ def get_table_count(
     result = sql_client.query(sql, params or ())
     count = result[0]["count"] if result else 0
 
-    allure.attach(
+    attach_text(
         f"Table: {table_name}\nWhere: {where_clause or 'N/A'}\nCount: {count}",
-        name=format_attachment_name(f"DB count: {table_name}"),
-        attachment_type=allure.attachment_type.TEXT,
+        name=f"DB count: {table_name}",
     )
     
     return count
 
 
+class TableSnapshot(BaseModel):
+    table_name: str
+    where_clause: Optional[str] = None
+    params: tuple = ()
+    mode: str
+    mark: Any = None  # watermark: максимум WATERMARK_COLUMNS[table_name] на момент снимка
+    count: Optional[int] = None  # exact: COUNT(*) на момент снимка
+
+
+def _and_where(where_clause: Optional[str], condition: str) -> str:
+    return f"{where_clause} AND {condition}" if where_clause else f"WHERE {condition}"
+
+
+def snapshot_table(
+    sql_client,
+    table_name: str,
+    where_clause: Optional[str] = None,
+    params: Optional[tuple] = None,
+    mode: Optional[str] = None,
+) -> TableSnapshot:
+    """
+    снимок таблицы для проверки "новые строки не появились" (assert_no_new_rows).
+    exact (по умолчанию) - COUNT(*) как get_table_count;
+    watermark - запоминает MAX монотонной колонки (быстро при индексе по ней); если MAX(created_at) в будущем,
+    снимок делается в режиме exact. режим best-effort: строку транзакции, которая получила created_at/id до снимка,
+    а закоммитилась после, он не увидит (она ниже отметки) - для строгих проверок нужен exact
+    """
+    mode = mode or _options["count_mode"]
+    column = WATERMARK_COLUMNS.get(table_name)
+    if mode == "exact" or column is None:
+        count = get_table_count(sql_client, table_name, where_clause, params)
+        return TableSnapshot(table_name=table_name, where_clause=where_clause, params=params or (),
+                             mode="exact", count=count)
+
+    where = f" {where_clause}" if where_clause else ""
+    from_future = f"MAX({column}) > now()" if column == "created_at" else "false"
+    rows = sql_client.query(
+        f"SELECT MAX({column}) AS mark, {from_future} AS from_future FROM {table_name}{where}", params or ()
+    )
+    if rows and rows[0]["from_future"]:
+        # новая строка с created_at = now() оказалась бы ниже отметки и не была бы замечена
+        attach_text(f"Table: {table_name}\nMAX({column}) = {rows[0]['mark']} is in the future, counting exactly",
+                    name=f"DB watermark fallback: {table_name}")
+        return snapshot_table(sql_client, table_name, where_clause, params, mode="exact")
+    return TableSnapshot(table_name=table_name, where_clause=where_clause, params=params or (),
+                         mode="watermark", mark=rows[0]["mark"] if rows else None)
+
+
+def assert_no_new_rows(sql_client, snapshot: TableSnapshot, error_message: Optional[str] = None) -> None:
+    if snapshot.mode == "exact":
+        assert_count_unchanged(sql_client, snapshot.table_name, snapshot.count,
+                               snapshot.where_clause, snapshot.params, error_message)
+        return
+
+    column = WATERMARK_COLUMNS[snapshot.table_name]
+    if snapshot.mark is None:
+        where, params = snapshot.where_clause or "", snapshot.params
+    else:
+        where, params = _and_where(snapshot.where_clause, f"{column} > %s"), snapshot.params + (snapshot.mark,)
+    rows = sql_client.query(
+        f"SELECT {column} AS mark FROM {snapshot.table_name} {where} ORDER BY {column} LIMIT 1", params
+    )
+
+    attach_text(
+        f"Table: {snapshot.table_name}\nWhere: {snapshot.where_clause or 'N/A'}\n"
+        f"Watermark: {column} = {snapshot.mark}\nNew rows: {'yes' if rows else 'no'}",
+        name=f"DB new rows: {snapshot.table_name}",
+    )
+    assert not rows, error_message or (
+        f"Expected no new rows in {snapshot.table_name} after {column} = {snapshot.mark}, "
+        f"found {column} = {rows[0]['mark']}"
+    )
+
+
 def assert_count_unchanged(sql_client, table_name: str, count_before: int,
                            where_clause: Optional[str] = None, params: Optional[tuple] = None,
                            error_message: Optional[str] = None) -> None:
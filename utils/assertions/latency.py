@@ -0,0 +1,51 @@
+# utils/assertions/latency.py
+
+from typing import List, Optional
+
+from utils.latency import LatencyCapture
+
+BUDGET_PERCENTILES = {"p50_ms": 50, "p95_ms": 95, "p99_ms": 99}
+
+
+def check_latency_budget(
+        capture: LatencyCapture,
+        *,
+        p50_ms: Optional[float] = None,
+        p95_ms: Optional[float] = None,
+        p99_ms: Optional[float] = None,
+        max_ms: Optional[float] = None,
+        endpoint: Optional[str] = None,
+) -> List[str]:
+    """
+    возвращает список превышений бюджета по общему времени запросов из capture;
+    endpoint ограничивает проверку одним эндпоинтом ("GET /api/v1/posts/{postId}")
+    """
+    histogram = capture.histogram(endpoint)
+    if not histogram.count:
+        return []
+
+    scope = endpoint or "all requests"
+    violations = []
+    for name, budget in (("p50_ms", p50_ms), ("p95_ms", p95_ms), ("p99_ms", p99_ms)):
+        if budget is not None:
+            actual = histogram.percentile_ms(BUDGET_PERCENTILES[name])
+            if actual > budget:
+                violations.append(f"{scope}: {name[:3]} {actual:.1f} ms > budget {budget} ms ({histogram.count} requests)")
+    if max_ms is not None and histogram.max_us / 1000 > max_ms:
+        violations.append(f"{scope}: max {histogram.max_us / 1000:.1f} ms > budget {max_ms} ms")
+    return violations
+
+
+def assert_latency(
+        capture: LatencyCapture,
+        *,
+        p50_ms: Optional[float] = None,
+        p95_ms: Optional[float] = None,
+        p99_ms: Optional[float] = None,
+        max_ms: Optional[float] = None,
+        endpoint: Optional[str] = None,
+) -> None:
+    violations = check_latency_budget(
+        capture, p50_ms=p50_ms, p95_ms=p95_ms, p99_ms=p99_ms, max_ms=max_ms, endpoint=endpoint,
+    )
+    assert not violations, "Latency budget exceeded: " + "; ".join(violations)
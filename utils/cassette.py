@@ -0,0 +1,266 @@
+# utils/cassette.py
+
+import gzip
+import hashlib
+import json
+import os
+import re
+from typing import Iterator, List, Optional, Tuple
+import httpx
+import pytest
+from faker import Faker
+from pydantic import BaseModel
+
+from utils.allure_helpers import attach_text
+from utils.constants.routes import route_template
+
+CASSETTE_MODES = ("off", "record", "replay")
+# strict - ответ только на запрос с тем же путём, query и телом; loose - ещё и на любой запрос того же эндпоинта
+CASSETTE_MATCH_MODES = ("strict", "loose")
+DEFAULT_CASSETTE_DIR = "reports/cassettes"
+CASSETTE_SUFFIX = ".json.gz"
+SESSION_FILE = "session.json"
+# запросы вне теста (например, teardown сессионных фикстур после последнего теста)
+SESSION_CASSETTE = "_session"
+MAX_NAME_LENGTH = 120
+
+_UNSAFE_CHARS = re.compile(r"[^\w.-]+")
+
+
+def seed_generators(seed: str) -> None:
+    """
+    faker (в том числе fake_uuid для id несуществующих постов) выдаёт одни и те же значения при записи и
+    воспроизведении: иначе запросы не совпали бы с записанными. uuid.uuid4 не подменяется - им пользуется allure
+    """
+    Faker.seed(seed)
+
+
+class CassetteMiss(httpx.TransportError):
+    """в кассетах нет ответа на запрос"""
+
+
+class CassetteEntry(BaseModel):
+    method: str
+    route: str
+    # sha1 от пути, query-параметров и нормализованного тела запроса
+    key: str
+    status_code: int
+    content_type: Optional[str] = None
+    content: str
+
+
+class Cassette(BaseModel):
+    nodeid: str
+    entries: List[CassetteEntry] = []
+
+
+class CassetteSession(BaseModel):
+    # сид faker: данные, сгенерированные при записи, при воспроизведении получаются теми же
+    seed: str
+
+
+def cassette_name(nodeid: str) -> str:
+    """имя файла кассеты: читаемая часть nodeid и хеш от него (id параметров бывают длинными и неуникальными после замены символов)"""
+    readable = _UNSAFE_CHARS.sub("_", nodeid).strip("_")[:MAX_NAME_LENGTH]
+    return f"{readable}.{hashlib.sha1(nodeid.encode()).hexdigest()[:10]}{CASSETTE_SUFFIX}"
+
+
+def normalize_body(content: bytes) -> str:
+    """JSON - с отсортированными ключами и без пробелов, остальное - как текст"""
+    if not content:
+        return ""
+    try:
+        return json.dumps(json.loads(content), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    except ValueError:
+        return content.decode("utf-8", errors="replace")
+
+
+def request_key(request: httpx.Request) -> Tuple[str, str, str]:
+    """(метод, шаблон эндпоинта, ключ пути, query и тела)"""
+    method = request.method.upper()
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.url.params.multi_items()))
+    digest = hashlib.sha1(f"{request.url.path}\n{query}\n{normalize_body(request.content)}".encode()).hexdigest()
+    return method, route_template(method, request.url.path), digest
+
+
+def read_cassette(path: str) -> Cassette:
+    with gzip.open(path, "rb") as f:
+        return Cassette.model_validate_json(f.read())
+
+
+def iter_cassettes(directory: str) -> Iterator[Cassette]:
+    """все кассеты каталога - в том числе как фиксированный корпус ответов для бенчмарков разбора и валидации"""
+    if not os.path.isdir(directory):
+        return
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(CASSETTE_SUFFIX):
+            yield read_cassette(os.path.join(directory, filename))
+
+
+class CassetteLibrary:
+    """
+    кассеты HTTP-трафика, по одной на тест и на каждую фикстуру шире function.
+    record: ответы настоящего транспорта сохраняются в <directory>/<тест>.json.gz;
+    replay: ответы отдаются из кассет без сети. запрос сопоставляется по методу, пути, query и нормализованному
+    телу с записанными в текущей кассете по порядку; несовпадение - CassetteMiss, то есть тест падает, если
+    изменённый код отправляет не тот запрос. match="loose" разрешает взять следующий ответ того же эндпоинта
+    с другим телом или id - такое совпадение прикладывается к отчёту
+    """
+
+    def __init__(self, directory: str, mode: str, run_id: Optional[str] = None, match: str = "strict"):
+        if mode not in CASSETTE_MODES or mode == "off":
+            raise ValueError(f"cassette mode must be 'record' or 'replay', got {mode!r}")
+        if match not in CASSETTE_MATCH_MODES:
+            raise ValueError(f"Unknown cassette match mode: {match}")
+        self.directory = directory
+        self.mode = mode
+        self.match = match
+        # кассета теста и поверх неё - кассеты фикстур шире function, которые сейчас выполняются
+        self._stack: List[Tuple[Cassette, List[bool]]] = []
+        self.seed = self._init_seed(run_id)
+        self._session = self._load(SESSION_CASSETTE)
+        self._session_used = [False] * len(self._session.entries)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _session_path(self) -> str:
+        return os.path.join(self.directory, SESSION_FILE)
+
+    def _init_seed(self, run_id: Optional[str]) -> str:
+        if self.replaying:
+            try:
+                with open(self._session_path(), encoding="utf-8") as f:
+                    return CassetteSession.model_validate_json(f.read()).seed
+            except (OSError, ValueError) as e:
+                raise pytest.UsageError(
+                    f"--cassette-mode=replay: no recorded session in {self.directory}, run with --cassette-mode=record"
+                ) from e
+        # под xdist все воркеры получают один run_id (testrunuid) и пишут один и тот же файл
+        seed = run_id or os.urandom(16).hex()
+        self._write(self._session_path(), CassetteSession(seed=seed).model_dump_json().encode(), compress=False)
+        return seed
+
+    def test_seed(self, nodeid: str) -> str:
+        """сид данных теста не зависит от того, какие тесты выбраны и в каком порядке они идут"""
+        return f"{self.seed}:{nodeid}"
+
+    def _write(self, path: str, data: bytes, compress: bool = True) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(gzip.compress(data) if compress else data)
+        os.replace(tmp_path, path)
+
+    def _load(self, name: str) -> Cassette:
+        path = os.path.join(self.directory, cassette_name(name))
+        if self.replaying and os.path.exists(path):
+            return read_cassette(path)
+        return Cassette(nodeid=name)
+
+    def begin(self, name: str) -> None:
+        """
+        name - nodeid теста или фикстуры шире function: трафик сессионной фикстуры попадает в её кассету,
+        а не в кассету первого теста, и воспроизводится при любом наборе выбранных тестов
+        """
+        cassette = self._load(name)
+        self._stack.append((cassette, [False] * len(cassette.entries)))
+
+    def end(self) -> None:
+        if not self._stack:
+            return
+        cassette, _ = self._stack.pop()
+        if cassette.entries and not self.replaying:
+            self._write(os.path.join(self.directory, cassette_name(cassette.nodeid)), cassette.model_dump_json().encode())
+
+    def close(self) -> None:
+        while self._stack:
+            self.end()
+        if self._session.entries and not self.replaying:
+            self._write(os.path.join(self.directory, cassette_name(SESSION_CASSETTE)),
+                        self._session.model_dump_json().encode())
+
+    def record(self, request: httpx.Request, response: httpx.Response) -> None:
+        method, route, key = request_key(request)
+        entry = CassetteEntry(
+            method=method,
+            route=route,
+            key=key,
+            status_code=response.status_code,
+            content_type=response.headers.get("content-type"),
+            content=response.content.decode("utf-8", errors="replace"),
+        )
+        (self._stack[-1][0] if self._stack else self._session).entries.append(entry)
+
+    def _take(self, predicate) -> Optional[CassetteEntry]:
+        if self._stack:
+            cassette, used = self._stack[-1]
+        else:
+            # запросы вне теста и фикстур (например, teardown сессионных фикстур после последнего теста)
+            cassette, used = self._session, self._session_used
+        for i, entry in enumerate(cassette.entries):
+            if not used[i] and predicate(entry):
+                used[i] = True
+                return entry
+        return None
+
+    def _current_name(self) -> str:
+        return self._stack[-1][0].nodeid if self._stack else SESSION_CASSETTE
+
+    def replay(self, request: httpx.Request) -> httpx.Response:
+        method, route, key = request_key(request)
+        entry = self._take(lambda e: (e.method, e.route, e.key) == (method, route, key))
+        if entry is None and self.match == "loose":
+            entry = self._take(lambda e: (e.method, e.route) == (method, route))
+            if entry is not None:
+                attach_text(
+                    f"Cassette: {self._current_name()}\nRequest: {method} {request.url}\n"
+                    f"Body: {normalize_body(request.content)}\n"
+                    "No recorded response with the same path, query and body; "
+                    "replayed the next recorded response of this endpoint",
+                    name=f"Cassette loose match: {method} {route}",
+                )
+        if entry is None:
+            raise CassetteMiss(
+                f"no recorded response for {method} {request.url} with this body in cassette "
+                f"{self._current_name()!r} (re-record or use --cassette-match=loose)",
+                request=request,
+            )
+        headers = {"content-type": entry.content_type} if entry.content_type else None
+        return httpx.Response(entry.status_code, headers=headers, content=entry.content.encode(), request=request)
+
+
+class CassetteTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """транспорт поверх настоящего: record - пишет пары запрос/ответ в кассету, replay - отвечает из неё"""
+
+    def __init__(self, library: CassetteLibrary, transport: httpx.BaseTransport | httpx.AsyncBaseTransport):
+        self.library = library
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        if self.library.replaying:
+            return self.library.replay(request)
+        response = self.transport.handle_request(request)
+        response.read()
+        self.library.record(request, response)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        if self.library.replaying:
+            return self.library.replay(request)
+        response = await self.transport.handle_async_request(request)
+        await response.aread()
+        self.library.record(request, response)
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+CASSETTE_KEY = pytest.StashKey[CassetteLibrary]()
@@ -1,15 +1,36 @@
-from typing import Optional, Dict, Any
+import asyncio
+from functools import lru_cache
+from typing import Optional, Dict, Any, Awaitable, Callable, Iterable, List, Tuple, TypeVar
 import allure
 import httpx
 
 from utils.allure_helpers import attach_http_request, attach_http_response
+from utils.cassette import CassetteLibrary, CassetteTransport
+from utils.constants.routes import route_template
+from utils.latency import LatencyRecorder, RequestTimer
 
 MAX_BODY_PREVIEW = 2048
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 5.0  # секунд простоя, после которых keep-alive соединение закрывается
+DEFAULT_CONNECT_RETRIES = 0
+DEFAULT_TIMEOUT = 10
+DEFAULT_CONCURRENCY = DEFAULT_MAX_CONNECTIONS
 
+AUTH_HEADER_CACHE_SIZE = 1024
 
-class HTTPClient:
-    def __init__(self, base_url: str, timeout: int = 10):
-        self.client = httpx.Client(base_url=base_url, timeout=timeout)
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=AUTH_HEADER_CACHE_SIZE)
+def _bearer_header(token: str) -> Dict[str, str]:
+    # общий для всех запросов с этим токеном словарь: только читается, не изменять
+    return {"Authorization": f"Bearer {token}"}
+
+
+class _BaseHTTPClient:
+    client: httpx.Client | httpx.AsyncClient
+    latency_recorder: Optional[LatencyRecorder] = None
 
     def _sanitize_headers(self, headers: dict) -> dict:
         sanitized = dict(headers or {})
@@ -27,28 +48,108 @@ class HTTPClient:
             return f"{body_str[:MAX_BODY_PREVIEW]}...[truncated]"
         return body_str
 
-    def request(self, method: str, path: str, token: Optional[str] = None, **kwargs) -> httpx.Response:
-        base_headers = dict(self.client.headers)
-        extra_headers = dict(kwargs.pop("headers", {}) or {})
+    def _init_headers(self) -> None:
+        # заголовки клиента не меняются после создания: маскированная копия для вложений строится один раз
+        self._sanitized_base_headers = self._sanitize_headers(dict(self.client.headers))
 
-        if token and "Authorization" not in extra_headers:
-            extra_headers["Authorization"] = f"Bearer {token}"
+    def _prepare_request(self, method: str, path: str, token: Optional[str],
+                         kwargs: Dict[str, Any]) -> Tuple[Optional[Dict[str, str]], Callable[[], Dict[str, Any]]]:
+        """
+        заголовки запроса поверх заголовков клиента (их добавляет сам httpx; headers забираются из kwargs)
+        и функция, собирающая данные для allure-вложения с маскированной копией заголовков
+        """
+        extra_headers = kwargs.pop("headers", None) or None
+        if token and not (extra_headers and "Authorization" in extra_headers):
+            auth_header = _bearer_header(token)
+            extra_headers = {**extra_headers, **auth_header} if extra_headers else auth_header
 
-        request_headers = {**base_headers, **extra_headers}
         request_payload = kwargs.get("json")
         if request_payload is None:
             request_payload = kwargs.get("data")
+        params = kwargs.get("params")
 
-        with allure.step(f"{method.upper()} {path}"):
-            attach_http_request(
-                method=method,
-                url=f"{self.client.base_url}{path}",
-                headers=self._sanitize_headers(request_headers),
-                params=kwargs.get("params"),
-                body=self._trim_body(request_payload),
+        def request_info() -> Dict[str, Any]:
+            return {
+                "method": method.upper(),
+                "url": f"{self.client.base_url}{path}",
+                "headers": {**self._sanitized_base_headers, **self._sanitize_headers(extra_headers)},
+                "params": params,
+                "body": self._trim_body(request_payload),
+            }
+
+        return extra_headers, request_info
+
+    @staticmethod
+    def _check_http2(http2: bool) -> None:
+        # httpx импортирует h2 только при первом запросе - проверяем сразу, а не посреди сессии
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError as e:
+                raise RuntimeError('http2=True requires the h2 package: pip install "httpx[http2]"') from e
+
+    @staticmethod
+    def _limits(max_connections: int, max_keepalive_connections: int, keepalive_expiry: float) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+
+    def _record_latency(self, method: str, path: str, timer: RequestTimer, ok: bool) -> None:
+        if self.latency_recorder is not None:
+            self.latency_recorder.record(method, route_template(method, path), timer.timings(), ok=ok)
+
+
+class HTTPClient(_BaseHTTPClient):
+    def __init__(
+            self,
+            base_url: str,
+            timeout: float | httpx.Timeout = DEFAULT_TIMEOUT,
+            latency_recorder: Optional[LatencyRecorder] = None,
+            http2: bool = False,
+            max_connections: int = DEFAULT_MAX_CONNECTIONS,
+            max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+            connect_retries: int = DEFAULT_CONNECT_RETRIES,
+            transport: Optional[httpx.BaseTransport] = None,
+            cassette: Optional[CassetteLibrary] = None,
+    ):
+        """
+        timeout - число (на всё) или httpx.Timeout с раздельными connect/read/write/pool.
+        http2=True требует пакет h2 (httpx[http2]); connect_retries - повторы только при ошибке установки
+        соединения (ConnectError/ConnectTimeout), запрос, уже отправленный на сервер, не повторяется.
+        transport - готовый транспорт (например, httpx.MockTransport), параметры соединений тогда не используются.
+        cassette - запись трафика в кассеты текущего теста или воспроизведение из них без сети
+        """
+        if transport is None:
+            self._check_http2(http2)
+            transport = httpx.HTTPTransport(
+                http2=http2,
+                limits=self._limits(max_connections, max_keepalive_connections, keepalive_expiry),
+                retries=connect_retries,
             )
+        if cassette is not None:
+            transport = CassetteTransport(cassette, transport)
+        self.client = httpx.Client(base_url=base_url, timeout=timeout, transport=transport)
+        self.latency_recorder = latency_recorder
+        self._init_headers()
+
+    def request(self, method: str, path: str, token: Optional[str] = None, **kwargs) -> httpx.Response:
+        request_headers, request_info = self._prepare_request(method, path, token, kwargs)
+
+        with allure.step(f"{method.upper()} {path}"):
+            attach_http_request(request_info)
+
+            timer = RequestTimer()
+            kwargs["extensions"] = {**(kwargs.get("extensions") or {}), "trace": timer.trace}
+            try:
+                resp = self.client.request(method, path, headers=request_headers, **kwargs)
+            except httpx.HTTPError:
+                self._record_latency(method, path, timer, ok=False)
+                raise
+            self._record_latency(method, path, timer, ok=resp.status_code < 400)
 
-            resp = self.client.request(method, path, headers=request_headers, **kwargs)
             attach_http_response(resp)
             return resp
 
@@ -60,3 +161,73 @@ class HTTPClient:
 
     def close(self):
         self.client.close()
+
+
+class AsyncHTTPClient(_BaseHTTPClient):
+    def __init__(
+            self,
+            base_url: str,
+            timeout: float | httpx.Timeout = DEFAULT_TIMEOUT,
+            max_connections: int = DEFAULT_MAX_CONNECTIONS,
+            max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+            latency_recorder: Optional[LatencyRecorder] = None,
+            http2: bool = False,
+            keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+            connect_retries: int = DEFAULT_CONNECT_RETRIES,
+            transport: Optional[httpx.AsyncBaseTransport] = None,
+            cassette: Optional[CassetteLibrary] = None,
+    ):
+        """параметры транспорта - как у HTTPClient; по HTTP/2 конкурентные запросы мультиплексируются в одном соединении"""
+        if transport is None:
+            self._check_http2(http2)
+            transport = httpx.AsyncHTTPTransport(
+                http2=http2,
+                limits=self._limits(max_connections, max_keepalive_connections, keepalive_expiry),
+                retries=connect_retries,
+            )
+        if cassette is not None:
+            transport = CassetteTransport(cassette, transport)
+        self.client = httpx.AsyncClient(base_url=base_url, timeout=timeout, transport=transport)
+        self.latency_recorder = latency_recorder
+        self._init_headers()
+
+    async def request(self, method: str, path: str, token: Optional[str] = None, **kwargs) -> httpx.Response:
+        request_headers, request_info = self._prepare_request(method, path, token, kwargs)
+
+        timer = RequestTimer()
+        kwargs["extensions"] = {**(kwargs.get("extensions") or {}), "trace": timer.atrace}
+        try:
+            resp = await self.client.request(method, path, headers=request_headers, **kwargs)
+        except httpx.HTTPError:
+            self._record_latency(method, path, timer, ok=False)
+            raise
+        self._record_latency(method, path, timer, ok=resp.status_code < 400)
+
+        # allure ведёт один стек шагов на процесс, поэтому шаг открывается только после ответа
+        # и без await внутри - иначе шаги конкурентных корутин вкладываются друг в друга
+        with allure.step(f"{method.upper()} {path}"):
+            attach_http_request(request_info)
+            attach_http_response(resp)
+        return resp
+
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None, token: Optional[str] = None,
+                  **kwargs) -> httpx.Response:
+        return await self.request("GET", path, params=params, token=token, **kwargs)
+
+    async def post(self, path: str, json: Optional[Dict[str, Any]] = None, token: Optional[str] = None,
+                   **kwargs) -> httpx.Response:
+        return await self.request("POST", path, json=json, token=token, **kwargs)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+async def gather_limited(aws: Iterable[Awaitable[T]], limit: int = DEFAULT_CONCURRENCY) -> List[T]:
+    """выполняет корутины конкурентно, но не больше limit одновременно; порядок результатов сохраняется"""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(aw: Awaitable[T]) -> T:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(_run(aw) for aw in aws))
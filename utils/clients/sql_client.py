@@ -1,17 +1,169 @@
 # utils/clients/sql_client.py
 
-import json
-from typing import Optional, List, Dict, Any
-import allure
+import io
+import itertools
+import re
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Sequence, Tuple
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from utils.allure_helpers import attach_db_query, format_attachment_name
+from psycopg2.extensions import TRANSACTION_STATUS_UNKNOWN, register_adapter
+from psycopg2.extras import (
+    NamedTupleCursor,
+    RealDictCursor,
+    UUID_adapter,
+    execute_values,
+    register_default_json,
+    register_default_jsonb,
+)
+from psycopg2.pool import ThreadedConnectionPool
+from utils import serializer
+from utils.allure_helpers import attach_db_query, attach_json
+
+
+# uuid.UUID передаётся как '...'::uuid - сравнение с uuid-колонкой без приведения самой колонки, по индексу.
+# только адаптер параметров: uuid-колонки в результатах по-прежнему приходят строками
+register_adapter(uuid.UUID, UUID_adapter)
+# json/jsonb в результатах (в том числе json_agg сравнений) разбираются тем же сериализатором, что и ответы API
+register_default_json(globally=True, loads=serializer.loads)
+register_default_jsonb(globally=True, loads=serializer.loads)
+
+BULK_PAGE_SIZE = 1000
+DEFAULT_POOL_TIMEOUT = 30  # секунд ожидания свободного соединения
+STREAM_BATCH_SIZE = 2000
+PREVIEW_ROWS = 5  # строк результата в allure-вложении
+ROW_MODES = ("dict", "tuple", "namedtuple")
+
+# PREPARE принимает только эти операторы; запросы с именованными параметрами %(name)s не кешируются
+_PREPARABLE = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|WITH|VALUES)\b", re.IGNORECASE)
+_PLACEHOLDER = re.compile(r"%%|%s")
+
+
+def _to_positional(sql: str) -> Tuple[str, int]:
+    """%s -> $1..$n, %% -> % (текст PREPARE выполняется без параметров); возвращает и число параметров"""
+    counter = itertools.count(1)
+    positional = _PLACEHOLDER.sub(lambda m: "%" if m.group() == "%%" else f"${next(counter)}", sql)
+    return positional, next(counter) - 1
+
+
+def _copy_value(value: Any) -> str:
+    """значение в текстовом формате COPY: NULL -> \\N, спецсимволы экранируются"""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class DBExpectations:
+    """
+    ожидания к состоянию БД, которые проверяются одним запросом: каждое ожидание - скалярный подзапрос
+    в общем SELECT (строки - через json_agg), все расхождения выводятся вместе.
+    значения строк приходят из JSON: даты - строками, uuid - строками, числа - int/float
+    """
+
+    def __init__(self, sql_client: "SQLClient"):
+        self._sql_client = sql_client
+        # (метка, запрос, параметры, вид, ожидаемое значение)
+        self._expectations: List[tuple] = []
+        self.actual: Dict[str, Any] = {}
+
+    def row(self, label: str, sql: str, params: tuple = (), expected: Optional[Dict[str, Any]] = None):
+        """ровно одна строка с указанными значениями колонок; expected=None - строк быть не должно"""
+        self._expectations.append((label, sql, tuple(params), "row", expected))
+        return self
+
+    def count(self, label: str, table_name: str, where_clause: Optional[str] = None, params: tuple = (),
+              expected: int = 0):
+        where = f" {where_clause}" if where_clause else ""
+        self._expectations.append((label, f"SELECT COUNT(*) FROM {table_name}{where}", tuple(params), "value", expected))
+        return self
+
+    def scalar(self, label: str, sql: str, params: tuple = (), expected: Any = None):
+        """запрос, возвращающий одно значение (агрегат и т.п.)"""
+        self._expectations.append((label, sql, tuple(params), "value", expected))
+        return self
+
+    def _mismatch(self, label: str, kind: str, expected: Any, actual: Any) -> Optional[str]:
+        if kind == "value":
+            return None if actual == expected else f"{label}: expected {expected!r}, got {actual!r}"
+        if expected is None:
+            return None if not actual else f"{label}: expected no rows, got {len(actual)}"
+        if len(actual) != 1:
+            return f"{label}: expected exactly 1 row, got {len(actual)}"
+        diff = {k: (v, actual[0].get(k)) for k, v in expected.items() if actual[0].get(k) != v}
+        if diff:
+            return f"{label}: " + ", ".join(f"{k} expected {e!r}, got {a!r}" for k, (e, a) in diff.items())
+        return None
+
+    def _fetch(self) -> List[Any]:
+        """фактические значения ожиданий по порядку: строки - списком словарей, остальное - значением"""
+        columns = ",\n       ".join(
+            f"(SELECT COALESCE(json_agg(t), '[]'::json) FROM ({sql}) t) AS e{i}" if kind == "row" else f"({sql}) AS e{i}"
+            for i, (_, sql, _, kind, _) in enumerate(self._expectations)
+        )
+        params = tuple(p for _, _, expectation_params, _, _ in self._expectations for p in expectation_params)
+        row = self._sql_client.query(f"SELECT {columns}", params)[0]
+        return [row[f"e{i}"] for i in range(len(self._expectations))]
+
+    def verify(self) -> Dict[str, Any]:
+        """один round-trip на все ожидания; возвращает фактические значения по меткам"""
+        if not self._expectations:
+            return {}
+        values = self._fetch()
+
+        mismatches = []
+        for (label, _, _, kind, expected), actual in zip(self._expectations, values):
+            self.actual[label] = actual[0] if kind == "row" and len(actual) == 1 else actual
+            mismatch = self._mismatch(label, kind, expected, actual)
+            if mismatch:
+                mismatches.append(mismatch)
+        self._expectations.clear()
+
+        assert not mismatches, "DB state mismatch:\n" + "\n".join(mismatches)
+        return self.actual
+
+    def __enter__(self) -> "DBExpectations":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # при исключении внутри блока проверка не выполняется, чтобы не заслонить исходную ошибку
+        if exc_type is None:
+            self.verify()
+        return False
 
 
 class SQLClient:
     SENSITIVE_FIELDS = {"password", "password_hash", "token", "secret", "api_key", "jwt"}
 
-    def __init__(self, host: str, port: int, dbname: str, user: str, password: str):
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            dbname: str,
+            user: str,
+            password: str,
+            min_connections: int = 1,
+            max_connections: int = 0,
+            statement_timeout_ms: int = 0,
+            pool_timeout: float = DEFAULT_POOL_TIMEOUT,
+            prepared_cache_size: int = 0,
+    ):
+        """
+        max_connections=0 - одно autocommit-соединение (не потокобезопасно);
+        max_connections>0 - пул соединений, клиент можно делить между потоками и конкурентными фикстурами.
+        statement_timeout_ms>0 - серверный statement_timeout для каждого соединения.
+        prepared_cache_size>0 - оптимизация по запросу: query/execute с параметрами выполняются через
+        PREPARE/EXECUTE, на каждом соединении хранится не больше prepared_cache_size последних операторов
+        (LRU по тексту SQL); по умолчанию выключена
+        """
         self._connection_params = {
             "host": host,
             "port": port,
@@ -19,8 +171,162 @@ class SQLClient:
             "user": user,
             "password": password,
         }
-        self.conn = psycopg2.connect(**self._connection_params)
-        self.conn.autocommit = True
+        if statement_timeout_ms:
+            self._connection_params["options"] = f"-c statement_timeout={statement_timeout_ms}"
+
+        self._prepared_cache_size = prepared_cache_size
+        # подготовленные операторы живут в сессии сервера, поэтому кеш у каждого соединения свой
+        # соединение -> {sql: (имя оператора, число параметров)}
+        self._prepared: "weakref.WeakKeyDictionary[Any, OrderedDict[str, Tuple[str, int]]]" = weakref.WeakKeyDictionary()
+        self._unpreparable: set = set()
+        self._prepared_names = itertools.count(1)
+        self._prepared_lock = threading.Lock()
+        self.prepared_stats = {"hits": 0, "misses": 0, "evictions": 0, "fallbacks": 0, "replans": 0}
+
+        self.conn = None
+        self._pool: Optional[ThreadedConnectionPool] = None
+        if max_connections:
+            self._pool = ThreadedConnectionPool(min(min_connections, max_connections), max_connections,
+                                                **self._connection_params)
+            # ThreadedConnectionPool при исчерпании бросает PoolError, семафор превращает это в ожидание
+            self._pool_slots = threading.BoundedSemaphore(max_connections)
+            self._pool_timeout = pool_timeout
+            self._max_connections = max_connections
+        else:
+            self.conn = psycopg2.connect(**self._connection_params)
+            self.conn.autocommit = True
+
+    @property
+    def pooled(self) -> bool:
+        return self._pool is not None
+
+    def _checkout(self):
+        if not self._pool_slots.acquire(timeout=self._pool_timeout):
+            raise RuntimeError(f"No free DB connection in the pool within {self._pool_timeout}s")
+        try:
+            # соединение, которое сервер уже закрыл, видно только по запросу: SELECT 1 перед выдачей,
+            # сломанные соединения закрываются и выбрасываются из пула
+            for _ in range(self._max_connections + 1):
+                conn = self._pool.getconn()
+                if not self._ping(conn):
+                    self._pool.putconn(conn, close=True)
+                    continue
+                return conn
+            raise RuntimeError("Failed to check out a healthy DB connection from the pool")
+        except Exception as e:
+            self._pool_slots.release()
+            if isinstance(e, RuntimeError):
+                raise
+            raise RuntimeError(f"Failed to check out DB connection: {e}") from e
+
+    @staticmethod
+    def _ping(conn) -> bool:
+        if conn.closed or conn.get_transaction_status() == TRANSACTION_STATUS_UNKNOWN:
+            return False
+        try:
+            if not conn.autocommit:
+                conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _checkin(self, conn, broken: bool = False) -> None:
+        try:
+            self._pool.putconn(conn, close=broken or bool(conn.closed))
+        finally:
+            self._pool_slots.release()
+
+    @contextmanager
+    def _connection(self) -> Iterator[Any]:
+        """соединение на время одной операции: из пула или единственное"""
+        if self._pool is None:
+            self._ensure_connection()
+            yield self.conn
+            return
+
+        conn = self._checkout()
+        broken = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self._checkin(conn, broken=broken)
+
+    def _statement(self, conn, cur, sql: str, params: Optional[tuple]) -> Tuple[str, tuple]:
+        """
+        SQL и параметры для выполнения: EXECUTE подготовленного оператора (при необходимости сначала PREPARE)
+        или исходный запрос, если кеш выключен или оператор не готовится.
+        запросы без параметров выполняются как есть: переписывать %% в них нельзя, а экономия на плане невелика
+        """
+        if (not self._prepared_cache_size or not params or "%(" in sql
+                or not _PREPARABLE.match(sql)):
+            return sql, params or ()
+
+        with self._prepared_lock:
+            if sql in self._unpreparable:
+                return sql, params
+            statements = self._prepared.setdefault(conn, OrderedDict())
+            prepared = statements.get(sql)
+            self.prepared_stats["hits" if prepared else "misses"] += 1
+            if prepared:
+                statements.move_to_end(sql)
+
+        if prepared:
+            name, param_count = prepared
+        else:
+            name = f"stmt_{next(self._prepared_names)}"
+            positional, param_count = _to_positional(sql)
+            try:
+                cur.execute(f"PREPARE {name} AS {positional}")
+            except psycopg2.ProgrammingError:
+                # например, тип параметра не выводится из контекста - такой запрос выполняется как есть
+                with self._prepared_lock:
+                    self._unpreparable.add(sql)
+                    self.prepared_stats["fallbacks"] += 1
+                return sql, params
+            evicted = None
+            with self._prepared_lock:
+                statements[sql] = (name, param_count)
+                if len(statements) > self._prepared_cache_size:
+                    _, (evicted, _) = statements.popitem(last=False)
+                    self.prepared_stats["evictions"] += 1
+            if evicted:
+                cur.execute(f"DEALLOCATE {evicted}")
+
+        placeholders = f" ({', '.join(['%s'] * param_count)})" if param_count else ""
+        return f"EXECUTE {name}{placeholders}", params
+
+    def _forget_prepared(self, conn, cur, sql: str) -> bool:
+        """убирает оператор из кеша соединения; True, если он там был"""
+        with self._prepared_lock:
+            statements = self._prepared.get(conn)
+            prepared = statements.pop(sql, None) if statements is not None else None
+        if prepared is None:
+            return False
+        try:
+            cur.execute(f"DEALLOCATE {prepared[0]}")
+        except psycopg2.errors.InvalidSqlStatementName:
+            pass
+        return True
+
+    def _execute(self, conn, cur, sql: str, params: Optional[tuple]) -> None:
+        """
+        выполняет запрос через кеш подготовленных операторов. после DDL или сброса схемы сервер отвергает
+        закешированный план ("cached plan must not change result type") или не находит оператор -
+        тогда оператор удаляется из кеша, готовится заново и запрос повторяется один раз
+        """
+        try:
+            cur.execute(*self._statement(conn, cur, sql, params))
+        except (psycopg2.errors.FeatureNotSupported, psycopg2.errors.InvalidSqlStatementName):
+            if not self._forget_prepared(conn, cur, sql):
+                raise
+            with self._prepared_lock:
+                self.prepared_stats["replans"] += 1
+            cur.execute(*self._statement(conn, cur, sql, params))
 
     def _ensure_connection(self):
         """восстанавливает соединение, если оно закрыто или отсутствует"""
@@ -31,41 +337,63 @@ class SQLClient:
         except Exception as e:
             raise RuntimeError(f"Failed to (re)establish DB connection: {e}") from e
 
+    def _is_sensitive(self, column: str) -> bool:
+        return any(sensitive in column.lower() for sensitive in self.SENSITIVE_FIELDS)
+
     def _sanitize_result(self, result: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         sanitized = []
         for row in result:
             sanitized_row = {}
             for key, value in row.items():
-                if any(sensitive in key.lower() for sensitive in self.SENSITIVE_FIELDS):
+                if self._is_sensitive(key):
                     sanitized_row[key] = "***"
                 else:
                     sanitized_row[key] = value
             sanitized.append(sanitized_row)
         return sanitized
 
-    def query(self, sql: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
-        """SELECT"""
-        self._ensure_connection()
+    def _sanitize_tuples(self, columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> List[Dict[str, Any]]:
+        # чувствительные колонки вычисляются один раз по cursor.description, а не для каждой строки
+        sensitive = {i for i, column in enumerate(columns) if self._is_sensitive(column)}
+        return [
+            {column: "***" if i in sensitive else row[i] for i, column in enumerate(columns)}
+            for row in rows
+        ]
+
+    def query(self, sql: str, params: Optional[tuple] = None, row_mode: str = "dict") -> List[Any]:
+        """
+        SELECT.
+        row_mode: dict - строки-словари; tuple - обычные кортежи; namedtuple - кортежи с доступом по имени колонки.
+        кортежи дешевле по памяти и не копируются - удобно для больших сверок по одной-двум колонкам
+        """
+        if row_mode not in ROW_MODES:
+            raise ValueError(f"Unknown row mode: {row_mode}")
+        cursor_factory = {"dict": RealDictCursor, "namedtuple": NamedTupleCursor}.get(row_mode)
         try:
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(sql, params or ())
-                try:
-                    rows = cur.fetchall()
+            with self._connection() as conn, conn.cursor(cursor_factory=cursor_factory) as cur:
+                self._execute(conn, cur, sql, params)
+                if cur.description is None:
+                    attach_db_query(sql=sql, params=params, rows=[], name="SQL query (0 rows)")
+                    return []
+
+                rows = cur.fetchall()
+                if row_mode == "dict":
                     # приводим к обычным dict для совместимости
                     result = [dict(r) for r in rows]
-                    sanitized_result = self._sanitize_result(result)
-
-                    attach_db_query(
-                        sql=sql,
-                        params=params,
-                        rows=sanitized_result,
-                        name=f"SQL Query ({len(result)} rows)",
-                    )
+                    preview = self._sanitize_result(result[:PREVIEW_ROWS])
+                else:
+                    result = rows
+                    columns = [column.name for column in cur.description]
+                    preview = self._sanitize_tuples(columns, rows[:PREVIEW_ROWS])
 
-                    return result
-                except psycopg2.ProgrammingError:
-                    attach_db_query(sql=sql, params=params, rows=[], name="SQL query (0 rows)")
-                    return []
+                attach_db_query(
+                    sql=sql,
+                    params=params,
+                    rows=preview,
+                    name=f"SQL Query ({len(result)} rows)",
+                    row_count=len(result),
+                )
+                return result
         except psycopg2.Error as e:
             error_info = {
                 "sql": sql,
@@ -73,19 +401,77 @@ class SQLClient:
                 "error": str(e),
                 "error_type": type(e).__name__
             }
-            allure.attach(
-                json.dumps(error_info, indent=2),
-                name=format_attachment_name("SQL query error"),
-                attachment_type=allure.attachment_type.JSON,
-            )
+            attach_json(error_info, name="SQL query error")
             raise RuntimeError(f"SQL query failed: {e}") from e
 
+    def stream(
+            self,
+            sql: str,
+            params: Optional[tuple] = None,
+            batch_size: int = STREAM_BATCH_SIZE,
+            preview_rows: int = PREVIEW_ROWS,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        SELECT через именованный (серверный) курсор: строки забираются пачками по batch_size,
+        в памяти клиента одновременно только одна пачка. санитизируются только строки для allure-вложения
+        (первые preview_rows), во вложение попадают они и общее число строк.
+
+        курсору нужна транзакция, поэтому поток идёт по отдельному соединению (из пула или новому),
+        которое занято до конца итерации; незавершённая итерация освобождает его при закрытии генератора
+        """
+        conn = self._checkout() if self._pool is not None else psycopg2.connect(**self._connection_params)
+        failed = broken = False
+        preview: List[Dict[str, Any]] = []
+        row_count = 0
+        try:
+            conn.autocommit = False
+            with conn.cursor(name=f"stream_{uuid.uuid4().hex}", cursor_factory=RealDictCursor) as cur:
+                cur.itersize = batch_size
+                cur.execute(sql, params or ())
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        row_count += 1
+                        if len(preview) < preview_rows:
+                            preview.append(dict(row))
+                        yield dict(row)
+        except psycopg2.Error as e:
+            failed = True
+            broken = isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+            error_info = {
+                "sql": sql,
+                "params": params,
+                "rows_read": row_count,
+                "error": str(e),
+                "error_type": type(e).__name__
+            }
+            attach_json(error_info, name="SQL stream error")
+            raise RuntimeError(f"SQL stream failed: {e}") from e
+        finally:
+            if not broken and not conn.closed:
+                conn.rollback()
+                conn.autocommit = True
+            if self._pool is not None:
+                self._checkin(conn, broken=broken)
+            else:
+                conn.close()
+            if not failed:
+                attach_db_query(
+                    sql=sql,
+                    params=params,
+                    rows=self._sanitize_result(preview),
+                    name=f"SQL stream ({row_count} rows)",
+                    limit=preview_rows,
+                    row_count=row_count,
+                )
+
     def execute(self, sql: str, params: Optional[tuple] = None) -> int:
         """INSERT/UPDATE/DELETE"""
-        self._ensure_connection()
         try:
-            with self.conn.cursor() as cur:
-                cur.execute(sql, params or ())
+            with self._connection() as conn, conn.cursor() as cur:
+                self._execute(conn, cur, sql, params)
                 rowcount = cur.rowcount
 
                 execute_info = {
@@ -93,11 +479,7 @@ class SQLClient:
                     "params": params,
                     "affected_rows": rowcount
                 }
-                allure.attach(
-                    json.dumps(execute_info, indent=2),
-                    name=format_attachment_name(f"SQL execute ({rowcount} rows affected)"),
-                    attachment_type=allure.attachment_type.JSON,
-                )
+                attach_json(execute_info, name=f"SQL execute ({rowcount} rows affected)")
 
                 return rowcount
         except psycopg2.Error as e:
@@ -107,15 +489,150 @@ class SQLClient:
                 "error": str(e),
                 "error_type": type(e).__name__
             }
-            allure.attach(
-                json.dumps(error_info, indent=2),
-                name=format_attachment_name("SQL execute error"),
-                attachment_type=allure.attachment_type.JSON,
-            )
+            attach_json(error_info, name="SQL execute error")
             raise RuntimeError(f"SQL execution failed: {e}") from e
 
+    def expect(self) -> DBExpectations:
+        """
+        построитель ожиданий, проверяемых одним запросом:
+            with sql_client.expect() as db:
+                db.row("post", "SELECT title FROM posts WHERE id = %s", (post_id,), {"title": title})
+                db.count("comments", "comments", "WHERE post_id = %s", (post_id,), expected=0)
+        """
+        return DBExpectations(self)
+
+    def explain(self, sql: str, params: Optional[tuple] = None, disable_seqscan: bool = True) -> Dict[str, Any]:
+        """
+        план запроса (EXPLAIN FORMAT JSON, без выполнения).
+        disable_seqscan=True - Seq Scan остаётся в плане, только если индексного пути нет вовсе
+        (на маленьких локальных таблицах планировщик иначе выбирает Seq Scan и при наличии индекса)
+        """
+        try:
+            with self._connection() as conn, conn.cursor() as cur:
+                if disable_seqscan:
+                    cur.execute("SET enable_seqscan = off")
+                try:
+                    cur.execute(f"EXPLAIN (FORMAT JSON) {sql}", params or ())
+                    plan = cur.fetchone()[0][0]["Plan"]
+                finally:
+                    if disable_seqscan:
+                        cur.execute("RESET enable_seqscan")
+        except psycopg2.Error as e:
+            raise RuntimeError(f"SQL explain failed: {e}") from e
+
+        attach_json({"sql": sql, "params": params, "plan": plan}, name="SQL explain")
+        return plan
+
+    def copy_rows(self, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+        """bulk INSERT через COPY FROM STDIN; ключи должны генерироваться на клиенте (RETURNING недоступен)"""
+        buffer = io.StringIO()
+        rowcount = 0
+        for row in rows:
+            buffer.write("\t".join(_copy_value(value) for value in row))
+            buffer.write("\n")
+            rowcount += 1
+        buffer.seek(0)
+
+        sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+        try:
+            with self._connection() as conn, conn.cursor() as cur:
+                cur.copy_expert(sql, buffer)
+        except psycopg2.Error as e:
+            error_info = {
+                "sql": sql,
+                "rows": rowcount,
+                "error": str(e),
+                "error_type": type(e).__name__
+            }
+            attach_json(error_info, name="SQL copy error")
+            raise RuntimeError(f"SQL copy failed: {e}") from e
+
+        attach_json({"sql": sql, "affected_rows": rowcount}, name=f"SQL copy ({rowcount} rows into {table})")
+        return rowcount
+
+    def dump_rows(self, table: str, where_clause: str = "", params: Optional[tuple] = None) -> str:
+        """
+        строки таблицы целиком как JSON-массив (сериализует сервер), для restore_rows.
+        содержимое во вложение не попадает: в строках могут быть хеши паролей
+        """
+        sql = f"SELECT COALESCE(json_agg(t), '[]')::text, COUNT(*) FROM {table} t {where_clause}"
+        try:
+            with self._connection() as conn, conn.cursor() as cur:
+                cur.execute(sql, params or ())
+                dump, rowcount = cur.fetchone()
+        except psycopg2.Error as e:
+            attach_json({"sql": sql, "params": params, "error": str(e), "error_type": type(e).__name__},
+                        name="SQL dump error")
+            raise RuntimeError(f"SQL dump failed: {e}") from e
+
+        attach_json({"sql": sql, "params": params, "row_count": rowcount}, name=f"SQL dump ({rowcount} rows from {table})")
+        return dump
+
+    def restore_rows(self, table: str, dump: str, key: str = "id") -> int:
+        """
+        upsert строк из dump_rows одним запросом (json_populate_recordset приводит типы по самой таблице):
+        отсутствующие строки вставляются, существующие по key перезаписываются.
+        serial-последовательность key подтягивается к MAX(key), чтобы новые вставки не конфликтовали
+        """
+        rows = serializer.loads(dump)
+        if not rows:
+            return 0
+        updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in rows[0] if column != key)
+        sql = (
+            f"INSERT INTO {table} SELECT * FROM json_populate_recordset(NULL::{table}, %s) "
+            f"ON CONFLICT ({key}) DO UPDATE SET {updates}"
+        )
+        try:
+            with self._connection() as conn, conn.cursor() as cur:
+                cur.execute(sql, (dump,))
+                rowcount = cur.rowcount
+                cur.execute("SELECT pg_get_serial_sequence(%s, %s)", (table, key))
+                sequence = cur.fetchone()[0]
+                if sequence:
+                    cur.execute(f"SELECT setval(%s, GREATEST((SELECT MAX({key}) FROM {table}), 1))", (sequence,))
+        except psycopg2.Error as e:
+            attach_json({"sql": sql, "rows": len(rows), "error": str(e), "error_type": type(e).__name__},
+                        name="SQL restore error")
+            raise RuntimeError(f"SQL restore failed: {e}") from e
+
+        attach_json({"sql": sql, "affected_rows": rowcount}, name=f"SQL restore ({rowcount} rows into {table})")
+        return rowcount
+
+    def insert_rows(
+            self,
+            table: str,
+            columns: Sequence[str],
+            rows: Sequence[Sequence[Any]],
+            returning: Optional[str] = None,
+            page_size: int = BULK_PAGE_SIZE,
+    ) -> List[Any]:
+        """
+        bulk INSERT через execute_values (по page_size строк за запрос).
+        при returning возвращает значения этой колонки в порядке строк, иначе пустой список
+        """
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
+        if returning:
+            sql += f" RETURNING {returning}"
+        try:
+            with self._connection() as conn, conn.cursor() as cur:
+                result = execute_values(cur, sql, rows, page_size=page_size, fetch=bool(returning))
+        except psycopg2.Error as e:
+            error_info = {
+                "sql": sql,
+                "rows": len(rows),
+                "error": str(e),
+                "error_type": type(e).__name__
+            }
+            attach_json(error_info, name="SQL bulk insert error")
+            raise RuntimeError(f"SQL bulk insert failed: {e}") from e
+
+        attach_json({"sql": sql, "affected_rows": len(rows)}, name=f"SQL bulk insert ({len(rows)} rows into {table})")
+        return [r[0] for r in result] if returning else []
+
     def close(self):
         try:
+            if self._pool is not None and not self._pool.closed:
+                self._pool.closeall()
             if hasattr(self, "conn") and self.conn and not getattr(self.conn, "closed", True):
                 self.conn.close()
         except Exception as e:
@@ -125,10 +642,6 @@ class SQLClient:
                 "error_type": type(e).__name__,
             }
             try:
-                allure.attach(
-                    json.dumps(error_info, indent=2),
-                    name=format_attachment_name("SQL connection close error"),
-                    attachment_type=allure.attachment_type.JSON,
-                )
+                attach_json(error_info, name="SQL connection close error")
             except Exception:
                 pass
@@ -1,6 +1,8 @@
 # utils/constants/routes.py
 
+import re
 from enum import StrEnum
+from typing import List, Tuple
 
 class APIRoutes(StrEnum):
     AUTH = "/api/v1/auth"
@@ -9,3 +11,36 @@ class APIRoutes(StrEnum):
     ADMIN = "/api/v1/admin"
     COMMENTS = "/api/v1/comments"
 
+
+# (метод, шаблон) всех эндпоинтов; порядок важен - статические пути раньше параметризованных
+ENDPOINT_TEMPLATES: Tuple[Tuple[str, str], ...] = (
+    ("POST", f"{APIRoutes.AUTH}/register"),
+    ("POST", f"{APIRoutes.AUTH}/login"),
+    ("POST", f"{APIRoutes.POSTS}/publish"),
+    ("GET", f"{APIRoutes.POSTS}"),
+    ("GET", f"{APIRoutes.POSTS}/{{postId}}"),
+    ("POST", f"{APIRoutes.POSTS}/{{postId}}/vote"),
+    ("POST", f"{APIRoutes.POSTS}/{{postId}}/addComment"),
+    ("POST", f"{APIRoutes.COMMENTS}/{{parentCommentId}}/reply"),
+    ("POST", f"{APIRoutes.PROFILE}/info"),
+    ("POST", f"{APIRoutes.ADMIN}/user/{{id}}"),
+    ("GET", f"{APIRoutes.ADMIN}/user/{{email}}"),
+    ("POST", f"{APIRoutes.ADMIN}/management/ban/byEmail/{{email}}"),
+    ("POST", f"{APIRoutes.ADMIN}/management/unban/byEmail/{{email}}"),
+)
+
+_PLACEHOLDER = re.compile(r"\\\{\w+\\\}")
+_COMPILED_TEMPLATES: List[Tuple[str, re.Pattern, str]] = [
+    (method, re.compile(_PLACEHOLDER.sub("[^/]*", re.escape(template)) + "/?"), template)
+    for method, template in ENDPOINT_TEMPLATES
+]
+
+
+def route_template(method: str, path: str) -> str:
+    """приводит конкретный путь к шаблону эндпоинта (/api/v1/posts/3f1c... -> /api/v1/posts/{postId})"""
+    path = path.split("?", 1)[0]
+    method = method.upper()
+    for template_method, pattern, template in _COMPILED_TEMPLATES:
+        if template_method == method and pattern.fullmatch(path):
+            return template
+    return path
@@ -0,0 +1,159 @@
+# utils/data_generators/bulk_seed.py
+
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence
+from pydantic import BaseModel, Field
+
+from utils.data_generators.fake_credentials import faker
+
+# bcrypt-строка, которой не соответствует ни один пароль: такие пользователи нужны как авторы и голосующие,
+# залогиниться под ними нельзя
+SEED_PASSWORD_HASH = "$2a$10$" + "0" * 53
+SEED_TIME_STEP = timedelta(seconds=1)
+
+USER_COLUMNS = ("email", "username", "password", "role")
+POST_COLUMNS = ("id", "title", "content", "author_id", "created_at")
+COMMENT_COLUMNS = ("id", "text", "author_id", "post_id", "parent_id", "created_at")
+VOTE_COLUMNS = ("post_id", "user_id", "value")
+
+
+class SeededData(BaseModel):
+    user_ids: List[int] = Field(default_factory=list)
+    post_ids: List[str] = Field(default_factory=list)  # в порядке created_at по возрастанию
+    comment_ids: List[str] = Field(default_factory=list)
+    vote_count: int = 0
+
+
+class BulkSeeder:
+    """
+    массовое наполнение БД напрямую через SQLClient (COPY / execute_values), минуя API.
+    uuid постов и комментариев генерируются на клиенте, поэтому их id известны без RETURNING.
+    """
+
+    def __init__(self, sql_client):
+        self.sql_client = sql_client
+        self._clock: Optional[datetime] = None
+
+    def _reserve(self, count: int) -> None:
+        """
+        шкала created_at для count строк отсчитывается назад от текущего момента: последняя строка получает
+        now(), а не время из будущего (иначе ломаются сортировки "новые сверху" и watermark-проверки)
+        """
+        if count <= 0:
+            return
+        now = datetime.now(timezone.utc)
+        if self._clock is None or self._clock + SEED_TIME_STEP * (count - 1) > now:
+            self._clock = now - SEED_TIME_STEP * (count - 1)
+
+    def _next_timestamps(self, count: int) -> List[datetime]:
+        # монотонно возрастающий created_at, чтобы сортировки по дате были детерминированными
+        self._reserve(count)
+        stamps = [self._clock + SEED_TIME_STEP * i for i in range(count)]
+        self._clock += SEED_TIME_STEP * count
+        return stamps
+
+    def seed_users(self, count: int) -> List[int]:
+        rows = [
+            (
+                f"{faker.user_name()}.{uuid.uuid4().hex[:8]}@{faker.free_email_domain()}",
+                f"{faker.user_name()}_{uuid.uuid4().hex[:8]}",
+                SEED_PASSWORD_HASH,
+                "USER",
+            )
+            for _ in range(count)
+        ]
+        return self.sql_client.insert_rows("users", USER_COLUMNS, rows, returning="id")
+
+    def seed_posts(self, author_ids: Sequence[int], count: int) -> List[str]:
+        post_ids = [str(uuid.uuid4()) for _ in range(count)]
+        rows = (
+            (post_id, faker.sentence(nb_words=5), faker.paragraph(nb_sentences=3), random.choice(author_ids), created_at)
+            for post_id, created_at in zip(post_ids, self._next_timestamps(count))
+        )
+        self.sql_client.copy_rows("posts", POST_COLUMNS, rows)
+        return post_ids
+
+    def seed_comments(
+            self,
+            post_ids: Sequence[str],
+            author_ids: Sequence[int],
+            per_post: int,
+            replies_per_comment: int = 0,
+    ) -> List[str]:
+        """per_post корневых комментариев на пост и replies_per_comment ответов на каждый из них"""
+        top_level = [(str(uuid.uuid4()), post_id) for post_id in post_ids for _ in range(per_post)]
+        replies = [
+            (str(uuid.uuid4()), post_id, parent_id)
+            for parent_id, post_id in top_level
+            for _ in range(replies_per_comment)
+        ]
+
+        # ответы пишутся вторым COPY, чтобы родитель гарантированно существовал
+        self.sql_client.copy_rows(
+            "comments",
+            COMMENT_COLUMNS,
+            (
+                (comment_id, faker.sentence(nb_words=6), random.choice(author_ids), post_id, None, created_at)
+                for (comment_id, post_id), created_at in zip(top_level, self._next_timestamps(len(top_level)))
+            ),
+        )
+        if replies:
+            self.sql_client.copy_rows(
+                "comments",
+                COMMENT_COLUMNS,
+                (
+                    (comment_id, faker.sentence(nb_words=6), random.choice(author_ids), post_id, parent_id, created_at)
+                    for (comment_id, post_id, parent_id), created_at in zip(replies, self._next_timestamps(len(replies)))
+                ),
+            )
+        return [comment_id for comment_id, _ in top_level] + [comment_id for comment_id, _, _ in replies]
+
+    def seed_votes(self, post_ids: Sequence[str], voter_ids: Sequence[int], per_post: int) -> int:
+        """per_post голосов (+1/-1) на пост от разных пользователей"""
+        per_post = min(per_post, len(voter_ids))
+        rows = [
+            (post_id, voter_id, random.choice((1, -1)))
+            for post_id in post_ids
+            for voter_id in random.sample(list(voter_ids), per_post)
+        ]
+        self.sql_client.insert_rows("votes", VOTE_COLUMNS, rows)
+        return len(rows)
+
+    def seed(
+            self,
+            users: int = 10,
+            posts: int = 100,
+            comments_per_post: int = 0,
+            replies_per_comment: int = 0,
+            votes_per_post: int = 0,
+            author_ids: Optional[Sequence[int]] = None,
+    ) -> SeededData:
+        """
+        создаёт пользователей, посты, комментарии и голоса; author_ids - авторы постов (по умолчанию созданные пользователи)
+        """
+        data = SeededData()
+        data.user_ids = self.seed_users(users) if users else []
+        authors = list(author_ids or data.user_ids)
+        if not authors:
+            raise ValueError("At least one author is required: pass users > 0 or author_ids")
+
+        # одна шкала на посты, комментарии и ответы: ответы новее родителей, все строки не позже now()
+        top_level = posts * comments_per_post
+        self._reserve(posts + top_level + top_level * replies_per_comment)
+        data.post_ids = self.seed_posts(authors, posts)
+        if comments_per_post:
+            data.comment_ids = self.seed_comments(data.post_ids, authors, comments_per_post, replies_per_comment)
+        if votes_per_post:
+            data.vote_count = self.seed_votes(data.post_ids, data.user_ids or authors, votes_per_post)
+        return data
+
+    def cleanup(self, data: SeededData) -> None:
+        """удаляет засеянные данные вместе со всем, что тесты успели добавить к этим постам"""
+        if data.post_ids:
+            self.sql_client.execute("DELETE FROM votes WHERE post_id = ANY(%s::uuid[])", (data.post_ids,))
+            self.sql_client.execute("DELETE FROM comments WHERE post_id = ANY(%s::uuid[])", (data.post_ids,))
+            self.sql_client.execute("DELETE FROM posts WHERE id = ANY(%s::uuid[])", (data.post_ids,))
+        if data.user_ids:
+            self.sql_client.execute("DELETE FROM users WHERE id = ANY(%s)", (data.user_ids,))
@@ -4,6 +4,10 @@ from faker import Faker
 
 faker = Faker()
 
+# валидный UUID, которого нет в БД (сервер выдаёт случайные v4): постоянный, чтобы id параметризованных тестов
+# совпадали между воркерами xdist
+MISSING_UUID = "00000000-0000-4000-8000-000000000000"
+
 
 # вспомогательные функции для генерации валидных данных
 def fake_email() -> str:
@@ -16,3 +20,8 @@ def fake_username() -> str:
 
 def fake_password(length: int = 12) -> str:
     return faker.password(length=length, digits=True, upper_case=True, lower_case=True) + "@"
+
+
+def fake_uuid() -> str:
+    # через faker, а не uuid.uuid4: при записи/воспроизведении кассет значение сидируется
+    return faker.uuid4()
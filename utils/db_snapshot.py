@@ -0,0 +1,111 @@
+# utils/db_snapshot.py
+
+import hashlib
+import inspect
+import os
+import time
+from typing import Any, Dict, Optional
+from pydantic import BaseModel
+
+from models.requests.auth_requests import RegisterUser
+from utils import serializer
+from utils.clients.sql_client import SQLClient
+
+# снапшот перестаёт восстанавливаться за столько секунд до истечения (бан из сида не должен кончиться посреди прогона)
+SNAPSHOT_EXPIRY_MARGIN_S = 3600
+
+
+def seed_checksum(*parts: Any) -> str:
+    """хеш определения сида: исходный код функций и классов, repr остальных значений"""
+    digest = hashlib.sha256()
+    for part in parts:
+        source = inspect.getsource(part) if inspect.isfunction(part) or inspect.isclass(part) else repr(part)
+        digest.update(source.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class SeedManifest(BaseModel):
+    checksum: str
+    created_at: float
+    expires_at: float
+    # роль в сиде -> учётные данные (пароль нужен для логина, файл только для --env=local)
+    users: Dict[str, RegisterUser]
+    # строки users в формате SQLClient.dump_rows
+    dump: str
+
+
+class SeedSnapshot:
+    """
+    базовые пользователи сессии, снятые с БД после сида через API.
+    restore() при совпадении checksum и до expires_at возвращает их одним upsert в users вместо
+    регистрации, смены роли и бана; иначе, а также если строки с этими id/email в БД - другие пользователи
+    или upsert не прошёл, - None: файл удаляется, сид выполняется заново и сохраняется через capture()
+    """
+
+    def __init__(self, path: str, checksum: str, sql_client: SQLClient):
+        self.path = path
+        self.checksum = checksum
+        self._sql_client = sql_client
+
+    def _read(self) -> Optional[SeedManifest]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return SeedManifest.model_validate_json(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def restore(self) -> Optional[Dict[str, RegisterUser]]:
+        manifest = self._read()
+        if manifest is None or manifest.checksum != self.checksum:
+            return None
+        if manifest.expires_at - SNAPSHOT_EXPIRY_MARGIN_S <= time.time():
+            return None
+        try:
+            reusable = self._rows_match(manifest)
+            if reusable:
+                self._sql_client.restore_rows("users", manifest.dump)
+        except RuntimeError:
+            # например, email или username уже занят другим пользователем
+            reusable = False
+        if not reusable:
+            # снапшот больше не годится, сид выполняется заново
+            self.invalidate()
+            return None
+        return manifest.users
+
+    def _rows_match(self, manifest: SeedManifest) -> bool:
+        """
+        upsert идёт по id: после сброса БД тот же id может принадлежать другому пользователю, а email -
+        строке с другим id. снапшот переиспользуется, только если все такие строки - те же пары (id, email)
+        """
+        snapshot_rows = {(row["id"], row["email"]) for row in serializer.loads(manifest.dump)}
+        ids = [user_id for user_id, _ in snapshot_rows]
+        emails = [email for _, email in snapshot_rows]
+        existing = self._sql_client.query(
+            "SELECT id, email FROM users WHERE id = ANY(%s) OR email = ANY(%s)", (ids, emails), row_mode="tuple"
+        )
+        return all(tuple(row) in snapshot_rows for row in existing)
+
+    def invalidate(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def capture(self, users: Dict[str, RegisterUser], ttl_s: float) -> None:
+        emails = [user.email for user in users.values()]
+        now = time.time()
+        manifest = SeedManifest(
+            checksum=self.checksum,
+            created_at=now,
+            expires_at=now + ttl_s,
+            users=users,
+            dump=self._sql_client.dump_rows("users", "WHERE email = ANY(%s)", (emails,)),
+        )
+        # под xdist снапшот пишут несколько воркеров: каждый файл целостный, атомарная подмена
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(manifest.model_dump_json())
+        os.replace(tmp_path, self.path)
@@ -1,8 +1,11 @@
 # utils/fixtures/admin.py
 
+from typing import Dict
 import allure
 import pytest
 from models.requests.auth_requests import LoginUser, RegisterUser
+from settings import get_settings
+from utils.db_snapshot import SeedSnapshot, seed_checksum
 
 DEFAULT_BAN_SECONDS = 99999
 
@@ -18,6 +21,8 @@ def create_admin_user(session_sql_client, session_auth_api, create_user):
                 "UPDATE users SET role = 'ADMIN' WHERE email = %s;",
                 (user.email,)
             )
+            # роль в JWT: токен, выданный до смены роли, не годится
+            session_auth_api.invalidate_token(user.email)
 
             # логиним и получаем токен
             login_user = LoginUser.from_register(user)
@@ -27,35 +32,53 @@ def create_admin_user(session_sql_client, session_auth_api, create_user):
     return _create_admin
 
 
+def _seed_users(auth_api, admin_api, sql_client, password) -> Dict[str, RegisterUser]:
+    """админ, забаненный пользователь и забаненный админ; исходник входит в checksum снапшота"""
+    admin, banned_user, banned_admin = (RegisterUser.random(password=password) for _ in range(3))
+    for user in (admin, banned_user, banned_admin):
+        auth_api.register_user(user)
+    for user in (admin, banned_admin):
+        sql_client.execute("UPDATE users SET role = 'ADMIN' WHERE email = %s;", (user.email,))
+        auth_api.invalidate_token(user.email)
+    admin_token = auth_api.login_and_get_token(LoginUser.from_register(admin))
+    for user in (banned_user, banned_admin):
+        admin_api.ban_user(email=user.email, seconds=DEFAULT_BAN_SECONDS, token=admin_token)
+    return {"admin": admin, "banned_user": banned_user, "banned_admin": banned_admin}
+
+
+@pytest.fixture(scope="session")
+def session_seed_users(pytestconfig, session_auth_api, session_admin_api, session_sql_client, session_valid_password):
+    # --db-snapshot=PATH только для --env=local: восстановление перезаписывает строки users в БД
+    snapshot = None
+    if pytestconfig.getoption("--db-snapshot") and pytestconfig.getoption("--env") == "local":
+        settings = get_settings()
+        checksum = seed_checksum(_seed_users, RegisterUser, DEFAULT_BAN_SECONDS, settings.base_url, settings.db_name)
+        snapshot = SeedSnapshot(pytestconfig.getoption("--db-snapshot"), checksum, session_sql_client)
+        with allure.step("Restore seed users from DB snapshot"):
+            users = snapshot.restore()
+        if users:
+            return users
+
+    with allure.step("Seed admin, banned user and banned admin"):
+        users = _seed_users(session_auth_api, session_admin_api, session_sql_client, session_valid_password)
+    if snapshot:
+        snapshot.capture(users, ttl_s=DEFAULT_BAN_SECONDS)
+    return users
+
+
 @pytest.fixture(scope="session")
-def session_admin_token(session_auth_api, session_sql_client, session_valid_password):
+def session_admin_token(session_auth_api, session_seed_users):
     with allure.step("Prepare reusable admin token"):
-        user = RegisterUser.random(password=session_valid_password)
-        session_auth_api.register_user(user)
-        session_sql_client.execute("UPDATE users SET role = 'ADMIN' WHERE email = %s;", (user.email,))
-        token = session_auth_api.login_and_get_token(LoginUser.from_register(user))
-        return token
+        return session_auth_api.login_and_get_token(LoginUser.from_register(session_seed_users["admin"]))
 
 
 @pytest.fixture(scope="session")
-def session_banned_user_token(session_auth_api, session_admin_api, session_admin_token, session_valid_password):
+def session_banned_user_token(session_auth_api, session_seed_users):
     with allure.step("Prepare banned user token"):
-        user = RegisterUser.random(password=session_valid_password)
-        session_auth_api.register_user(user)
-        session_admin_api.ban_user(email=user.email, seconds=DEFAULT_BAN_SECONDS, token=session_admin_token)
-    login_user = LoginUser.from_register(user)
-    token = session_auth_api.login_and_get_token(login_user)
-    return token
+        return session_auth_api.login_and_get_token(LoginUser.from_register(session_seed_users["banned_user"]))
 
 
 @pytest.fixture(scope="session")
-def session_banned_admin_token(session_admin_api, session_auth_api, session_admin_token, session_valid_password,
-                               session_sql_client):
+def session_banned_admin_token(session_auth_api, session_seed_users):
     with allure.step("Prepare banned admin token"):
-        admin_user = RegisterUser.random(password=session_valid_password)
-        session_auth_api.register_user(admin_user)
-        session_sql_client.execute("UPDATE users SET role = 'ADMIN' WHERE email = %s;", (admin_user.email,))
-        session_admin_api.ban_user(email=admin_user.email, seconds=DEFAULT_BAN_SECONDS, token=session_admin_token)
-    login_user = LoginUser.from_register(admin_user)
-    token = session_auth_api.login_and_get_token(login_user)
-    return token
+        return session_auth_api.login_and_get_token(LoginUser.from_register(session_seed_users["banned_admin"]))
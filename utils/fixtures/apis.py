@@ -2,16 +2,16 @@
 
 import pytest
 
-from base.api.admin_api import AdminAPI
-from base.api.comments_api import CommentsAPI
-from base.api.posts_api import PostsAPI
-from base.api.profile_api import ProfileAPI
-from base.api.auth_api import AuthAPI
+from base.api.admin_api import AdminAPI, AsyncAdminAPI
+from base.api.comments_api import CommentsAPI, AsyncCommentsAPI
+from base.api.posts_api import PostsAPI, AsyncPostsAPI
+from base.api.profile_api import ProfileAPI, AsyncProfileAPI
+from base.api.auth_api import AuthAPI, AsyncAuthAPI
 
 
 @pytest.fixture(scope="session")
-def session_auth_api(session_http_client):
-    return AuthAPI(session_http_client)
+def session_auth_api(session_http_client, session_token_cache):
+    return AuthAPI(session_http_client, token_cache=session_token_cache)
 
 
 @pytest.fixture(scope="session")
@@ -20,8 +20,8 @@ def session_profile_api(session_http_client):
 
 
 @pytest.fixture(scope="session")
-def session_admin_api(session_http_client):
-    return AdminAPI(session_http_client)
+def session_admin_api(session_http_client, session_token_cache):
+    return AdminAPI(session_http_client, token_cache=session_token_cache)
 
 
 @pytest.fixture(scope="session")
@@ -32,3 +32,30 @@ def session_posts_api(session_http_client):
 @pytest.fixture(scope="session")
 def session_comments_api(session_http_client):
     return CommentsAPI(session_http_client)
+
+
+# ---------- асинхронные обёртки (вызывать через session_event_loop.run_until_complete) ----------
+
+@pytest.fixture(scope="session")
+def session_async_auth_api(session_async_http_client, session_token_cache):
+    return AsyncAuthAPI(session_async_http_client, token_cache=session_token_cache)
+
+
+@pytest.fixture(scope="session")
+def session_async_profile_api(session_async_http_client):
+    return AsyncProfileAPI(session_async_http_client)
+
+
+@pytest.fixture(scope="session")
+def session_async_admin_api(session_async_http_client, session_token_cache):
+    return AsyncAdminAPI(session_async_http_client, token_cache=session_token_cache)
+
+
+@pytest.fixture(scope="session")
+def session_async_posts_api(session_async_http_client):
+    return AsyncPostsAPI(session_async_http_client)
+
+
+@pytest.fixture(scope="session")
+def session_async_comments_api(session_async_http_client):
+    return AsyncCommentsAPI(session_async_http_client)
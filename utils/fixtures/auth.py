@@ -5,6 +5,8 @@ import pytest
 from faker import Faker
 from models.requests.auth_requests import RegisterUser, LoginUser
 from utils.data_generators.fake_credentials import fake_email, fake_username, fake_password
+from utils.parallel import get_worker_index
+from utils.user_pool import UserPool
 
 faker = Faker()
 
@@ -25,14 +27,25 @@ def create_user(session_auth_api, session_valid_password):
     return _create
 
 
+@pytest.fixture(scope="session")
+def session_user_pool(request, session_event_loop, session_async_auth_api, session_valid_password):
+    pool = UserPool(
+        loop=session_event_loop,
+        auth_api=session_async_auth_api,
+        password=session_valid_password,
+        batch_size=request.config.getoption("--user-pool-size"),
+    )
+    pool.provision()
+    return pool
+
+
 @pytest.fixture(scope="module")
-def module_create_user_get_token(session_auth_api, session_valid_password):
-    with allure.step("Register user and obtain JWT token"):
-        user = RegisterUser.random(password=session_valid_password)
-        session_auth_api.register_user(user)
-        login_user = LoginUser.from_register(user)
-        token = session_auth_api.login_and_get_token(login_user)
-        return token
+def module_create_user_get_token(session_user_pool):
+    # модуль создаёт от имени пользователя посты и голоса, поэтому в пул он уже не возвращается
+    with allure.step("Lease pooled user and JWT token"):
+        pooled = session_user_pool.checkout(exclusive=True)
+    yield pooled.token
+    session_user_pool.checkin(pooled, reusable=False)
 
 
 @pytest.fixture
@@ -50,6 +63,17 @@ def created_user_with_id(create_user, session_sql_client):
     return _create
 
 
+# id вариантов create_invalid_email_list: сами адреса случайные и различаются между воркерами xdist
+INVALID_EMAIL_IDS = [
+    "plainaddress",
+    "missing_at",
+    "missing_local",
+    "missing_domain_root",
+    "missing_domain_dot",
+    "double_dot",
+]
+
+
 def create_invalid_email_list():
     # функция, возвращающая список уникальных невалидных email
     email = fake_email()
@@ -160,6 +184,6 @@ def login_empty_field_payload(request, session_valid_password):
 @pytest.fixture
 def minimal_user(session_sql_client):
     # подготавливаем payload с минимальными значениями и в teardown удаляем юзера из базы во избежание коллизий
-    user = RegisterUser.minimal()
+    user = RegisterUser.minimal(namespace=get_worker_index())
     yield user
     session_sql_client.execute("DELETE FROM users WHERE email = %s", (user.email,))
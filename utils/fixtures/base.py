@@ -1,22 +1,96 @@
 # utils/fixtures/base.py
 
+import asyncio
+import httpx
 import pytest
 
-from settings import get_settings
-from utils.clients.http_client import HTTPClient
+from settings import Settings, get_settings
+from utils.cassette import CASSETTE_KEY
+from utils.clients.http_client import HTTPClient, AsyncHTTPClient
 from utils.clients.sql_client import SQLClient
+from utils.latency import LATENCY_RECORDER_KEY
+from utils.stand_in import STAND_IN_KEY, StandInSQLClient
+from utils.token_cache import TokenCache
 
 
 @pytest.fixture(scope="session")
-def session_http_client():
+def session_latency_recorder(pytestconfig):
+    # создаётся в pytest_configure
+    return pytestconfig.stash[LATENCY_RECORDER_KEY]
+
+
+@pytest.fixture
+def latency_capture(session_latency_recorder):
+    # латентности запросов текущего теста, для utils.assertions.latency.assert_latency
+    with session_latency_recorder.capture() as capture:
+        yield capture
+
+
+@pytest.fixture(scope="session")
+def session_token_cache(pytestconfig):
+    # --token-cache=PATH - токены переживают прогон; без опции кеш только в памяти сессии
+    return TokenCache(base_url=get_settings().base_url, path=pytestconfig.getoption("--token-cache"))
+
+
+def _http_transport_options(settings: Settings) -> dict:
+    return {
+        "timeout": httpx.Timeout(
+            settings.http_read_timeout_s,
+            connect=settings.http_connect_timeout_s,
+            pool=settings.http_pool_timeout_s,
+        ),
+        "http2": settings.http2,
+        "max_connections": settings.http_max_connections,
+        "max_keepalive_connections": settings.http_max_keepalive_connections,
+        "keepalive_expiry": settings.http_keepalive_expiry_s,
+        "connect_retries": settings.http_connect_retries,
+    }
+
+
+@pytest.fixture(scope="session")
+def session_http_client(pytestconfig, session_latency_recorder):
     settings = get_settings()
-    client = HTTPClient(base_url=settings.base_url)
+    # --stand-in: запросы обслуживает сервер в памяти процесса (создаётся в pytest_configure)
+    stand_in = pytestconfig.stash.get(STAND_IN_KEY, None)
+    # --cassette-mode=record|replay: трафик пишется в кассеты тестов или отдаётся из них
+    client = HTTPClient(base_url=settings.base_url, latency_recorder=session_latency_recorder,
+                        transport=stand_in.transport() if stand_in else None,
+                        cassette=pytestconfig.stash.get(CASSETTE_KEY, None),
+                        **_http_transport_options(settings))
     yield client
     client.close()
 
 
 @pytest.fixture(scope="session")
-def session_sql_client():
+def session_event_loop():
+    # один цикл на сессию: пул соединений AsyncHTTPClient привязан к циклу, в котором открыты соединения
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def session_async_http_client(pytestconfig, session_event_loop, session_latency_recorder):
+    settings = get_settings()
+    stand_in = pytestconfig.stash.get(STAND_IN_KEY, None)
+    client = AsyncHTTPClient(base_url=settings.base_url, latency_recorder=session_latency_recorder,
+                             transport=stand_in.async_transport() if stand_in else None,
+                             cassette=pytestconfig.stash.get(CASSETTE_KEY, None),
+                             **_http_transport_options(settings))
+    yield client
+    session_event_loop.run_until_complete(client.aclose())
+
+
+@pytest.fixture(scope="session")
+def session_sql_client(pytestconfig):
+    stand_in = pytestconfig.stash.get(STAND_IN_KEY, None)
+    if stand_in is not None:
+        # --stand-in: проверки БД идут по SQL-представлению состояния сервера в памяти
+        yield StandInSQLClient(stand_in)
+        return
+    cassette = pytestconfig.stash.get(CASSETTE_KEY, None)
+    if cassette is not None and cassette.replaying:
+        pytest.skip("--cassette-mode=replay: DB state checks need a live Postgres")
     settings = get_settings()
     client = SQLClient(
         host=settings.db_host,
@@ -24,6 +98,10 @@ def session_sql_client():
         dbname=settings.db_name,
         user=settings.db_user,
         password=settings.db_password.get_secret_value(),
+        min_connections=settings.db_pool_min,
+        max_connections=settings.db_pool_max,
+        statement_timeout_ms=settings.db_statement_timeout_ms,
+        prepared_cache_size=settings.db_prepared_cache_size,
     )
     yield client
     client.close()
@@ -3,6 +3,7 @@
 import allure
 import pytest
 from models.requests.posts_requests import PublishPostPayload, AddCommentPayload
+from utils.data_generators.bulk_seed import BulkSeeder
 
 DEFAULT_COMMENTS_TO_CREATE = 5
 
@@ -48,3 +49,22 @@ def create_post_with_comments_ids(session_posts_api, create_post_with_comments_g
         )
         comments_ids = [c.id for c in resp.responseData.comments]
         return post_id, token, comments_ids
+
+
+@pytest.fixture
+def bulk_seed(session_sql_client):
+    # массовое наполнение БД через SQL (для пагинации/сортировки на больших объёмах), в teardown всё удаляется
+    seeder = BulkSeeder(session_sql_client)
+    seeded = []
+
+    def _seed(**kwargs):
+        with allure.step("Bulk seed data via SQL"):
+            data = seeder.seed(**kwargs)
+            seeded.append(data)
+            return data
+
+    yield _seed
+
+    with allure.step("Cleanup bulk seeded data"):
+        for data in reversed(seeded):
+            seeder.cleanup(data)
@@ -0,0 +1,263 @@
+# utils/latency.py
+
+import math
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+import pytest
+
+# значение хранится старшими SUB_BUCKET_BITS битами: 2**(SUB_BUCKET_BITS-1) = 128 под-бакетов на каждую степень двойки,
+# относительная погрешность значений < 1/128 (~0.8%, как HdrHistogram с 2 значащими цифрами)
+SUB_BUCKET_BITS = 8
+_SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+
+PHASES = ("connect", "ttfb", "total")
+
+
+def _bucket_index(value_us: int) -> int:
+    if value_us < _SUB_BUCKET_COUNT:
+        return value_us
+    shift = value_us.bit_length() - SUB_BUCKET_BITS
+    return (shift << (SUB_BUCKET_BITS - 1)) + (value_us >> shift)
+
+
+def _bucket_highest_value(index: int) -> int:
+    if index < _SUB_BUCKET_COUNT:
+        return index
+    shift = (index >> (SUB_BUCKET_BITS - 1)) - 1
+    top = index - (shift << (SUB_BUCKET_BITS - 1))
+    return ((top + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """лог-линейная гистограмма латентностей в микросекундах: O(1) запись, память не растёт с числом запросов"""
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    def record(self, seconds: float) -> None:
+        value_us = max(0, int(seconds * 1_000_000))
+        index = _bucket_index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total_us += value_us
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+
+    def percentile_ms(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        threshold = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= threshold:
+                return min(_bucket_highest_value(index), self.max_us) / 1000
+        return self.max_us / 1000
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_us / self.count / 1000 if self.count else 0.0
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "counts": dict(self.counts),
+            "count": self.count,
+            "total_us": self.total_us,
+            "min_us": self.min_us,
+            "max_us": self.max_us,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls()
+        histogram.counts = {int(index): count for index, count in data["counts"].items()}
+        histogram.count = data["count"]
+        histogram.total_us = data["total_us"]
+        histogram.min_us = data["min_us"]
+        histogram.max_us = data["max_us"]
+        return histogram
+
+
+class EndpointLatency:
+    def __init__(self):
+        self.phases: Dict[str, LatencyHistogram] = {phase: LatencyHistogram() for phase in PHASES}
+        self.errors = 0
+
+
+class RequestTimer:
+    """
+    собирает тайминги одного запроса через trace-extension httpx:
+    connect - установка TCP(+TLS) соединения (только для новых соединений), ttfb - до получения заголовков ответа
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.events: Dict[str, float] = {}
+
+    def trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        self.events[event_name] = time.perf_counter()
+
+    async def atrace(self, event_name: str, info: Dict[str, Any]) -> None:
+        self.events[event_name] = time.perf_counter()
+
+    def timings(self) -> Dict[str, Optional[float]]:
+        finished = time.perf_counter()
+        connect_started = self.events.get("connection.connect_tcp.started")
+        connect_finished = self.events.get("connection.start_tls.complete") or self.events.get(
+            "connection.connect_tcp.complete")
+        headers_received = self.events.get("http11.receive_response_headers.complete") or self.events.get(
+            "http2.receive_response_headers.complete")
+        return {
+            "connect": connect_finished - connect_started if connect_started and connect_finished else None,
+            "ttfb": headers_received - self.started if headers_received else None,
+            "total": finished - self.started,
+        }
+
+
+class LatencySample(NamedTuple):
+    endpoint: str  # "GET /api/v1/posts/{postId}"
+    total_s: float
+
+
+class LatencyCapture:
+    """запросы, выполненные, пока захват активен (например, за время одного теста)"""
+
+    def __init__(self):
+        self.samples: List[LatencySample] = []
+
+    def histogram(self, endpoint: Optional[str] = None) -> LatencyHistogram:
+        histogram = LatencyHistogram()
+        for sample in self.samples:
+            if endpoint is None or sample.endpoint == endpoint:
+                histogram.record(sample.total_s)
+        return histogram
+
+
+class LatencyRecorder:
+    """латентности по (метод, шаблон эндпоинта) за сессию"""
+
+    def __init__(self):
+        self.endpoints: Dict[Tuple[str, str], EndpointLatency] = {}
+        self._captures: List[LatencyCapture] = []
+
+    @contextmanager
+    def capture(self) -> Iterator[LatencyCapture]:
+        latency_capture = LatencyCapture()
+        self._captures.append(latency_capture)
+        try:
+            yield latency_capture
+        finally:
+            self._captures.remove(latency_capture)
+
+    def record(self, method: str, template: str, timings: Dict[str, Optional[float]], ok: bool = True) -> None:
+        key = (method.upper(), template)
+        if self._captures:
+            sample = LatencySample(f"{key[0]} {template}", timings["total"])
+            for latency_capture in self._captures:
+                latency_capture.samples.append(sample)
+        endpoint = self.endpoints.get(key)
+        if endpoint is None:
+            endpoint = self.endpoints[key] = EndpointLatency()
+        for phase, seconds in timings.items():
+            if seconds is not None:
+                endpoint.phases[phase].record(seconds)
+        if not ok:
+            endpoint.errors += 1
+
+    def merge(self, other: "LatencyRecorder") -> None:
+        for key, other_endpoint in other.endpoints.items():
+            endpoint = self.endpoints.setdefault(key, EndpointLatency())
+            for phase, histogram in other_endpoint.phases.items():
+                endpoint.phases[phase].merge(histogram)
+            endpoint.errors += other_endpoint.errors
+
+    def summary(self) -> List[Dict[str, Any]]:
+        rows = []
+        for (method, template), endpoint in sorted(self.endpoints.items(), key=lambda item: item[0][::-1]):
+            row: Dict[str, Any] = {
+                "endpoint": f"{method} {template}",
+                "requests": endpoint.phases["total"].count,
+                "errors": endpoint.errors,
+                "new_connections": endpoint.phases["connect"].count,
+            }
+            for phase, histogram in endpoint.phases.items():
+                row[phase] = {
+                    "mean_ms": round(histogram.mean_ms, 3),
+                    "p50_ms": histogram.percentile_ms(50),
+                    "p95_ms": histogram.percentile_ms(95),
+                    "p99_ms": histogram.percentile_ms(99),
+                    "max_ms": histogram.max_us / 1000,
+                }
+            rows.append(row)
+        return rows
+
+    def connection_reuse(self) -> Dict[str, Any]:
+        """запросы, ушедшие по уже открытому keep-alive (или HTTP/2) соединению, против открывших новое"""
+        requests = sum(endpoint.phases["total"].count for endpoint in self.endpoints.values())
+        new_connections = sum(endpoint.phases["connect"].count for endpoint in self.endpoints.values())
+        reused = max(requests - new_connections, 0)
+        return {
+            "requests": requests,
+            "new_connections": new_connections,
+            "reused": reused,
+            "reuse_ratio": round(reused / requests, 4) if requests else 0.0,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        # формат, пригодный для передачи с xdist-воркера на контроллер (workeroutput)
+        return {
+            "endpoints": [
+                {
+                    "method": method,
+                    "template": template,
+                    "errors": endpoint.errors,
+                    "phases": {phase: histogram.to_dict() for phase, histogram in endpoint.phases.items()},
+                }
+                for (method, template), endpoint in self.endpoints.items()
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyRecorder":
+        recorder = cls()
+        for item in data["endpoints"]:
+            endpoint = recorder.endpoints[(item["method"], item["template"])] = EndpointLatency()
+            endpoint.errors = item["errors"]
+            for phase, histogram in item["phases"].items():
+                endpoint.phases[phase] = LatencyHistogram.from_dict(histogram)
+        return recorder
+
+
+# рекордер сессии живёт в config.stash: он нужен и фикстурам, и хукам conftest
+LATENCY_RECORDER_KEY = pytest.StashKey[LatencyRecorder]()
+
+
+def format_latency_table(rows: List[Dict[str, Any]], elapsed_s: Optional[float] = None) -> List[str]:
+    header = (f"{'endpoint':<58}{'reqs':>7}{'errs':>6}{'conn':>6}"
+              f"{'ttfb p50':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    if elapsed_s is not None:
+        header += f"{'rps':>9}"
+    lines = [header]
+    for row in rows:
+        total = row["total"]
+        line = (f"{row['endpoint']:<58}{row['requests']:>7}{row['errors']:>6}{row['new_connections']:>6}"
+                f"{row['ttfb']['p50_ms']:>10.1f}{total['p50_ms']:>9.1f}{total['p95_ms']:>9.1f}"
+                f"{total['p99_ms']:>9.1f}{total['max_ms']:>9.1f}")
+        if elapsed_s is not None:
+            line += f"{row['requests'] / (elapsed_s or 1e-9):>9.1f}"
+        lines.append(line)
+    return lines
@@ -0,0 +1,104 @@
+# utils/parallel.py
+
+import os
+import tempfile
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, Optional
+import pytest
+
+try:
+    import fcntl
+except ImportError:  # Windows: межпроцессная блокировка недоступна
+    fcntl = None
+
+CONTROLLER_ID = "master"
+
+
+def get_worker_id() -> str:
+    """id воркера pytest-xdist (gw0, gw1, ...) или master при запуске в одном процессе"""
+    return os.environ.get("PYTEST_XDIST_WORKER", CONTROLLER_ID)
+
+
+def get_worker_index() -> int:
+    worker_id = get_worker_id()
+    return int(worker_id[2:]) if worker_id.startswith("gw") else 0
+
+
+def is_controller(config: pytest.Config) -> bool:
+    """True для единственного процесса, который координирует прогон (без xdist - для самого процесса)"""
+    return not hasattr(config, "workerinput")
+
+
+def get_run_lock_path(config: pytest.Config) -> Optional[str]:
+    """общий для всех воркеров одного прогона lock-файл (создаёт контроллер); None, если xdist не используется"""
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is None:
+        return None
+    return workerinput.get("run_lock_path")
+
+
+NO_RUN_LOCK_MESSAGE = (
+    "exclusive_db tests cannot be isolated under pytest-xdist on this platform (no fcntl): "
+    "run them without -n or deselect them with -m 'not exclusive_db'"
+)
+
+
+def has_run_lock() -> bool:
+    """межпроцессная блокировка прогона доступна (fcntl); без неё тесты exclusive_db под xdist не изолированы"""
+    return fcntl is not None
+
+
+def create_run_lock_path() -> str:
+    """путь lock-файла прогона на контроллере; файлы удаляются remove_run_lock_files"""
+    return os.path.join(tempfile.gettempdir(), f"nanoreddit-autotests-{uuid.uuid4().hex}.lock")
+
+
+def remove_run_lock_files(path: str) -> None:
+    for lock_path in (path, f"{path}.gate"):
+        try:
+            os.remove(lock_path)
+        except FileNotFoundError:
+            pass
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """эксклюзивная блокировка файла между процессами (рядом создаётся path.lock); без fcntl - без блокировки"""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@contextmanager
+def run_lock(path: Optional[str], exclusive: bool) -> Iterator[None]:
+    """
+    блокировка на весь прогон: обычные тесты держат shared-lock, тесты с проверками по всей таблице - exclusive,
+    поэтому такие проверки не видят вставок из соседних воркеров
+    """
+    if path is None:
+        yield
+        return
+    if fcntl is None:
+        # exclusive_db-тесты без fcntl падают ещё в setup (conftest), остальным блокировка не нужна
+        yield
+        return
+
+    # gate не даёт потоку новых shared-захватов бесконечно откладывать ожидающий exclusive
+    with open(f"{path}.gate", "a") as gate_file, open(path, "a") as lock_file:
+        fcntl.flock(gate_file, fcntl.LOCK_EX)
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        finally:
+            fcntl.flock(gate_file, fcntl.LOCK_UN)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,62 @@
+# utils/serializer.py
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson не установлен - всё идёт через stdlib json
+    orjson = None
+
+JSON_BACKENDS = ("orjson", "json")
+
+
+class _JsonBackend:
+    name = "json"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, data: Any, pretty: bool = False) -> bytes:
+        return json.dumps(data, default=str, ensure_ascii=False, indent=2 if pretty else None).encode()
+
+
+class _OrjsonBackend(_JsonBackend):
+    name = "orjson"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, data: Any, pretty: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        try:
+            return orjson.dumps(data, default=str, option=option)
+        except orjson.JSONEncodeError:
+            # целые за пределами 64 бит и прочее, что orjson не сериализует
+            return super().dumps(data, pretty=pretty)
+
+
+_backend: _JsonBackend = _OrjsonBackend() if orjson is not None else _JsonBackend()
+
+
+def use_backend(name: str) -> None:
+    """переключает реализацию (например, для сравнения в бенчмарках); orjson без установленного пакета - ошибка"""
+    global _backend
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {name}")
+    if name == "orjson" and orjson is None:
+        raise RuntimeError("orjson backend requires the orjson package: pip install orjson")
+    _backend = _OrjsonBackend() if name == "orjson" else _JsonBackend()
+
+
+def backend_name() -> str:
+    return _backend.name
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    return _backend.loads(data)
+
+
+def dumps(data: Any, pretty: bool = False) -> bytes:
+    """UTF-8 байты; pretty - отступ 2 (для вложений). неизвестные типы (Decimal и т.п.) приводятся через str()"""
+    return _backend.dumps(data, pretty=pretty)
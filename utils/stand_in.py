@@ -0,0 +1,760 @@
+# utils/stand_in.py
+
+import asyncio
+import base64
+import json
+import math
+import re
+import secrets
+import sqlite3
+import threading
+import time
+import uuid
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import httpx
+import pytest
+from email_validator import EmailNotValidError, validate_email
+from pydantic import BaseModel
+
+from utils import serializer
+from utils.allure_helpers import attach_db_query, attach_json
+from utils.clients.sql_client import PREVIEW_ROWS, ROW_MODES, DBExpectations, SQLClient
+from utils.constants.routes import ENDPOINT_TEMPLATES
+
+TOKEN_TTL_S = 3600
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 2000
+MAX_TITLE_LENGTH = 255
+MAX_CONTENT_LENGTH = 32000
+MAX_TEXT_LENGTH = 255
+MAX_USERNAME_LENGTH = 255
+PASSWORD_LENGTH = (8, 72)
+POST_SORT_FIELDS = {"id": "id", "title": "title", "content": "content", "createdAt": "created_at"}
+COMMENT_SORT_FIELDS = {"id": "id", "text": "text", "createdAt": "created_at"}
+# лента живого стенда не бывает пустой, а часть тестов на это рассчитывает
+SEED_POSTS = 20
+SEED_AUTHOR = "stand_in"
+
+ACCESS_DENIED = "Access denied"
+GENERIC_ERROR = "an error occurred"
+VALIDATION_ERROR = "Validation error"
+
+_PLACEHOLDER = re.compile(r"\\\{(\w+)\\\}")
+
+
+class _ApiError(Exception):
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+class _User(BaseModel):
+    id: int
+    email: str
+    username: str
+    password: str
+    role: str = "USER"
+    banned_until: Optional[datetime] = None
+
+
+class _Post(BaseModel):
+    id: str
+    title: str
+    content: str
+    author: str
+    created_at: datetime
+
+
+class _Comment(BaseModel):
+    id: str
+    post_id: str
+    parent_id: Optional[str]
+    text: str
+    author: str
+    created_at: datetime
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat().replace("+00:00", "Z") if value is not None else None
+
+
+def _b64(data: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+
+def _int_param(raw: Optional[str], default: int, minimum: int) -> int:
+    # как Spring Pageable: нечисловое или выходящее за границу значение заменяется значением по умолчанию
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return default
+    return value if value >= minimum else default
+
+
+class StandInServer:
+    """
+    NanoReddit в памяти процесса: все эндпоинты из ENDPOINT_TEMPLATES, состояние - словари в памяти.
+    подключается к HTTPClient/AsyncHTTPClient как transport (httpx.MockTransport), сеть и БД не нужны.
+    latency_ms - искусственная задержка каждого ответа (для async-транспорта - asyncio.sleep).
+    ответы и тексты ошибок повторяют настоящий сервис в той мере, в какой их проверяют тесты
+    """
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_s = latency_ms / 1000
+        self.users: Dict[int, _User] = {}
+        self.posts: Dict[str, _Post] = {}
+        self.comments: Dict[str, _Comment] = {}
+        # (post_id, user_id) -> 1 / -1
+        self.votes: Dict[Tuple[str, int], int] = {}
+        # токен -> (id пользователя, роль на момент логина, exp): роль, как и в настоящем JWT, не меняется до перелогина
+        self._tokens: Dict[str, Tuple[int, str, float]] = {}
+        self._next_user_id = 1
+        self._last_created_at = datetime.min.replace(tzinfo=timezone.utc)
+        self._lock = threading.Lock()
+        handlers = {
+            ("POST", "/api/v1/auth/register"): self._register,
+            ("POST", "/api/v1/auth/login"): self._login,
+            ("POST", "/api/v1/posts/publish"): self._publish_post,
+            ("GET", "/api/v1/posts"): self._get_posts,
+            ("GET", "/api/v1/posts/{postId}"): self._get_post,
+            ("POST", "/api/v1/posts/{postId}/vote"): self._vote_post,
+            ("POST", "/api/v1/posts/{postId}/addComment"): self._add_comment,
+            ("POST", "/api/v1/comments/{parentCommentId}/reply"): self._reply_comment,
+            ("POST", "/api/v1/profile/info"): self._profile,
+            ("POST", "/api/v1/admin/user/{id}"): self._admin_user_by_id,
+            ("GET", "/api/v1/admin/user/{email}"): self._admin_user_by_email,
+            ("POST", "/api/v1/admin/management/ban/byEmail/{email}"): self._ban_user,
+            ("POST", "/api/v1/admin/management/unban/byEmail/{email}"): self._unban_user,
+        }
+        self._routes: List[Tuple[str, re.Pattern, Callable[..., Any]]] = [
+            (method, re.compile(_PLACEHOLDER.sub(r"(?P<\1>[^/]*)", re.escape(template))), handlers[(method, template)])
+            for method, template in ENDPOINT_TEMPLATES
+        ]
+        for i in range(SEED_POSTS):
+            post = _Post(id=str(uuid.uuid4()), title=f"Seed post {i}", content=f"Seed content {i}",
+                         author=SEED_AUTHOR, created_at=self._now())
+            self.posts[post.id] = post
+
+    # ---------- транспорт ----------
+
+    def transport(self) -> httpx.MockTransport:
+        def handler(request: httpx.Request) -> httpx.Response:
+            if self.latency_s:
+                time.sleep(self.latency_s)
+            return self.handle(request)
+
+        return httpx.MockTransport(handler)
+
+    def async_transport(self) -> httpx.MockTransport:
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if self.latency_s:
+                await asyncio.sleep(self.latency_s)
+            return self.handle(request)
+
+        return httpx.MockTransport(handler)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        for method, pattern, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if method == request.method and match:
+                break
+        else:
+            return self._response({"status": "error", "error": GENERIC_ERROR}, 404)
+
+        try:
+            with self._lock:
+                return self._response(handler(request, **match.groupdict()))
+        except _ApiError as e:
+            return self._response({"status": "error", "error": e.message}, e.status_code)
+
+    @staticmethod
+    def _response(body: Dict[str, Any], status_code: int = 200) -> httpx.Response:
+        return httpx.Response(status_code, json=body)
+
+    @staticmethod
+    def _ok(response_data: Any = None, message: Optional[str] = None) -> Dict[str, Any]:
+        body: Dict[str, Any] = {"status": "ok"}
+        if response_data is not None:
+            body["responseData"] = response_data
+        if message is not None:
+            body["message"] = message
+        return body
+
+    # ---------- общие проверки ----------
+
+    @staticmethod
+    def _json_body(request: httpx.Request) -> Dict[str, Any]:
+        try:
+            body = json.loads(request.content or b"null")
+        except ValueError:
+            raise _ApiError(GENERIC_ERROR)
+        if not isinstance(body, dict):
+            raise _ApiError(GENERIC_ERROR)
+        return body
+
+    @staticmethod
+    def _string_field(body: Dict[str, Any], name: str, max_length: int) -> str:
+        # отсутствующее поле или не строка - ошибка разбора, пустая или длинная строка - ошибка валидации
+        value = body.get(name)
+        if not isinstance(value, str):
+            raise _ApiError(GENERIC_ERROR)
+        if not value or len(value) > max_length:
+            raise _ApiError(VALIDATION_ERROR)
+        return value
+
+    @staticmethod
+    def _uuid(raw: str) -> str:
+        try:
+            return str(uuid.UUID(raw))
+        except ValueError:
+            raise _ApiError(GENERIC_ERROR)
+
+    def _now(self) -> datetime:
+        # строго возрастающее время создания: порядок по createdAt совпадает с порядком вставки
+        now = max(datetime.now(timezone.utc), self._last_created_at + timedelta(microseconds=1))
+        self._last_created_at = now
+        return now
+
+    def _current_user(self, request: httpx.Request, admin: bool = False) -> _User:
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        session = self._tokens.get(token) if scheme == "Bearer" else None
+        if session is None or session[2] <= time.time():
+            raise _ApiError(ACCESS_DENIED, 403)
+        user_id, role, _ = session
+        user = self.users.get(user_id)
+        if user is None or (admin and role != "ADMIN"):
+            raise _ApiError(ACCESS_DENIED, 403)
+        return user
+
+    @staticmethod
+    def _is_banned(user: _User) -> bool:
+        return user.banned_until is not None and user.banned_until > datetime.now(timezone.utc)
+
+    def _active_user(self, request: httpx.Request) -> _User:
+        user = self._current_user(request)
+        if self._is_banned(user):
+            raise _ApiError("User is banned", 403)
+        return user
+
+    def _find_user_by_email(self, email: str) -> Optional[_User]:
+        email = email.lower()
+        return next((user for user in self.users.values() if user.email.lower() == email), None)
+
+    # ---------- auth ----------
+
+    def _register(self, request: httpx.Request) -> Dict[str, Any]:
+        body = self._json_body(request)
+        fields = ("email", "username", "password", "passwordConfirmation")
+        if any(not isinstance(body.get(name), str) for name in fields):
+            raise _ApiError(GENERIC_ERROR)
+        if any(not body[name] for name in fields):
+            raise _ApiError(VALIDATION_ERROR)
+
+        try:
+            email = validate_email(body["email"], check_deliverability=False).normalized
+        except EmailNotValidError:
+            raise _ApiError(VALIDATION_ERROR)
+        username, password = body["username"], body["password"]
+        if len(username) > MAX_USERNAME_LENGTH:
+            raise _ApiError(VALIDATION_ERROR)
+        if not (
+                PASSWORD_LENGTH[0] <= len(password) <= PASSWORD_LENGTH[1]
+                and re.search(r"[a-z]", password) and re.search(r"[A-Z]", password) and re.search(r"\d", password)
+                and not re.search(r"\s", password)
+        ):
+            raise _ApiError(VALIDATION_ERROR)
+        if password != body["passwordConfirmation"]:
+            raise _ApiError("Password is not equal to password confirmation")
+        if self._find_user_by_email(email) is not None:
+            raise _ApiError("Email is already in use")
+        if any(user.username == username for user in self.users.values()):
+            raise _ApiError("Username is already in use")
+
+        user = _User(id=self._next_user_id, email=email, username=username, password=password)
+        self._next_user_id += 1
+        self.users[user.id] = user
+        return self._ok(f"User {username} registered")
+
+    def _login(self, request: httpx.Request) -> Dict[str, Any]:
+        body = self._json_body(request)
+        if any(not isinstance(body.get(name), str) for name in ("email", "password")):
+            raise _ApiError(GENERIC_ERROR)
+        if not body["email"] or not body["password"]:
+            raise _ApiError(VALIDATION_ERROR)
+
+        user = self._find_user_by_email(body["email"])
+        if user is None or user.password != body["password"]:
+            raise _ApiError("Bad credentials", 401)
+        expires_at = int(time.time()) + TOKEN_TTL_S
+        token = ".".join((
+            _b64({"alg": "none", "typ": "JWT"}),
+            _b64({"sub": user.email, "role": user.role, "exp": expires_at}),
+            secrets.token_urlsafe(16),
+        ))
+        self._tokens[token] = (user.id, user.role, expires_at)
+        return self._ok({"jwt": token})
+
+    # ---------- posts ----------
+
+    @staticmethod
+    def _post_data(post: _Post) -> Dict[str, Any]:
+        return {
+            "id": post.id,
+            "title": post.title,
+            "content": post.content,
+            "author": post.author,
+            "createdAt": _iso(post.created_at),
+        }
+
+    def _comment_data(self, comment: _Comment) -> Dict[str, Any]:
+        replies = sorted(
+            (reply for reply in self.comments.values() if reply.parent_id == comment.id),
+            key=lambda reply: reply.created_at,
+        )
+        return {
+            "id": comment.id,
+            "text": comment.text,
+            "author": comment.author,
+            "createdAt": _iso(comment.created_at),
+            "replies": [self._comment_data(reply) for reply in replies],
+        }
+
+    @staticmethod
+    def _page(request: httpx.Request, items: List[Any], sort_fields: Dict[str, str]) -> Tuple[List[Any], int, int]:
+        """
+        page/size/sort как у Spring Pageable: кривые page/size - значения по умолчанию, кривой sort - ошибка.
+        как и живой стенд, корректный sort проверяет, но отдаёт всегда по created_at DESC
+        """
+        params = request.url.params
+        page = _int_param(params.get("page"), 0, 0)
+        size = min(_int_param(params.get("size"), DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+        sort = params.get("sort")
+        if sort:
+            field, _, direction = sort.partition(",")
+            if field not in sort_fields or direction.lower() not in ("", "asc", "desc"):
+                raise _ApiError(GENERIC_ERROR)
+        items = sorted(items, key=lambda item: item.created_at, reverse=True)
+        return items[page * size:(page + 1) * size], page, size
+
+    def _publish_post(self, request: httpx.Request) -> Dict[str, Any]:
+        user = self._active_user(request)
+        body = self._json_body(request)
+        title = body.get("title")
+        if isinstance(title, str) and len(title) > MAX_TITLE_LENGTH:
+            raise _ApiError(f"Title must be less than {MAX_TITLE_LENGTH} characters")
+        title = self._string_field(body, "title", MAX_TITLE_LENGTH)
+        content = self._string_field(body, "content", MAX_CONTENT_LENGTH)
+
+        post = _Post(id=str(uuid.uuid4()), title=title, content=content, author=user.username, created_at=self._now())
+        self.posts[post.id] = post
+        return self._ok(self._post_data(post))
+
+    def _get_posts(self, request: httpx.Request) -> Dict[str, Any]:
+        self._current_user(request)
+        posts = list(self.posts.values())
+        content, page, size = self._page(request, posts, POST_SORT_FIELDS)
+        return self._ok({
+            "content": [self._post_data(post) for post in content],
+            "pageNumber": page,
+            "pageSize": size,
+            "totalElements": len(posts),
+            "totalPages": math.ceil(len(posts) / size),
+        })
+
+    def _existing_post(self, post_id: str) -> _Post:
+        post = self.posts.get(self._uuid(post_id))
+        if post is None:
+            raise _ApiError("Post not found", 404)
+        return post
+
+    def _get_post(self, request: httpx.Request, postId: str) -> Dict[str, Any]:
+        self._current_user(request)
+        post = self._existing_post(postId)
+        top_level = [c for c in self.comments.values() if c.post_id == post.id and c.parent_id is None]
+        comments, page, size = self._page(request, top_level, COMMENT_SORT_FIELDS)
+        return self._ok({
+            "post": self._post_data(post),
+            "comments": [self._comment_data(comment) for comment in comments],
+            "voteScore": sum(value for (voted_post, _), value in self.votes.items() if voted_post == post.id),
+            "hasMoreComments": (page + 1) * size < len(top_level),
+        })
+
+    def _vote_post(self, request: httpx.Request, postId: str) -> Dict[str, Any]:
+        user = self._active_user(request)
+        try:
+            value = int(request.url.params.get("value"))
+        except (TypeError, ValueError):
+            raise _ApiError(GENERIC_ERROR)
+        if value not in (1, -1):
+            raise _ApiError("Vote value must be either 1 or -1")
+        post = self._existing_post(postId)
+        self.votes[(post.id, user.id)] = value
+        return self._ok()
+
+    def _add_comment(self, request: httpx.Request, postId: str) -> Dict[str, Any]:
+        user = self._active_user(request)
+        text = self._string_field(self._json_body(request), "text", MAX_TEXT_LENGTH)
+        post = self._existing_post(postId)
+        comment = _Comment(id=str(uuid.uuid4()), post_id=post.id, parent_id=None, text=text, author=user.username,
+                           created_at=self._now())
+        self.comments[comment.id] = comment
+        return self._ok()
+
+    # ---------- comments ----------
+
+    def _reply_comment(self, request: httpx.Request, parentCommentId: str) -> Dict[str, Any]:
+        user = self._active_user(request)
+        text = self._string_field(self._json_body(request), "text", MAX_TEXT_LENGTH)
+        parent = self.comments.get(self._uuid(parentCommentId))
+        if parent is None:
+            raise _ApiError("Parent comment not found", 404)
+        reply = _Comment(id=str(uuid.uuid4()), post_id=parent.post_id, parent_id=parent.id, text=text,
+                         author=user.username, created_at=self._now())
+        self.comments[reply.id] = reply
+        return self._ok(self._comment_data(reply))
+
+    # ---------- profile / admin ----------
+
+    @staticmethod
+    def _profile_data(user: _User) -> Dict[str, Any]:
+        return {
+            "id": user.id,
+            "email": user.email,
+            "username": user.username,
+            "bannedUntil": _iso(user.banned_until),
+            "authorities": [f"ROLE_{user.role}"],
+        }
+
+    def _profile(self, request: httpx.Request) -> Dict[str, Any]:
+        return self._ok(self._profile_data(self._current_user(request)))
+
+    def _admin_target(self, email: str) -> _User:
+        user = self._find_user_by_email(email)
+        if user is None:
+            raise _ApiError("User not found", 404)
+        return user
+
+    def _admin_user_by_id(self, request: httpx.Request, id: str) -> Dict[str, Any]:
+        self._current_user(request, admin=True)
+        try:
+            user = self.users.get(int(id))
+        except ValueError:
+            raise _ApiError(GENERIC_ERROR)
+        if user is None:
+            raise _ApiError("User not found", 404)
+        return self._ok(self._profile_data(user))
+
+    def _admin_user_by_email(self, request: httpx.Request, email: str) -> Dict[str, Any]:
+        self._current_user(request, admin=True)
+        return self._ok(self._profile_data(self._admin_target(email)))
+
+    def _ban_user(self, request: httpx.Request, email: str) -> Dict[str, Any]:
+        self._current_user(request, admin=True)
+        try:
+            seconds = int(request.url.params.get("forSeconds"))
+        except (TypeError, ValueError):
+            raise _ApiError(GENERIC_ERROR)
+        if seconds <= 0:
+            raise _ApiError(GENERIC_ERROR)
+        user = self._admin_target(email)
+        user.banned_until = datetime.now(timezone.utc) + timedelta(seconds=seconds)
+        return self._ok({"bannedUntil": _iso(user.banned_until)}, message="User banned")
+
+    def _unban_user(self, request: httpx.Request, email: str) -> Dict[str, Any]:
+        self._current_user(request, admin=True)
+        user = self._admin_target(email)
+        if not self._is_banned(user):
+            raise _ApiError("User is not banned")
+        user.banned_until = None
+        return self._ok({"bannedUntil": None}, message="User unbanned")
+
+
+    # ---------- SQL-представление состояния ----------
+
+    def _to_sqlite(self) -> sqlite3.Connection:
+        """копия состояния в sqlite в памяти - со схемой и колонками таблиц настоящей БД"""
+        conn = sqlite3.connect(":memory:")
+        conn.create_function("now", 0, lambda: _sql_timestamp(datetime.now(timezone.utc)))
+        conn.executescript(_SQL_SCHEMA)
+        user_ids = {user.username: user.id for user in self.users.values()}
+        conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?, ?, ?)", (
+            (user.id, user.email, user.username, user.password, user.role, _sql_value(user.banned_until))
+            for user in self.users.values()
+        ))
+        conn.executemany("INSERT INTO posts VALUES (?, ?, ?, ?, ?)", (
+            (post.id, post.title, post.content, user_ids.get(post.author), _sql_timestamp(post.created_at))
+            for post in self.posts.values()
+        ))
+        conn.executemany("INSERT INTO comments VALUES (?, ?, ?, ?, ?, ?)", (
+            (comment.id, comment.text, user_ids.get(comment.author), comment.post_id, comment.parent_id,
+             _sql_timestamp(comment.created_at))
+            for comment in self.comments.values()
+        ))
+        conn.executemany("INSERT INTO votes VALUES (?, ?, ?)", (
+            (post_id, user_id, value) for (post_id, user_id), value in self.votes.items()
+        ))
+        return conn
+
+    def _from_sqlite(self, conn: sqlite3.Connection) -> None:
+        """состояние после записи через SQL; автор без строки в users остаётся прежним"""
+        users = {
+            row[0]: _User(id=row[0], email=row[1], username=row[2], password=row[3], role=row[4],
+                          banned_until=_py_value(row[5]))
+            for row in conn.execute("SELECT id, email, username, password, role, banned_until FROM users")
+        }
+        usernames = {user.id: user.username for user in users.values()}
+
+        def author(author_id: Optional[int], previous: Optional[Any]) -> str:
+            if author_id in usernames:
+                return usernames[author_id]
+            return previous.author if previous is not None else SEED_AUTHOR
+
+        self.posts = {
+            row[0]: _Post(id=row[0], title=row[1], content=row[2], author=author(row[3], self.posts.get(row[0])),
+                          created_at=_py_value(row[4]))
+            for row in conn.execute("SELECT id, title, content, author_id, created_at FROM posts")
+        }
+        self.comments = {
+            row[0]: _Comment(id=row[0], text=row[1], author=author(row[2], self.comments.get(row[0])),
+                             post_id=row[3], parent_id=row[4], created_at=_py_value(row[5]))
+            for row in conn.execute("SELECT id, text, author_id, post_id, parent_id, created_at FROM comments")
+        }
+        self.votes = {(row[0], row[1]): row[2] for row in conn.execute("SELECT post_id, user_id, value FROM votes")}
+        self.users = users
+        self._next_user_id = max([self._next_user_id, *(user_id + 1 for user_id in users)])
+        latest = [item.created_at for item in (*self.posts.values(), *self.comments.values())]
+        self._last_created_at = max([self._last_created_at, *latest])
+
+    @contextmanager
+    def sql_database(self) -> Iterator[sqlite3.Connection]:
+        """sqlite-копия состояния на время одного запроса; изменения, сделанные в ней, переносятся в сервер"""
+        with self._lock:
+            conn = self._to_sqlite()
+            loaded = conn.total_changes
+            try:
+                yield conn
+                if conn.total_changes != loaded:
+                    self._from_sqlite(conn)
+            finally:
+                conn.close()
+
+
+_SQL_SCHEMA = """
+    CREATE TABLE users (
+        id INTEGER PRIMARY KEY, email TEXT NOT NULL UNIQUE, username TEXT NOT NULL UNIQUE,
+        password TEXT NOT NULL, role TEXT NOT NULL DEFAULT 'USER', banned_until TEXT
+    );
+    CREATE TABLE posts (
+        id TEXT PRIMARY KEY, title TEXT NOT NULL, content TEXT NOT NULL, author_id INTEGER, created_at TEXT NOT NULL
+    );
+    CREATE TABLE comments (
+        id TEXT PRIMARY KEY, text TEXT NOT NULL, author_id INTEGER, post_id TEXT NOT NULL REFERENCES posts (id),
+        parent_id TEXT REFERENCES comments (id), created_at TEXT NOT NULL
+    );
+    CREATE TABLE votes (
+        post_id TEXT NOT NULL REFERENCES posts (id), user_id INTEGER NOT NULL, value INTEGER NOT NULL,
+        PRIMARY KEY (post_id, user_id)
+    );
+"""
+# timestamptz хранится строкой постоянной ширины: сравнение и сортировка строк совпадают с порядком времени,
+# а конкатенация (path в рекурсивном CTE вместо ARRAY) сортируется как массив
+_SQL_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f+00:00"
+_SQL_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{6}\+00:00")
+# приведения типов Postgres (id::text, '[]'::json) в sqlite не нужны
+_SQL_CAST = re.compile(r"::\w+(\[\])?")
+_SQL_ARRAY = re.compile(r"\bARRAY\[([^\]]*)\]", re.IGNORECASE)
+_SQL_ANY = re.compile(r"=\s*ANY\s*\(\s*%s\s*\)", re.IGNORECASE)
+_SQL_LIST_PLACEHOLDER = "%list"
+_SQL_PLACEHOLDER = re.compile(r"%%|%list|%s")
+
+
+def _sql_timestamp(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime(_SQL_TIMESTAMP_FORMAT)
+
+
+def _sql_value(value: Any) -> Any:
+    """параметр Postgres -> значение sqlite: uuid - строкой, время - строкой постоянной ширины"""
+    if isinstance(value, datetime):
+        return _sql_timestamp(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _py_value(value: Any) -> Any:
+    # как psycopg2: timestamptz - aware datetime, uuid - строка
+    if isinstance(value, str) and _SQL_TIMESTAMP.fullmatch(value):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _to_sqlite_sql(sql: str, params: Optional[Sequence[Any]]) -> Tuple[str, List[Any]]:
+    """перевод запроса в диалекте Postgres (параметры %s) на sqlite (?): = ANY(%s) со списком - IN (?, ...)"""
+    sql = _SQL_ANY.sub(f"IN ({_SQL_LIST_PLACEHOLDER})", _SQL_ARRAY.sub(r"\1", _SQL_CAST.sub("", sql)))
+    values = iter(params or ())
+    bound: List[Any] = []
+
+    def placeholder(match: re.Match) -> str:
+        if match.group() == "%%":
+            return "%"
+        value = next(values)
+        if match.group() == _SQL_LIST_PLACEHOLDER:
+            bound.extend(_sql_value(item) for item in value)
+            return ", ".join("?" * len(value))
+        bound.append(_sql_value(value))
+        return "?"
+
+    return _SQL_PLACEHOLDER.sub(placeholder, sql), bound
+
+
+class _StandInExpectations(DBExpectations):
+    """без json_agg: каждое ожидание - свой запрос, строки приводятся к JSON-типам, как у настоящей БД"""
+
+    def _fetch(self) -> List[Any]:
+        values = []
+        for _, sql, params, kind, _ in self._expectations:
+            rows = self._sql_client.query(sql, params)
+            if kind == "row":
+                values.append(serializer.loads(serializer.dumps(rows)))
+            else:
+                values.append(next(iter(rows[0].values())) if rows else None)
+        return values
+
+
+class StandInSQLClient:
+    """
+    SQLClient поверх состояния StandInServer для проверок БД под --stand-in: каждый запрос выполняется
+    в sqlite-копии таблиц users, posts, comments и votes (те же имена колонок), записи (UPDATE, DELETE,
+    INSERT) переносятся обратно в сервер. запрос переводится с диалекта Postgres: %s, приведения ::type,
+    = ANY(%s), ARRAY[...] и now(). EXPLAIN нет - планы бывают только у настоящей БД
+    """
+
+    def __init__(self, server: StandInServer):
+        self._server = server
+
+    @staticmethod
+    def _preview(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> List[Dict[str, Any]]:
+        sensitive = {i for i, column in enumerate(columns)
+                     if any(field in column.lower() for field in SQLClient.SENSITIVE_FIELDS)}
+        return [
+            {column: "***" if i in sensitive else row[i] for i, column in enumerate(columns)}
+            for row in rows[:PREVIEW_ROWS]
+        ]
+
+    def _run(self, sql: str, params: Optional[Sequence[Any]], action: str) -> Tuple[List[str], List[tuple], int]:
+        sqlite_sql, bound = _to_sqlite_sql(sql, params)
+        try:
+            with self._server.sql_database() as conn:
+                cur = conn.execute(sqlite_sql, bound)
+                columns = [column[0] for column in cur.description or ()]
+                rows = [tuple(_py_value(value) for value in row) for row in cur.fetchall()]
+                return columns, rows, cur.rowcount
+        except sqlite3.Error as e:
+            attach_json({"sql": sql, "params": params, "error": str(e), "error_type": type(e).__name__},
+                        name=f"SQL {action} error")
+            raise RuntimeError(f"SQL {action} failed: {e}") from e
+
+    def query(self, sql: str, params: Optional[tuple] = None, row_mode: str = "dict") -> List[Any]:
+        """SELECT; row_mode - как у SQLClient.query"""
+        if row_mode not in ROW_MODES:
+            raise ValueError(f"Unknown row mode: {row_mode}")
+        columns, rows, _ = self._run(sql, params, "query")
+        attach_db_query(sql=sql, params=params, rows=self._preview(columns, rows),
+                        name=f"SQL Query ({len(rows)} rows)", row_count=len(rows))
+        if row_mode == "dict":
+            return [dict(zip(columns, row)) for row in rows]
+        if row_mode == "namedtuple":
+            record = namedtuple("Record", columns, rename=True)
+            return [record(*row) for row in rows]
+        return rows
+
+    def execute(self, sql: str, params: Optional[tuple] = None) -> int:
+        """INSERT/UPDATE/DELETE"""
+        _, _, rowcount = self._run(sql, params, "execution")
+        attach_json({"sql": sql, "params": params, "affected_rows": rowcount},
+                    name=f"SQL execute ({rowcount} rows affected)")
+        return rowcount
+
+    def expect(self) -> DBExpectations:
+        return _StandInExpectations(self)
+
+    def explain(self, sql: str, params: Optional[tuple] = None, disable_seqscan: bool = True) -> Dict[str, Any]:
+        raise RuntimeError("--stand-in: EXPLAIN needs a live Postgres")
+
+    def _insert(self, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]],
+                returning: Optional[str] = None) -> Tuple[int, List[Any]]:
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        if returning:
+            sql += f" RETURNING {returning}"
+        rowcount, returned = 0, []
+        try:
+            with self._server.sql_database() as conn:
+                for row in rows:
+                    cur = conn.execute(sql, [_sql_value(value) for value in row])
+                    if returning:
+                        returned.append(cur.fetchone()[0])
+                    rowcount += 1
+        except sqlite3.Error as e:
+            attach_json({"sql": sql, "rows": rowcount, "error": str(e), "error_type": type(e).__name__},
+                        name="SQL bulk insert error")
+            raise RuntimeError(f"SQL bulk insert failed: {e}") from e
+        return rowcount, returned
+
+    def copy_rows(self, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+        rowcount, _ = self._insert(table, columns, rows)
+        attach_json({"table": table, "affected_rows": rowcount}, name=f"SQL copy ({rowcount} rows into {table})")
+        return rowcount
+
+    def insert_rows(self, table: str, columns: Sequence[str], rows: Sequence[Sequence[Any]],
+                    returning: Optional[str] = None, page_size: int = 0) -> List[Any]:
+        rowcount, returned = self._insert(table, columns, rows, returning)
+        attach_json({"table": table, "affected_rows": rowcount},
+                    name=f"SQL bulk insert ({rowcount} rows into {table})")
+        return returned
+
+    def dump_rows(self, table: str, where_clause: str = "", params: Optional[tuple] = None) -> str:
+        """строки в формате хранения sqlite-копии, для restore_rows"""
+        sql, bound = _to_sqlite_sql(f"SELECT * FROM {table} {where_clause}", params)
+        with self._server.sql_database() as conn:
+            cur = conn.execute(sql, bound)
+            columns = [column[0] for column in cur.description]
+            rows = [dict(zip(columns, row)) for row in cur.fetchall()]
+        attach_json({"table": table, "params": params, "row_count": len(rows)},
+                    name=f"SQL dump ({len(rows)} rows from {table})")
+        return serializer.dumps(rows).decode()
+
+    def restore_rows(self, table: str, dump: str, key: str = "id") -> int:
+        rows = serializer.loads(dump)
+        if not rows:
+            return 0
+        columns = list(rows[0])
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column != key)
+        sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT ({key}) DO UPDATE SET {updates}"
+        )
+        try:
+            with self._server.sql_database() as conn:
+                conn.executemany(sql, [[row[column] for column in columns] for row in rows])
+        except sqlite3.Error as e:
+            attach_json({"sql": sql, "rows": len(rows), "error": str(e), "error_type": type(e).__name__},
+                        name="SQL restore error")
+            raise RuntimeError(f"SQL restore failed: {e}") from e
+        attach_json({"sql": sql, "affected_rows": len(rows)}, name=f"SQL restore ({len(rows)} rows into {table})")
+        return len(rows)
+
+    def close(self) -> None:
+        pass
+
+
+# сервер сессии живёт в config.stash (создаётся в pytest_configure при --stand-in)
+STAND_IN_KEY = pytest.StashKey[StandInServer]()
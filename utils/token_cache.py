@@ -0,0 +1,105 @@
+# utils/token_cache.py
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+from pydantic import BaseModel
+from utils.parallel import file_lock
+
+# токен считается протухшим за столько секунд до exp, чтобы не истечь посреди теста
+DEFAULT_REFRESH_MARGIN_S = 60
+
+
+def jwt_expiry(token: str) -> Optional[float]:
+    """claim exp из payload JWT (подпись не проверяется); None, если claim нет или токен не разбирается"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, ValueError, KeyError, TypeError):
+        return None
+
+
+class CachedToken(BaseModel):
+    email: str
+    token: str
+    expires_at: Optional[float] = None
+
+
+class TokenCache:
+    """
+    JWT по учётным данным (base_url + email + хеш пароля, сам пароль не хранится).
+    токен отдаётся, пока до exp больше refresh_margin_s; при path кеш переживает прогон (JSON-файл).
+    потокобезопасен; invalidate(email) вызывается при бане/разбане и смене роли пользователя
+    """
+
+    def __init__(self, base_url: str, path: Optional[str] = None,
+                 refresh_margin_s: float = DEFAULT_REFRESH_MARGIN_S):
+        self.base_url = base_url
+        self.path = path
+        self.refresh_margin_s = refresh_margin_s
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+        self._tokens: Dict[str, CachedToken] = {}
+        self._lock = threading.Lock()
+        if path:
+            self._tokens.update(self._read_file())
+
+    def _key(self, email: str, password: str) -> str:
+        return hashlib.sha256(f"{self.base_url}\0{email}\0{password}".encode()).hexdigest()
+
+    def _is_fresh(self, cached: CachedToken) -> bool:
+        return cached.expires_at is None or cached.expires_at - self.refresh_margin_s > time.time()
+
+    def get(self, email: str, password: str) -> Optional[str]:
+        with self._lock:
+            cached = self._tokens.get(self._key(email, password))
+            if cached is not None and self._is_fresh(cached):
+                self.stats["hits"] += 1
+                return cached.token
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, email: str, password: str, token: str) -> None:
+        with self._lock:
+            key = self._key(email, password)
+            self._tokens[key] = CachedToken(email=email, token=token, expires_at=jwt_expiry(token))
+            self._save(added=[key])
+
+    def invalidate(self, email: str) -> None:
+        with self._lock:
+            keys = [key for key, cached in self._tokens.items() if cached.email == email]
+            for key in keys:
+                del self._tokens[key]
+            if keys:
+                self.stats["invalidations"] += len(keys)
+                self._save(removed=keys)
+
+    def _read_file(self) -> Dict[str, CachedToken]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        tokens = {key: CachedToken(**item) for key, item in raw.items()}
+        return {key: cached for key, cached in tokens.items() if self._is_fresh(cached)}
+
+    def _save(self, added=(), removed=()) -> None:
+        if not self.path:
+            return
+        # файл общий для xdist-воркеров: под блокировкой переносим в него только свои изменения, иначе
+        # токен, который другой воркер уже сбросил, вернулся бы из нашей копии; затем перечитываем общий вид
+        with file_lock(self.path):
+            merged = self._read_file()
+            for key in removed:
+                merged.pop(key, None)
+            for key in added:
+                merged[key] = self._tokens[key]
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({key: cached.model_dump() for key, cached in merged.items()}, f)
+            os.replace(tmp_path, self.path)
+        self._tokens = merged
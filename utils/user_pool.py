@@ -0,0 +1,106 @@
+# utils/user_pool.py
+
+import asyncio
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional
+import allure
+from pydantic import BaseModel
+
+from base.api.auth_api import AsyncAuthAPI
+from models.requests.auth_requests import RegisterUser, LoginUser
+from utils.clients.http_client import gather_limited
+
+DEFAULT_USER_POOL_SIZE = 10
+
+
+class PooledUser(BaseModel):
+    user: RegisterUser
+    token: str
+
+
+class UserPool:
+    """
+    заранее зарегистрированные пользователи с JWT, выдаются тестам в аренду.
+
+    exclusive-аренда отдаёт пользователя только одному держателю; shared-аренда отдаёт всем держателям
+    одного и того же пользователя (только для тестов, которые не меняют его состояние).
+    при исчерпании пула добирается следующая партия из batch_size пользователей.
+    """
+
+    def __init__(
+            self,
+            loop: asyncio.AbstractEventLoop,
+            auth_api: AsyncAuthAPI,
+            password: str,
+            batch_size: int = DEFAULT_USER_POOL_SIZE,
+    ):
+        self._loop = loop
+        self._auth_api = auth_api
+        self._password = password
+        self._batch_size = batch_size
+        self._free: Deque[PooledUser] = deque()
+        self._shared: Optional[PooledUser] = None
+        self._holders: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def free_count(self) -> int:
+        return len(self._free)
+
+    async def _register_and_login(self, user: RegisterUser) -> PooledUser:
+        register_resp = await self._auth_api.register_user(user)
+        if register_resp.status != "ok":
+            raise RuntimeError(f"Failed to register pooled user {user.email}: {register_resp.error}")
+        token = await self._auth_api.login_and_get_token(LoginUser.from_register(user))
+        if token is None:
+            raise RuntimeError(f"Failed to obtain JWT for pooled user {user.email}")
+        return PooledUser(user=user, token=token)
+
+    def provision(self, size: Optional[int] = None) -> None:
+        """регистрирует и логинит size пользователей конкурентно"""
+        size = size or self._batch_size
+        with self._lock, allure.step(f"Provision {size} pooled users"):
+            users = [RegisterUser.random(password=self._password) for _ in range(size)]
+            pooled = self._loop.run_until_complete(
+                gather_limited(self._register_and_login(user) for user in users)
+            )
+            self._free.extend(pooled)
+
+    def checkout(self, exclusive: bool = True) -> PooledUser:
+        with self._lock:
+            if not exclusive and self._shared is not None:
+                pooled = self._shared
+            else:
+                if not self._free:
+                    self.provision()
+                pooled = self._free.popleft()
+                if not exclusive:
+                    self._shared = pooled
+            self._holders[pooled.user.email] = self._holders.get(pooled.user.email, 0) + 1
+            return pooled
+
+    def checkin(self, pooled: PooledUser, reusable: bool = True) -> None:
+        """
+        возвращает пользователя в пул; reusable=False - пользователь изменён тестом и больше не выдаётся
+        """
+        with self._lock:
+            email = pooled.user.email
+            holders = self._holders.get(email, 0) - 1
+            if holders > 0:
+                self._holders[email] = holders
+                return
+            self._holders.pop(email, None)
+            if self._shared is pooled:
+                self._shared = None
+            if reusable:
+                self._free.append(pooled)
+
+    @contextmanager
+    def lease(self, exclusive: bool = True, reusable: bool = True) -> Iterator[PooledUser]:
+        pooled = self.checkout(exclusive=exclusive)
+        try:
+            yield pooled
+        finally:
+            self.checkin(pooled, reusable=reusable)